@@ -33,8 +33,11 @@ from .api import (  # noqa: F401
     set_api,
     auth_init,
     get_result,
+    list_results,
     pillar_get,
     pillar_set,
+    pillar_set_many,
+    pillar_transaction,
     get_params,
     set_params,
     set_ntp,
@@ -85,8 +88,11 @@ __all__ = [
     'set_api',
     'auth_init',
     'get_result',
+    'list_results',
     'pillar_get',
     'pillar_set',
+    'pillar_set_many',
+    'pillar_transaction',
     'get_params',
     'set_params',
     'set_ntp',
@@ -23,7 +23,6 @@ import os
 import fileinput
 import sys
 import logging
-import yaml
 import threading
 from datetime import datetime
 from typing import Union, Any
@@ -38,12 +37,10 @@ from . import (
     runner,
     log,
     cli_parser,
-    utils
+    utils,
+    yaml_codec
 )
 from .commands import commands
-from .commands.setup_provisioner import (
-    SetupCmdBase, RunArgsSetupProvisionerGeneric
-)
 from .base import prvsnr_config
 
 logger = logging.getLogger(__name__)
@@ -73,7 +70,7 @@ def _prepare_output(output_type, res):
     if output_type == 'plain':  # plain
         return str(res)
     elif output_type == 'yaml':
-        return yaml.dump(res, default_flow_style=False, canonical=False)
+        return yaml_codec.dumps(res)
     elif output_type == 'json':
         return serialize.dumps(res, sort_keys=True, indent=4)
     else:
@@ -108,6 +105,18 @@ def _generate_logfile_filename(cmd):
     return (config.LOG_ROOT_DIR / f'{cmd}.{ts}.{pid}.{threadid}.log')
 
 
+def _is_setup_cmd(cmd_inst) -> bool:
+    # setup commands modules import setup_provisioner themselves,
+    # other commands shouldn't pay for that import
+    setup_provisioner = sys.modules.get(
+        'provisioner.commands.setup_provisioner'
+    )
+    return (
+        setup_provisioner is not None
+        and isinstance(cmd_inst, setup_provisioner.SetupCmdBase)
+    )
+
+
 def _set_logging(output_type, log_args=None, other_args=None):  # noqa: C901
     if log_args is None:
         log_args = log.LogArgs()
@@ -128,7 +137,7 @@ def _set_logging(output_type, log_args=None, other_args=None):  # noqa: C901
 
     if (
         hasattr(log_args, config.LOG_RSYSLOG_HANDLER)
-        and isinstance(cmd_inst, SetupCmdBase)
+        and _is_setup_cmd(cmd_inst)
     ):
         # disable rsyslog logging
         setattr(log_args, config.LOG_RSYSLOG_HANDLER, False)
@@ -136,7 +145,7 @@ def _set_logging(output_type, log_args=None, other_args=None):  # noqa: C901
 
     if (
         cmd in config.LOG_FORCED_LOGFILE_CMDS
-        # or isinstance(cmd_inst, SetupCmdBase)  FIXME EOS-13228 regression
+        # or _is_setup_cmd(cmd_inst)  FIXME EOS-13228 regression
     ):
         if hasattr(log_args, config.LOG_FILE_HANDLER):
             # enable file logging
@@ -150,10 +159,13 @@ def _set_logging(output_type, log_args=None, other_args=None):  # noqa: C901
                 attr.fields_dict(type(log_args))[filename_attr].default
             ):
                 # FIXME EOS-13228 regression
-                if isinstance(cmd_inst, SetupCmdBase) and False:
+                if _is_setup_cmd(cmd_inst) and False:
                     # TODO IMPROVE EOS-13228 not a clean way to check
                     #      other args here, logging was supposed to be
                     #      agnostic to commands
+                    from .commands.setup_provisioner import (
+                        SetupCmdBase, RunArgsSetupProvisionerGeneric
+                    )
                     run_args = RunArgsSetupProvisionerGeneric(
                         **{
                             k: other_args.kwargs.get(k) for k in list(
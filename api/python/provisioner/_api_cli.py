@@ -62,15 +62,19 @@ def process_cli_result(
     stdout: str = None, stderr: str = None
 ):
     res = None
+    decode_errors = []
     try:
-        try:
-            res = serialize.loads(stdout) if stdout else {}
-        except errors.PrvsnrTypeDecodeError:
-            logger.exception('Failed to decode provisioner output')
-            res = serialize.loads(stdout, strict=False)
+        # Note. tolerant decoding in a single pass, objects
+        #       that can't be decoded are kept as is
+        res = serialize.loads(
+            stdout, strict=False, errors=decode_errors
+        ) if stdout else {}
     except Exception:
         logger.exception(f"Unexpected result: {stdout}")
 
+    for exc in decode_errors:
+        logger.error(f'Failed to decode provisioner output: {exc}')
+
     if type(res) is not dict:
         raise errors.ProvisionerError(f'Unexpected result {stdout}')
 
@@ -170,6 +174,7 @@ for fun in [
     'grains_get',
     'pillar_get',
     'pillar_set',
+    'pillar_set_many',
     'get_params',
     'set_params',
     'set_ntp',
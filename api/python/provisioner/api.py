@@ -16,6 +16,7 @@
 #
 
 import importlib
+from contextlib import contextmanager
 
 from .config import ALL_MINIONS, CONTROLLER_BOTH, HashType, ISOVersion
 
@@ -76,6 +77,21 @@ def get_result(cmd_id: str):
     )
 
 
+def list_results(cmd=None, status=None, since=None, limit=None):
+    r"""Lists previously scheduled commands, most recent first
+
+    :param cmd: (optional) Filter by command name
+    :param status: (optional) Filter by status:
+        ``running``, ``finished`` or ``failed``
+    :param since: (optional) Filter by start time (seconds since the epoch)
+    :param limit: (optional) Max number of commands to return
+    """
+
+    return _api_call(
+        'list_results', cmd=cmd, status=status, since=since, limit=limit
+    )
+
+
 def pillar_get(*keypaths, targets=ALL_MINIONS, nowait=False):
     return _api_call(
         'pillar_get', *keypaths, targets=targets, nowait=nowait
@@ -89,6 +105,66 @@ def pillar_set(keypath, value, fpath=None, targets=ALL_MINIONS, nowait=False):
     )
 
 
+def pillar_set_many(items, fpath=None, targets=ALL_MINIONS, nowait=False):
+    r"""Sets many pillar values at once.
+
+    All the values are applied as a single update: each pillar file
+    is written once, pillar is refreshed once and all the changes
+    are rolled back together on any error.
+
+    :param items: Pillar key paths to values mapping.
+    :param fpath: (optional) File path relative to pillar roots,
+        if not specified ``<key-path-top-level-part>.sls`` is used.
+    :param targets: (optional) Host targets. Default: ``ALL_MINIONS``
+    :param nowait: (optional) Run asynchronously. Default: False
+
+    Example:
+    .. highlight:: python
+    .. code-block:: python
+
+        from provisioner import pillar_set_many
+
+        pillar_set_many({
+            'cluster/srvnode-1/storage/metadata_devices': ['/dev/sdb'],
+            'cluster/srvnode-1/storage/data_devices': ['/dev/sdc']
+        })
+
+    """
+    return _api_call(
+        'pillar_set_many', items, fpath=fpath,
+        targets=targets, nowait=nowait
+    )
+
+
+@contextmanager
+def pillar_transaction(fpath=None, targets=ALL_MINIONS):
+    r"""Collects pillar updates and applies them as a single update.
+
+    Yields a dict of pillar key paths to values, the values are set
+    (using :func:`pillar_set_many`) once the block is exited without
+    an error, otherwise nothing is changed.
+
+    :param fpath: (optional) File path relative to pillar roots,
+        if not specified ``<key-path-top-level-part>.sls`` is used.
+    :param targets: (optional) Host targets. Default: ``ALL_MINIONS``
+
+    Example:
+    .. highlight:: python
+    .. code-block:: python
+
+        from provisioner import pillar_transaction
+
+        with pillar_transaction() as pillar:
+            for node in ('srvnode-1', 'srvnode-2'):
+                pillar[f'cluster/{node}/storage/data_devices'] = ['/dev/sdc']
+
+    """
+    items = {}
+    yield items
+    if items:
+        pillar_set_many(items, fpath=fpath, targets=targets)
+
+
 def get_params(*params, targets=ALL_MINIONS, nowait=False):
     return _api_call(
         'get_params', *params, targets=targets, nowait=nowait
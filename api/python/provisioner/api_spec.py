@@ -21,7 +21,7 @@ from typing import Dict
 from pathlib import Path
 
 from .config import API_SPEC_PATH, PARAMS_SPEC_PATH
-from .utils import load_yaml
+from .utils import load_yaml_cached
 from provisioner import param
 
 MODULE_DIR = Path(__file__).resolve().parent
@@ -74,5 +74,5 @@ def process_param_spec(  # noqa: C901 FIXME
     return dest
 
 
-param_spec = process_param_spec(load_yaml(PARAMS_SPEC_PATH))
-api_spec = load_yaml(API_SPEC_PATH)
+param_spec = process_param_spec(load_yaml_cached(PARAMS_SPEC_PATH))
+api_spec = load_yaml_cached(API_SPEC_PATH)
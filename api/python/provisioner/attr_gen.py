@@ -114,7 +114,7 @@ def validator__version_specifier(instance, attribute, value):
 
 
 def load_attrs_spec():
-    res = utils.load_yaml(config.ATTRS_SPEC_PATH)
+    res = utils.load_yaml_cached(config.ATTRS_SPEC_PATH)
 
     for attr_t in res:
         for fun_t in (CONVERTER, VALIDATOR):
@@ -153,7 +153,8 @@ def attr_ib(key: str = None, special_values: Optional[List] = None, **kwargs):
     _kwargs = {}
 
     if key:
-        _kwargs = KeyPath(key).value(attrs_spec)
+        # Note. a copy, attrs_spec is shared across all attributes
+        _kwargs = dict(KeyPath(key).value(attrs_spec))
         if special_values:
             _kwargs[CONVERTER] = converter__special_values(
                 special_values, _kwargs.get(CONVERTER)
@@ -166,7 +167,7 @@ def attr_ib(key: str = None, special_values: Optional[List] = None, **kwargs):
 
     cli_spec = _kwargs.pop('cli_spec', None)
     if cli_spec:
-        _kwargs['metadata'] = _kwargs.pop('metadata', {})
+        _kwargs['metadata'] = dict(_kwargs.pop('metadata', {}))
         _kwargs['metadata'][inputs.METADATA_ARGPARSER] = cli_spec
 
     return attr.ib(**_kwargs)
@@ -145,8 +145,20 @@ def parse_args(args=None, commands: Optional[List] = None):
             description='valid subcommands'
         )
 
+        # Note. only commands mentioned in the arguments are resolved
+        #       (and filled), commands may be a lazy mapping
+        _args = sys.argv[1:] if args is None else args
+        requested = set(_args).intersection(commands)
+
         # TODO description and help strings
-        for cmd_name, cmd in commands.items():
+        for cmd_name in commands:
+            if cmd_name not in requested:
+                subparsers.add_parser(
+                    cmd_name, help='{} help'.format(cmd_name)
+                )
+                continue
+
+            cmd = commands[cmd_name]
             desc = getattr(cmd, 'description', f'{cmd_name} configuration')
 
             subparser = subparsers.add_parser(
@@ -16,6 +16,7 @@
 #
 
 import sys
+from collections.abc import Mapping
 from typing import List, Dict, Type, Union, Optional
 from copy import deepcopy
 import logging
@@ -28,7 +29,6 @@ import importlib
 from ..lock import api_lock
 
 from ._basic import RunArgs, CommandParserFillerMixin, RunArgsBase
-from .check import Check, SWUpdateDecisionMaker
 
 from ..vendor import attr
 from ..errors import (
@@ -74,7 +74,8 @@ from ..salt import (
     StateFunExecuter,
     State,
     YumRollbackManager,
-    SaltJobsRunner, function_run,
+    function_run,
+    grains_get,
     copy_to_file_roots, cmd_run as salt_cmd_run,
     local_minion_id
 )
@@ -90,6 +91,8 @@ from ..salt_master import (
     ensure_salt_master_is_running
 )
 from ..salt_minion import config_salt_minions
+from ..job_results import JobResultStatus
+from .. import job_results
 from .. import inputs, values
 
 _mod = sys.modules[__name__]
@@ -141,6 +144,48 @@ class RunArgsGetResult:
     )
 
 
+@attr.s(auto_attribs=True)
+class RunArgsListResults:
+    cmd: str = attr.ib(
+        default=None,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': "filter by provisioner command name"
+            }
+        }
+    )
+    status: str = attr.ib(
+        default=None,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': "filter by command status",
+                'choices': [s.value for s in JobResultStatus]
+            }
+        }
+    )
+    since: float = attr.ib(
+        default=None,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': (
+                    "filter by command start time "
+                    "(seconds since the epoch)"
+                )
+            }
+        },
+        converter=attr.converters.optional(float)
+    )
+    limit: int = attr.ib(
+        default=None,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': "max number of results to return"
+            }
+        },
+        converter=attr.converters.optional(int)
+    )
+
+
 @attr.s(auto_attribs=True)
 class RunArgsSSLCerts:
     source: str = attr.ib(
@@ -504,6 +549,9 @@ class SWUpdate(CommandParserFillerMixin):
         #      options: set up temp ssh config and rollback yum + minion config
         #      via ssh as a fallback
 
+        # checks pull in the validators, import them only when needed
+        from .check import Check, SWUpdateDecisionMaker
+
         rollback_ctx = None
         minion_conf_changes = None
         try:
@@ -785,7 +833,24 @@ class GetResult(CommandParserFillerMixin):
     _run_args_type = RunArgsGetResult
 
     def run(self, cmd_id: str):
-        return SaltJobsRunner.prvsnr_job_result(cmd_id)
+        return job_results.get_result(cmd_id)
+
+
+@attr.s(auto_attribs=True)
+class ListResults(CommandParserFillerMixin):
+    input_type: Type[inputs.NoParams] = inputs.NoParams
+    _run_args_type = RunArgsListResults
+
+    def run(
+        self,
+        cmd: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None
+    ):
+        return job_results.list_results(
+            cmd=cmd, status=status, since=since, limit=limit
+        )
 
 
 # TODO TEST
@@ -795,10 +860,7 @@ class GetClusterId(CommandParserFillerMixin):
     _run_args_type = RunArgsEmpty
 
     def run(self):
-        return list(function_run(
-            'grains.get',
-            fun_args=['cluster_id']
-        ).values())[0]
+        return list(grains_get('cluster_id').values())[0]
 
 
 # TODO TEST
@@ -808,11 +870,7 @@ class GetNodeId(CommandParserFillerMixin):
     _run_args_type = RunArgsBase
 
     def run(self, targets):
-        return function_run(
-            'grains.get',
-            fun_args=['node_id'],
-            targets=targets
-        )
+        return grains_get('node_id', targets=targets)
 
 
 # TODO TEST
@@ -1050,26 +1108,55 @@ class ConfigureCortx(CommandParserFillerMixin):
             print(dump_yaml_str(res))
 
 
-commands = {}
-for cmd_name, spec in api_spec.items():
-    spec = deepcopy(api_spec[cmd_name])  # TODO
-    cmd_path = spec.pop('type')
+@attr.s(auto_attribs=True)
+class CommandsRegistry(Mapping):
+    """Commands built from the API spec on first access.
 
-    cmd_module_path = '.'.join(cmd_path.split('.')[0:-1])
-    cmd_cls = cmd_path.split('.')[-1]
-    try:
-        command = getattr(_mod, cmd_cls)
-    except AttributeError:
+    So command modules (and their dependencies) are imported
+    only for the commands that are actually used.
+    """
+    spec: Dict
+    _commands: Dict = attr.Factory(dict)
+
+    def __getitem__(self, cmd_name: str):
         try:
-            import_path = 'provisioner.commands'
-            if cmd_module_path:
-                import_path = f'{import_path}.{cmd_module_path}'
-            else:
-                import_path = f'{import_path}.{cmd_name}'
+            return self._commands[cmd_name]
+        except KeyError:
+            spec = deepcopy(self.spec[cmd_name])  # TODO
 
-            cmd_mod = importlib.import_module(import_path)
-        except Exception:
-            logger.error(f"Failed to import '{cmd_path}' for command '{cmd_name}'")
-            raise
-        command = getattr(cmd_mod, cmd_cls)
-    commands[cmd_name] = command.from_spec(**spec)
+        cmd_path = spec.pop('type')
+
+        cmd_module_path = '.'.join(cmd_path.split('.')[0:-1])
+        cmd_cls = cmd_path.split('.')[-1]
+        try:
+            command = getattr(_mod, cmd_cls)
+        except AttributeError:
+            try:
+                import_path = 'provisioner.commands'
+                if cmd_module_path:
+                    import_path = f'{import_path}.{cmd_module_path}'
+                else:
+                    import_path = f'{import_path}.{cmd_name}'
+
+                cmd_mod = importlib.import_module(import_path)
+            except Exception:
+                logger.error(
+                    f"Failed to import '{cmd_path}' for command '{cmd_name}'"
+                )
+                raise
+            command = getattr(cmd_mod, cmd_cls)
+
+        res = self._commands[cmd_name] = command.from_spec(**spec)
+        return res
+
+    def __contains__(self, cmd_name):
+        return cmd_name in self.spec
+
+    def __iter__(self):
+        return iter(self.spec)
+
+    def __len__(self):
+        return len(self.spec)
+
+
+commands = CommandsRegistry(api_spec)
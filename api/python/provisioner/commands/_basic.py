@@ -63,6 +63,29 @@ class RunArgs:
             }
         }
     )
+    batch: Optional[str] = attr.ib(
+        default=None,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': (
+                    "apply states in rolling batches of the specified size:"
+                    " a number of nodes or a percentage, e.g. '25%%'"
+                )
+            }
+        }
+    )
+    batch_max_failures: int = attr.ib(
+        default=0,
+        metadata={
+            inputs.METADATA_ARGPARSER: {
+                'help': (
+                    "a number of failed nodes to tolerate"
+                    " before the batch rollout is stopped"
+                )
+            }
+        },
+        converter=int
+    )
 
 
 def converter__str_to_salt_client_t(client: str):
@@ -106,43 +106,46 @@ class AutoDeploy(SetupCmdBase, CommandParserFillerMixin):
             nodes, **setup_provisioner_args
         )
 
-        if setup_provisioner_args.get('config_path'):
-            logger.info("Configuring setup using config.ini")
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner configure_setup '
-                    f'{PRVSNR_PILLAR_CONFIG_INI} '
-                    f'{len(nodes)}'
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'salt-call state.apply '
-                    'components.system.config.pillar_encrypt'
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'salt-call state.apply '
-                    'components.system.config.hosts'
+        try:
+            if setup_provisioner_args.get('config_path'):
+                logger.info("Configuring setup using config.ini")
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner configure_setup '
+                        f'{PRVSNR_PILLAR_CONFIG_INI} '
+                        f'{len(nodes)}'
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'salt-call state.apply '
+                        'components.system.config.pillar_encrypt'
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'salt-call state.apply '
+                        'components.system.config.hosts'
+                    )
                 )
-            )
 
-            # The ConfStore JSON is required to be generated on all nodes
-            # TODO: To be parameterized when addressing EOS-16560
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner confstore_export '
-                ), targets=ALL_MINIONS
-            )
+                # The ConfStore JSON is required to be generated on all nodes
+                # TODO: To be parameterized when addressing EOS-16560
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner confstore_export '
+                    ), targets=ALL_MINIONS
+                )
 
-        logger.info("Deployment Pre-Flight Validations")
-        self.deployment_validations(GroupChecks.DEPLOY_PRE_CHECKS.value)
+            logger.info("Deployment Pre-Flight Validations")
+            self.deployment_validations(GroupChecks.DEPLOY_PRE_CHECKS.value)
 
-        logger.info("Deploy")
-        deploy_dual.DeployDual(setup_ctx=setup_ctx).run(
-            **deploy_args
-        )
+            logger.info("Deploy")
+            deploy_dual.DeployDual(setup_ctx=setup_ctx).run(
+                **deploy_args
+            )
+        finally:
+            setup_ctx.ssh_client.close()
 
         logger.info("Post-Deployment Validations")
         self.deployment_validations(GroupChecks.DEPLOY_POST_CHECKS.value)
@@ -67,29 +67,32 @@ class AutoDeployVM(SetupCmdBase, CommandParserFillerMixin):
             nodes, **setup_provisioner_args
         )
 
-        if setup_provisioner_args.get('config_path'):
-            logger.info("Configuring setup using config.ini")
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner configure_setup '
-                    f'{config.PRVSNR_PILLAR_CONFIG_INI} '
-                    f'{len(nodes)}'
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'salt-call state.apply '
-                    'components.system.config.pillar_encrypt'
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
+        try:
+            if setup_provisioner_args.get('config_path'):
+                logger.info("Configuring setup using config.ini")
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner configure_setup '
+                        f'{config.PRVSNR_PILLAR_CONFIG_INI} '
+                        f'{len(nodes)}'
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'salt-call state.apply '
+                        'components.system.config.pillar_encrypt'
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
 
-            # The ConfStore JSON is required to be generated on all nodes
-            # TODO: To be parameterized when addressing EOS-16560
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner confstore_export '
-                ), targets=config.ALL_MINIONS
-            )
+                # The ConfStore JSON is required to be generated on all nodes
+                # TODO: To be parameterized when addressing EOS-16560
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner confstore_export '
+                    ), targets=config.ALL_MINIONS
+                )
+        finally:
+            setup_ctx.ssh_client.close()
 
         if len(nodes) == 1:
             deploy_args['setup_type'] = SetupType.SINGLE
@@ -51,9 +51,10 @@ from ..utils import (
     load_yaml_str,
     repo_tgz,
     run_subprocess_cmd,
+    run_parallel,
     node_hostname_validator
 )
-from ..ssh import keygen
+from ..ssh import keygen, SSHControlMaster
 from ..salt import SaltSSHClient
 from .setup_gluster import SetupGluster
 from . import (
@@ -122,7 +123,8 @@ class BootstrapProvisioner(SetupCmdBase, CommandParserFillerMixin):
         return SaltSSHClient(
             c_path=c_path,
             roster_file=roster_file,
-            ssh_options=ssh_options
+            ssh_options=ssh_options,
+            control_master=SSHControlMaster()
         )
 
     def _resolve_connections(self, nodes: List[Node], ssh_client):
@@ -745,20 +747,41 @@ class BootstrapProvisioner(SetupCmdBase, CommandParserFillerMixin):
         )
 
         setup_ctx = SetupCtx(run_args, paths, ssh_client)
+        try:
+            self._setup_nodes(setup_ctx, master_targets, nodes, **kwargs)
+        except Exception:
+            ssh_client.close()
+            raise
 
-        # we iterate explicitly here to make the progress clearer in console
-        for node in run_args.nodes:
+        return setup_ctx
+
+    def _setup_nodes(  # noqa: C901 FIXME
+        self, setup_ctx, master_targets, nodes, **kwargs
+    ):
+        run_args = setup_ctx.run_args
+        paths = setup_ctx.profile_paths
+        ssh_client = setup_ctx.ssh_client
+
+        bootstrap_roster_file = (
+            paths['salt_bootstrap_roster_file']
+            if paths['salt_bootstrap_roster_file'].exists()
+            else None
+        )
+
+        # nodes are handled separately to make the progress clearer
+        # in console
+        def _ensure_ready(node):
             logger.info(
                 f"Ensuring '{node.minion_id}' is ready to accept commands"
             )
             ssh_client.ensure_ready(
-                [node.minion_id],
-                bootstrap_roster_file=(
-                    paths['salt_bootstrap_roster_file']
-                    if paths['salt_bootstrap_roster_file'].exists()
-                    else None
-                )
+                [node.minion_id], bootstrap_roster_file=bootstrap_roster_file
             )
+            logger.info(f"'{node.minion_id}' is ready")
+
+        run_parallel(
+            _ensure_ready, run_args.nodes, max_workers=run_args.max_parallel
+        )
 
         logger.info("Resolving node grains")
         self._resolve_grains(run_args.nodes, ssh_client)
@@ -1094,15 +1117,17 @@ class BootstrapProvisioner(SetupCmdBase, CommandParserFillerMixin):
         )
 
         logger.info("Configuring provisioner for future updates")
-        for node in run_args.nodes:
-            ssh_client.state_apply(
+        run_parallel(
+            lambda node: ssh_client.state_apply(
                 'update_post_boot',
                 targets=node.minion_id
-            )
-
-        return setup_ctx
+            ),
+            run_args.nodes,
+            max_workers=run_args.max_parallel
+        )
 
     def run(self, *args, **kwargs):
-        self._run(*args, **kwargs)
+        setup_ctx = self._run(*args, **kwargs)
+        setup_ctx.ssh_client.close()
 
         logger.info("Done")
@@ -31,7 +31,7 @@ from ..errors import (
     SWUpgradeError)
 from ..hare import ensure_cluster_is_healthy
 from ..pillar import KeyPath, PillarKey, PillarResolver
-from ..salt import local_minion_id, cmd_run
+from ..salt import local_minion_id, cmd_run, function_run_batch
 from ..salt_minion import check_salt_minions_are_ready
 from ..vendor import attr
 
@@ -543,7 +543,9 @@ class Check(CommandParserFillerMixin):
 
         # maybe we need to call it from the all targets and analyze the output
         # from each node
-        pillar = PillarResolver(cfg.LOCAL_MINION).get(pillar_keys)
+        pillar = PillarResolver(
+            cfg.LOCAL_MINION, keypaths_only=True
+        ).get(pillar_keys)
 
         pillar = pillar.get(local_minion_id())  # type: dict
 
@@ -604,9 +606,9 @@ class Check(CommandParserFillerMixin):
         _PING_CMD_TMPL = "ping -c 1 -W 1 {server_addr}"
 
         res: List[CheckEntry] = list()
+        calls = dict()
 
         for addr in servers:
-            check_entry: CheckEntry = CheckEntry(cfg.Checks.CONNECTIVITY.value)
             # NOTE: check ping of 'srvnode-2' from 'srvnode-1'
             # and vise versa
             # TODO: which targets do we need to use? Because we need to
@@ -616,15 +618,20 @@ class Check(CommandParserFillerMixin):
                        else next(iter(targets)))  # takes just one node
 
             cmd = _PING_CMD_TMPL.format(server_addr=addr)
-            try:
-                cmd_run(cmd, targets=targets)
-            except SaltCmdResultError:
+            calls[addr] = ('cmd.run', targets, [cmd])
+
+        # ping all the servers at once
+        for addr, call_res in function_run_batch(calls).items():
+            check_entry: CheckEntry = CheckEntry(cfg.Checks.CONNECTIVITY.value)
+            targets = call_res.call.targets
+            if isinstance(call_res.error, SaltCmdResultError):
                 check_entry.set_fail(checked_target=targets,
                                      comment=(f"{cfg.CheckVerdict.FAIL.value}:"
                                               f" {addr} is not reachable "
                                               f"from {targets}"))
             else:
-                # if no error occurred
+                # raises other errors if any
+                call_res.get()
                 check_entry.set_passed(checked_target=targets)
 
             res.append(check_entry)
@@ -723,6 +730,7 @@ class Check(CommandParserFillerMixin):
                                     'exit 1; }}')
 
         res: List[CheckEntry] = list()
+        calls = dict()
 
         user = "root"
         for addr in servers:
@@ -737,19 +745,22 @@ class Check(CommandParserFillerMixin):
 
             cmd = _PSWDLESS_SSH_CHECK_CMD_TMPL.format(user=user,
                                                       hostname=addr)
+            calls[addr] = ('cmd.run', targets, [cmd])
 
+        # check all the servers at once
+        for addr, call_res in function_run_batch(calls).items():
             check_ret: CheckEntry = CheckEntry(
                 cfg.Checks.PASSWORDLESS_SSH_ACCESS.value)
-            try:
-                _ = cmd_run(cmd, targets=targets)
-            except SaltCmdResultError:
+            targets = call_res.call.targets
+            if isinstance(call_res.error, SaltCmdResultError):
                 check_ret.set_fail(
                     checked_target=targets,
                     comment=(f"{cfg.CheckVerdict.FAIL.value}: "
                              f"'{addr}' is not reachable from "
                              f"{targets} under user {user}"))
             else:
-                # if no error occurred
+                # raises other errors if any
+                call_res.get()
                 check_ret.set_passed(checked_target=targets)
 
             res.append(check_ret)
@@ -1256,7 +1267,9 @@ class Check(CommandParserFillerMixin):
     def _get_pillar_data(key):
         """Retrieve pillar data."""
         pillar_key = PillarKey(key)
-        pillar = PillarResolver(cfg.LOCAL_MINION).get([pillar_key])
+        pillar = PillarResolver(
+            cfg.LOCAL_MINION, keypaths_only=True
+        ).get([pillar_key])
         pillar = next(iter(pillar.values()))
 
         if not pillar[pillar_key] or pillar[pillar_key] is values.MISSED:
@@ -25,9 +25,12 @@ from .. import (
 )
 from ..salt import (
     function_run,
+    function_run_batch,
     cmd_run,
     StatesApplier,
+    StatesBatch,
     local_minion_id,
+    resolve_targets,
     sls_exists
 )
 from ..vendor import attr
@@ -35,6 +38,7 @@ from ..utils import ensure
 # TODO IMPROVE EOS-8473
 
 from . import (
+    RunArgs,
     RunArgsUpdate,
     CommandParserFillerMixin
 )
@@ -117,6 +121,8 @@ def build_deploy_run_args(deploy_states: Dict):
     @attr.s(auto_attribs=True)
     class _RunArgsDeploy(RunArgsUpdate):
         setup_type: str = RunArgsConfigureSetupAttrs.setup_type
+        batch: Optional[str] = RunArgs.batch
+        batch_max_failures: int = RunArgs.batch_max_failures
         states: str = attr.ib(
             metadata={
                 inputs.METADATA_ARGPARSER: {
@@ -231,26 +237,44 @@ class Deploy(CommandParserFillerMixin):
 
         return res[self._primary_id()] == 'server'
 
+    def _secondaries(self, primary):
+        secondaries = f"not {primary}"
+        if self.setup_ctx:
+            # matched by the remote salt-master
+            return secondaries
+        return resolve_targets(secondaries, tgt_type='compound')
+
     def _apply_state(
-        self, state, targets=config.ALL_MINIONS, stages: Optional[List] = None
+        self, state, targets=config.ALL_MINIONS, stages: Optional[List] = None,
+        batch: Optional[StatesBatch] = None
     ):
+        if isinstance(targets, list) and not targets:
+            logger.info(f"No targets to apply '{state}' on, skipped")
+            return
+
         if stages is None:
             logger.info(f"Applying '{state}' on {targets}")
             if self.setup_ctx:
+                batch_opts = ''
+                if batch:
+                    batch_opts = f" --batch-size '{batch.size}'"
+                    if not batch.max_failures:
+                        batch_opts += ' --failhard'
                 return self.setup_ctx.ssh_client.cmd_run(
                     (
-                        f"salt -C '{targets}' state.apply {state} --out=json"
+                        f"salt -C '{targets}' state.apply {state}"
+                        f"{batch_opts} --out=json"
                     ), targets=self._primary_id()
                 )
             else:
                 return StatesApplier.apply(
-                    [state], targets, tgt_type='compound'
+                    [state], targets, tgt_type='compound', batch=batch
                 )
         else:
             for stage in stages:
                 _state = f"{state}.{stage}"
                 if self._sls_exists(_state, targets=targets):
-                    self._apply_state(_state, targets)
+                    self._apply_state(_state, targets, batch=batch)
                 else:
                     logger.warning(f"State {_state} is missed, ignored")
 
@@ -267,9 +291,14 @@ class Deploy(CommandParserFillerMixin):
         targets = run_args.targets
         states = deploy_states[states_group]
         stages = run_args.stages
+        batch = None
+        if run_args.batch:
+            batch = StatesBatch(
+                run_args.batch, max_failures=run_args.batch_max_failures
+            )
 
         primary = self._primary_id()
-        secondaries = f"not {primary}"
+        secondaries = self._secondaries(primary)
 
         hw_states = [
             "system.storage.multipath",
@@ -285,7 +314,9 @@ class Deploy(CommandParserFillerMixin):
             if setup_type == SetupType.SINGLE:
                 # TODO use salt orchestration
                 if "sync" not in state:
-                    self._apply_state(f"components.{state}", targets, stages)
+                    self._apply_state(
+                        f"components.{state}", targets, stages, batch
+                    )
             else:
                 if state in (
                     "system.storage",
@@ -295,7 +326,7 @@ class Deploy(CommandParserFillerMixin):
                     if state == "sspl":
                         self.ensure_consul_running()
                     self._apply_state(
-                        f"components.{state}", secondaries, stages
+                        f"components.{state}", secondaries, stages, batch
                     )
                     self._apply_state(f"components.{state}", primary, stages)
 
@@ -307,11 +338,13 @@ class Deploy(CommandParserFillerMixin):
                 ):
                     self._apply_state(f"components.{state}", primary, stages)
                     self._apply_state(
-                        f"components.{state}", secondaries, stages
+                        f"components.{state}", secondaries, stages, batch
                     )
                 else:
                      # Execute on all targets
-                    self._apply_state(f"components.{state}", targets, stages)
+                    self._apply_state(
+                        f"components.{state}", targets, stages, batch
+                    )
 
     def _update_salt(self, targets=config.ALL_MINIONS):
         # TODO IMPROVE why do we need that
@@ -351,20 +384,27 @@ class Deploy(CommandParserFillerMixin):
         consul_map = {"srvnode-1": "hare-consul-agent-c1",
                       "srvnode-2": "hare-consul-agent-c2"}
         result_flag = True
-        for target in consul_map:
-            if self.setup_ctx:
-                res = self.setup_ctx.ssh_client.run(
-                    'service.status',
-                    fun_args=[consul_map[target]],
-                    targets=target
-                )
-            else:
-                res = function_run(
+
+        if self.setup_ctx:
+            results = {
+                target: self.setup_ctx.ssh_client.run(
                     'service.status',
                     fun_args=[consul_map[target]],
                     targets=target
                 )
-
+                for target in consul_map
+            }
+        else:
+            # check all the nodes at once
+            results = {
+                target: res.get()
+                for target, res in function_run_batch({
+                    target: ('service.status', target, [service])
+                    for target, service in consul_map.items()
+                }).items()
+            }
+
+        for target, res in results.items():
             if not res[target]:
                 result_flag = False
                 logger.info(f"Consul is not running on {target}")
@@ -144,7 +144,7 @@ class DeployDual(Deploy):
         stages = run_args.stages
 
         primary = self._primary_id()
-        secondaries = f"not {primary}"
+        secondaries = self._secondaries(primary)
 
         # apply states
         if setup_type == SetupType.SINGLE:
@@ -104,7 +104,7 @@ class DeployVM(Deploy):
         stages = run_args.stages
 
         primary = self._primary_id()
-        secondaries = f"not {primary}"
+        secondaries = self._secondaries(primary)
 
         # apply states
         for state in states:
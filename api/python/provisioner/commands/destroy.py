@@ -22,6 +22,7 @@ from .. import (
     config
 )
 from ..utils import run_subprocess_cmd
+from ..ssh import SSHControlMaster
 from ..salt import (
     local_minion_id,
     SaltSSHClient
@@ -145,7 +146,8 @@ class DestroyNode(Deploy):
         return SaltSSHClient(
             c_path=c_path,
             roster_file=roster_file,
-            ssh_options=ssh_options
+            ssh_options=ssh_options,
+            control_master=SSHControlMaster()
         )
 
     def _apply_states(self, state, targets=None):
@@ -291,55 +293,60 @@ class DestroyNode(Deploy):
 
         self.setup_ctx = SetupCtx(ssh_client)
 
-        if len(self._secondaries()):
-            run_args.setup_type = SetupType.GENERIC
-
-        # Need to remove cache and few dir manually
-        list_cmds = ["rm -rf /var/cache/salt/"]
-        list_cmds.append(f"rm -rf {str(config.profile_base_dir().parent)}")
-        list_cmds.append(f"rm -rf {config.CORTX_ROOT_DIR}")
-        list_cmds.append(f"rm -rf {config.PRVSNR_DATA_SHARED_DIR}")
-        list_cmds.append(
-            "yum remove -y salt salt-minion salt-master python36-m2crypto")
-
-        if run_args.states is None:  # all states
-            self._run_states('ha', run_args)
-            self._run_states('controlpath', run_args)
-            self._run_states('iopath', run_args)
-            self._run_states('utils', run_args)
-            self._run_states('prereq', run_args)
-            self._run_states('system', run_args)
-            self._run_states('bootstrap', run_args)
-            self._run_cmd(list_cmds)
-        else:
-            if 'bootstrap' in run_args.states:
-                logger.info("Teardown Provisioner Bootstrapped Environment")
-                self._run_states('bootstrap', run_args)
-                self._run_cmd(list_cmds)
-
-            if 'system' in run_args.states:
-                logger.info("Teardown the system states")
-                self._run_states('system', run_args)
-
-            if 'utils' in run_args.states:
-                logger.info("Teardown foundation states")
-                self._run_states('utils', run_args)
-
-            if 'prereq' in run_args.states:
-                logger.info("Teardown the prereq states")
-                self._run_states('prereq', run_args)
-
-            if 'iopath' in run_args.states:
-                logger.info("Teardown the io path states")
-                self._run_states('iopath', run_args)
-
-            if 'ha' in run_args.states:
-                logger.info("Teardown the ha path states")
+        try:
+            if len(self._secondaries()):
+                run_args.setup_type = SetupType.GENERIC
+
+            # Need to remove cache and few dir manually
+            list_cmds = ["rm -rf /var/cache/salt/"]
+            list_cmds.append(f"rm -rf {str(config.profile_base_dir().parent)}")
+            list_cmds.append(f"rm -rf {config.CORTX_ROOT_DIR}")
+            list_cmds.append(f"rm -rf {config.PRVSNR_DATA_SHARED_DIR}")
+            list_cmds.append(
+                "yum remove -y salt salt-minion salt-master python36-m2crypto")
+
+            if run_args.states is None:  # all states
                 self._run_states('ha', run_args)
-
-            if 'controlpath' in run_args.states:
-                logger.info("Teardown the control path states")
                 self._run_states('controlpath', run_args)
+                self._run_states('iopath', run_args)
+                self._run_states('utils', run_args)
+                self._run_states('prereq', run_args)
+                self._run_states('system', run_args)
+                self._run_states('bootstrap', run_args)
+                self._run_cmd(list_cmds)
+            else:
+                if 'bootstrap' in run_args.states:
+                    logger.info(
+                        "Teardown Provisioner Bootstrapped Environment"
+                    )
+                    self._run_states('bootstrap', run_args)
+                    self._run_cmd(list_cmds)
+
+                if 'system' in run_args.states:
+                    logger.info("Teardown the system states")
+                    self._run_states('system', run_args)
+
+                if 'utils' in run_args.states:
+                    logger.info("Teardown foundation states")
+                    self._run_states('utils', run_args)
+
+                if 'prereq' in run_args.states:
+                    logger.info("Teardown the prereq states")
+                    self._run_states('prereq', run_args)
+
+                if 'iopath' in run_args.states:
+                    logger.info("Teardown the io path states")
+                    self._run_states('iopath', run_args)
+
+                if 'ha' in run_args.states:
+                    logger.info("Teardown the ha path states")
+                    self._run_states('ha', run_args)
+
+                if 'controlpath' in run_args.states:
+                    logger.info("Teardown the control path states")
+                    self._run_states('controlpath', run_args)
+        finally:
+            ssh_client.close()
 
         logger.info("Destroy VM - Done")
         run_subprocess_cmd(f"rm -rf {str(temp_dir)}")
@@ -25,7 +25,7 @@ from .. import inputs, values
 from .. import config
 from ..errors import BadPillarDataError
 from ..pillar import KeyPath, PillarKey, PillarResolver, PillarUpdater
-from ..salt import function_run, local_minion_id
+from ..salt import grains_get, local_minion_id
 from ..vendor import attr
 
 
@@ -101,8 +101,7 @@ class GetSetupInfo(CommandParserFillerMixin):
         """
         res = dict()
 
-        salt_res = function_run('grains.get', fun_args=['virtual'],
-                                targets=config.LOCAL_MINION)
+        salt_res = grains_get('virtual', targets=config.LOCAL_MINION)
         if salt_res:
             # it should have the following format
             # {"current node name": "physical"} or
@@ -76,86 +76,89 @@ class PostProvisioner(SetupCmdBase, CommandParserFillerMixin):
             paths['salt_master_file'], paths['salt_roster_file']
         )
 
-        if not run_args.field_setup:
-            logger.info("Generating a password for the service user")
+        try:
+            if not run_args.field_setup:
+                logger.info("Generating a password for the service user")
 
-            service_user_password = utils.generate_random_secret()
+                service_user_password = utils.generate_random_secret()
 
-            ssh_client.cmd_run(
-                (
-                    'provisioner pillar_set'
-                    f' system/service-user/password '
-                    f' \'"{service_user_password}"\''
-                ),
-                targets=run_args.primary.minion_id,
-                secure=True
-            )
-
-        # Grains data is not getting refreshed within sls files
-        # if we call init.sls for machine_id states.
-        logger.info("Refresh machine id on the system")
-        for state in [
-            'components.provisioner.config.machine_id.reset',
-            'components.provisioner.config.machine_id.refresh_grains'
-        ]:
-            ssh_client.cmd_run(
-                f"salt-call state.apply {state}",
-                targets=ALL_MINIONS
-            )
+                ssh_client.cmd_run(
+                    (
+                        'provisioner pillar_set'
+                        f' system/service-user/password '
+                        f' \'"{service_user_password}"\''
+                    ),
+                    targets=run_args.primary.minion_id,
+                    secure=True
+                )
 
-        inline_pillar = None
-        if run_args.source == 'local':
-            for pkg in [
-                'rsyslog',
-                'rsyslog-elasticsearch',
-                'rsyslog-mmjsonparse'
+            # Grains data is not getting refreshed within sls files
+            # if we call init.sls for machine_id states.
+            logger.info("Refresh machine id on the system")
+            for state in [
+                'components.provisioner.config.machine_id.reset',
+                'components.provisioner.config.machine_id.refresh_grains'
             ]:
                 ssh_client.cmd_run(
-                    (
-                        "provisioner pillar_set "
-                        f"commons/version/{pkg} '\"latest\"'"
-                    ), targets=run_args.primary.minion_id
+                    f"salt-call state.apply {state}",
+                    targets=ALL_MINIONS
                 )
-                inline_pillar = (
-                    "{\"inline\": {\"no_encrypt\": True}}"
+
+            inline_pillar = None
+            if run_args.source == 'local':
+                for pkg in [
+                    'rsyslog',
+                    'rsyslog-elasticsearch',
+                    'rsyslog-mmjsonparse'
+                ]:
+                    ssh_client.cmd_run(
+                        (
+                            "provisioner pillar_set "
+                            f"commons/version/{pkg} '\"latest\"'"
+                        ), targets=run_args.primary.minion_id
+                    )
+                    inline_pillar = (
+                        "{\"inline\": {\"no_encrypt\": True}}"
+                    )
+
+            logger.info(
+                 "Encrypt pillar values and Refresh enclosure id on the system"
+            )
+            for state in [
+                *(
+                    ()
+                    if run_args.source == 'local'
+                    else ('components.system.config.pillar_encrypt', )
+                ),
+                'components.system.storage.enclosure_id',
+                'components.system.config.sync_salt'
+            ]:
+                ssh_client.cmd_run(
+                    f"salt-call state.apply {state}",
+                    targets=ALL_MINIONS
                 )
 
-        logger.info(
-             "Encrypt pillar values and Refresh enclosure id on the system"
-        )
-        for state in [
-            *(
-                ()
-                if run_args.source == 'local'
-                else ('components.system.config.pillar_encrypt', )
-            ),
-            'components.system.storage.enclosure_id',
-            'components.system.config.sync_salt'
-        ]:
+            pillar = f"pillar='{inline_pillar}'" if inline_pillar else ""
             ssh_client.cmd_run(
-                f"salt-call state.apply {state}",
+                (
+                    "salt-call state.apply components.provisioner.config "
+                    f"{pillar}"
+                ),
                 targets=ALL_MINIONS
             )
 
-        pillar = f"pillar='{inline_pillar}'" if inline_pillar else ""
-        ssh_client.cmd_run(
-            (
-                "salt-call state.apply components.provisioner.config "
-                f"{pillar}"
-            ),
-            targets=ALL_MINIONS
-        )
-
-        # TODO EOS-18920 Validation for node role
-        # to execute cluster_id api
+            # TODO EOS-18920 Validation for node role
+            # to execute cluster_id api
 
-        logger.info("Setting unique ClusterID to pillar file "
-                    f"on node: {run_args.primary.minion_id}")
+            logger.info("Setting unique ClusterID to pillar file "
+                        f"on node: {run_args.primary.minion_id}")
 
-        ssh_client.cmd_run(
-            (
-               "provisioner cluster_id"
-            ), targets=run_args.primary.minion_id
-        )
+            ssh_client.cmd_run(
+                (
+                   "provisioner cluster_id"
+                ), targets=run_args.primary.minion_id
+            )
+        finally:
+            ssh_client.close()
 
         logger.info("Done")
@@ -87,7 +87,9 @@ class GetRelease(CommandParserFillerMixin):
     def _get_release_info_path(self):
         release_info = None
         update_repo = PillarKey('release/upgrade')
-        pillar = PillarResolver(local_minion_id()).get([update_repo])
+        pillar = PillarResolver(
+            local_minion_id(), keypaths_only=True
+        ).get([update_repo])
         pillar = next(iter(pillar.values()))
         upgrade_data = pillar[update_repo]
         base_dir = Path(upgrade_data['base_dir'])
@@ -212,21 +212,25 @@ class ReplaceNode(SetupProvisioner):
             **kwargs
         )
 
-        logger.info("Replace Nodes Pre-Routine Validations")
-        self.repl_node_validations(config.GroupChecks.REPLACENODE_CHECKS.value)
-
-        logger.info("Updating replace node data in pillar")
-        setup_ctx.ssh_client.cmd_run(
-            (
-                'provisioner pillar_set --fpath cluster.sls '
-                f'cluster/replace_node/minion_id \"{run_args.node_id}\"'
-            ), targets=run_args.node_id
-        )
+        try:
+            logger.info("Replace Nodes Pre-Routine Validations")
+            self.repl_node_validations(
+                config.GroupChecks.REPLACENODE_CHECKS.value
+            )
 
-        logger.info("Setting up replacement_node flag")
-        setup_ctx.ssh_client.state_apply(
-            'provisioner.post_replacement',
-            targets=run_args.node_id
-        )
+            logger.info("Updating replace node data in pillar")
+            setup_ctx.ssh_client.cmd_run(
+                (
+                    'provisioner pillar_set --fpath cluster.sls '
+                    f'cluster/replace_node/minion_id \"{run_args.node_id}\"'
+                ), targets=run_args.node_id
+            )
 
+            logger.info("Setting up replacement_node flag")
+            setup_ctx.ssh_client.state_apply(
+                'provisioner.post_replacement',
+                targets=run_args.node_id
+            )
+        finally:
+            setup_ctx.ssh_client.close()
         logger.info("Done")
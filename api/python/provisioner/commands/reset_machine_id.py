@@ -19,7 +19,7 @@
 import logging
 from typing import Type
 
-from ..salt import StatesApplier
+from ..salt import StatesApplier, salt_grains_cache
 from .. import (
     inputs
 )
@@ -69,5 +69,8 @@ class ResetMachineId(CommandParserFillerMixin):
             "components.provisioner.config.machine_id.refresh_grains")
 
         logger.info("Resetting machine_id on all nodes.")
-        StatesApplier.apply(machine_id_reset_states)
+        try:
+            StatesApplier.apply(machine_id_reset_states)
+        finally:
+            salt_grains_cache().invalidate()
         logger.info("SUCCESS: machine_id is reset.")
@@ -76,23 +76,26 @@ class SetupCluster(SetupProvisioner):
             nodes=[run_args.srvnode1, run_args.srvnode2], **kwargs
         )
 
-        logger.info("Updating hostnames in cluster pillar")
-        for node in setup_ctx.run_args.nodes:
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner pillar_set '
-                    f'cluster/{node.minion_id}/hostname '
-                    f'\'"{node.grains.fqdn}"\''
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
+        try:
+            logger.info("Updating hostnames in cluster pillar")
+            for node in setup_ctx.run_args.nodes:
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner pillar_set '
+                        f'cluster/{node.minion_id}/hostname '
+                        f'\'"{node.grains.fqdn}"\''
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
 
-        if run_args.config_path:
-            logger.info("Updating pillar data using config.ini")
-            setup_ctx.ssh_client.cmd_run(
-                (
-                    'provisioner configure_setup '
-                    f'{config.PRVSNR_PILLAR_CONFIG_INI} '
-                    f'{len(setup_ctx.run_args.nodes)}'
-                ), targets=setup_ctx.run_args.primary.minion_id
-            )
+            if run_args.config_path:
+                logger.info("Updating pillar data using config.ini")
+                setup_ctx.ssh_client.cmd_run(
+                    (
+                        'provisioner configure_setup '
+                        f'{config.PRVSNR_PILLAR_CONFIG_INI} '
+                        f'{len(setup_ctx.run_args.nodes)}'
+                    ), targets=setup_ctx.run_args.primary.minion_id
+                )
+        finally:
+            setup_ctx.ssh_client.close()
         logger.info("Done")
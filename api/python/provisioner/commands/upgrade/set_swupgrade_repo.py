@@ -25,7 +25,7 @@ from configparser import ConfigParser
 from packaging import version
 
 from provisioner.vendor import attr
-from provisioner.commands import Check
+from provisioner.commands.check import Check
 from provisioner.commands.upgrade import CheckISOAuthenticity
 from provisioner.commands.validator.validator import CompatibilityValidator
 from provisioner.salt import copy_to_file_roots, cmd_run, local_minion_id
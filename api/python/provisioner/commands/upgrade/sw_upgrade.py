@@ -30,9 +30,9 @@ from provisioner.commands import (
     # SWUpdateDecisionMaker,
     # _apply_provisioner_config,
     # _restart_salt_minions,
-    PillarSet,
-    Check
+    PillarSet
 )
+from provisioner.commands.check import Check
 from provisioner.commands.release import (
     GetRelease,
     SetRelease
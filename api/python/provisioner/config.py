@@ -50,6 +50,8 @@ API_SPEC_PATH = CONFIG_MODULE_DIR / 'api_spec.yaml'
 PARAMS_SPEC_PATH = CONFIG_MODULE_DIR / 'params_spec.yaml'
 CLI_SPEC_PATH = CONFIG_MODULE_DIR / 'cli_spec.yaml'
 ATTRS_SPEC_PATH = CONFIG_MODULE_DIR / 'attrs_spec.yaml'
+# compiled (marshal) copies of the specs above
+SPEC_CACHE_DIR = Path.home() / '.cache' / 'seagate' / 'prvsnr' / 'specs'
 
 # TODO
 #  - rename to defaults.py or constants.py or ...
@@ -78,6 +80,13 @@ PRVSNR_USER_LOCAL_SALT_DIR = PRVSNR_DATA_LOCAL_DIR / 'srv'
 PRVSNR_FACTORY_PROFILE_DIR = PRVSNR_DATA_SHARED_DIR / 'factory_profile'
 PRVSNR_LOCKS_FILES_DIR = PRVSNR_DATA_SHARED_DIR / 'locks'
 
+# results of async (nowait) commands
+PRVSNR_JOB_RESULTS_DB = PRVSNR_DATA_LOCAL_DIR / 'jobs' / 'results.sqlite'
+# retention: max age (in seconds) and max number of kept results,
+# None means no limit
+PRVSNR_JOB_RESULTS_MAX_AGE = 7 * 24 * 3600
+PRVSNR_JOB_RESULTS_MAX_NUMBER = 1000
+
 # reflects salt-master file_roots configuration
 PRVSNR_USER_FILEROOT_DIR = PRVSNR_USER_SALT_DIR / 'salt'
 PRVSNR_USER_LOCAL_FILEROOT_DIR = PRVSNR_USER_LOCAL_SALT_DIR / 'salt'
@@ -126,6 +135,27 @@ SALT_MASTER_CONFIG_DEFAULT = '/etc/salt/master'
 SALT_MINION_CONFIG_DEFAULT = '/etc/salt/minion'
 SALT_ROSTER_DEFAULT = '/etc/salt/roster'
 
+# salt clients pooling: how many idle clients to keep
+# and how long (in seconds) an idle client is considered warm
+SALT_CLIENT_POOL_MAX_IDLE = 8
+SALT_CLIENT_POOL_IDLE_TTL = 300
+# how long (in seconds) minions grains are cached
+SALT_GRAINS_CACHE_TTL = 300
+# how long (in seconds) to wait for minions to (re)connect
+SALT_MINIONS_READY_TIMEOUT = 600
+# how long (in seconds) rendered pillar is cached
+PILLAR_CACHE_TTL = 60
+# compiled pillar of the local minion
+PILLAR_SNAPSHOT_PATH = PRVSNR_DATA_LOCAL_DIR / 'pillar' / 'snapshot.json'
+# local minion files its grains (and so pillar targeting) depend on
+SALT_MINION_GRAINS_SOURCES = (
+    Path(SALT_MINION_CONFIG_DEFAULT),
+    Path('/etc/salt/minion.d'),
+    Path('/etc/salt/minion_id'),
+    Path('/etc/salt/grains'),
+    Path('/var/cache/salt/minion/extmods/grains'),
+)
+
 # TODO EOS-12076 EOS-12334
 
 CORTX_SINGLE_ISO_DIR = 'cortx_single_iso'
@@ -222,6 +252,10 @@ SEAGATE_USER_FILEROOT_DIR_TMPL = str(
 
 SSH_PRIV_KEY = Path('/root/.ssh/id_rsa_prvsnr')
 SSH_PUB_KEY = Path('/root/.ssh/id_rsa_prvsnr.pub')
+# how long (in seconds) idle multiplexed ssh connections are kept
+SSH_CONTROL_PERSIST = 600
+# max number of nodes to prepare in parallel during setup
+SETUP_MAX_PARALLEL_NODES = 8
 
 ALL_MINIONS = '*'
 ALL_TARGETS = ALL_MINIONS  # XXX rethink later
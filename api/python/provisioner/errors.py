@@ -19,7 +19,7 @@ import subprocess
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Union, Any
+from typing import Dict, Union, Any, Optional
 
 
 logger = logging.getLogger(__name__)
@@ -127,7 +127,13 @@ class SaltCmdRunError(SaltCmdError):
 
 
 class SaltCmdResultError(SaltCmdError):
-    pass
+    # results - partial results of the succeeded targets
+    def __init__(
+        self, cmd_args: Any, reason: str = 'unknown',
+        results: Optional[Dict] = None
+    ):
+        super().__init__(cmd_args, reason)
+        self.results = {} if results is None else results
 
 
 # TODO TEST
@@ -135,6 +141,10 @@ class SaltNoReturnError(SaltCmdRunError):
     pass
 
 
+class SaltTargetsResolveError(SaltError, ValueError):
+    pass
+
+
 class PrvsnrTypeDecodeError(ProvisionerError, ValueError):
     _prvsnr_type_ = True
 
@@ -29,7 +29,7 @@ from . import config, utils
 from .vendor import attr
 from .errors import UnknownParamError, SWUpdateRepoSourceError
 from .pillar import (
-    KeyPath, PillarKeyAPI, PillarKey, PillarItemsAPI
+    KeyPath, KeyPathIndex, PillarKeyAPI, PillarKey, PillarItemsAPI
 )
 from .param import Param, ParamDictItem
 from .api_spec import param_spec
@@ -47,46 +47,43 @@ logger = logging.getLogger(__name__)
 
 
 def load_cli_spec():
-    res = utils.load_yaml(config.CLI_SPEC_PATH)
+    res = utils.load_yaml_cached(config.CLI_SPEC_PATH)
+    spec_index = KeyPathIndex(res)
 
-    def _choices_filter(leaf: utils.DictLeaf):
-        return (
-            leaf.key == 'choices'
-            and isinstance(leaf.value, str)
-            and leaf.value.startswith(config.CLI_SPEC_PY_OBJS_PREFIX)
-        )
-
-    # convert choices to objects
-    for leaf in utils.iterate_dict(res, filter_f=_choices_filter):
-        choices_spec = leaf.value.split(
-            config.CLI_SPEC_PY_OBJS_PREFIX
-        )[1].split('.')
-
-        mod_name = '.'.join(choices_spec[0:-1])
-        attr_name = choices_spec[-1]
-        module = importlib.import_module(mod_name)
-
-        choices = getattr(module, attr_name)
-
-        try:
-            if issubclass(choices, Enum):
-                choices = [i.value for i in choices]
-        except TypeError:
-            pass  # not a class
+    for keys, value in spec_index.items():
+        key = keys[-1]
+        # convert choices to objects
+        if (
+            key == 'choices'
+            and isinstance(value, str)
+            and value.startswith(config.CLI_SPEC_PY_OBJS_PREFIX)
+        ):
+            choices_spec = value.split(
+                config.CLI_SPEC_PY_OBJS_PREFIX
+            )[1].split('.')
 
-        leaf.parent[leaf.key] = choices
+            mod_name = '.'.join(choices_spec[0:-1])
+            attr_name = choices_spec[-1]
+            module = importlib.import_module(mod_name)
 
-    def _nohelp_filter(leaf: utils.DictLeaf):
-        return (
-            leaf.key != 'help'
-            and ('help' not in leaf.parent)
-            and isinstance(leaf.value, str)
-        )
+            choices = getattr(module, attr_name)
 
-    # convert trivial descriptions (no help)
-    for leaf in utils.iterate_dict(res, filter_f=_nohelp_filter):
-        leaf.parent[leaf.key] = dict(help=leaf.value)
+            try:
+                if issubclass(choices, Enum):
+                    choices = [i.value for i in choices]
+            except TypeError:
+                pass  # not a class
+
+            spec_index.set(keys, choices)
+        # convert trivial descriptions (no help)
+        elif (
+            key != 'help'
+            and ('help' not in spec_index.parent(keys))
+            and isinstance(value, str)
+        ):
+            spec_index.set(keys, dict(help=value))
 
+    spec_index.commit()
     return res
 
 
@@ -473,6 +470,50 @@ class PillarInputBase(PillarItemsAPI):
         return ParserFiller.extract_positional_args(cls, kwargs)
 
 
+@attr.s(auto_attribs=True, frozen=True)
+class PillarItemsInputBase(PillarItemsAPI):
+    items: Dict = attr.ib(
+        metadata={
+            METADATA_ARGPARSER: {
+                'help': 'pillar key paths to values mapping',
+                'type': functools.partial(
+                    AttrParserArgs.value_from_str, v_type='json'
+                )
+            }
+        },
+        validator=attr.validators.instance_of(dict)
+    )
+    fpath: str = attr.ib(
+        default=None,
+        metadata={
+            METADATA_ARGPARSER: {
+                'help': (
+                    'file path relative to pillar roots, '
+                    'if not specified <key-path-top-level-part>.sls is used'
+                ),
+            }
+        }
+    )
+
+    def pillar_items(self) -> Iterable[Tuple[PillarKeyAPI, Any]]:
+        return tuple(
+            (PillarKey(keypath, self.fpath), value)
+            for keypath, value in self.items.items()
+        )
+
+    @classmethod
+    def from_args(cls, *args, **kwargs):
+        return cls(*args, **kwargs)
+
+    @classmethod
+    def fill_parser(cls, parser):
+        ParserFiller.fill_parser(cls, parser, AttrParserArgs)
+
+    @classmethod
+    def extract_positional_args(cls, kwargs):
+        return ParserFiller.extract_positional_args(cls, kwargs)
+
+
 @attr.s(auto_attribs=True)
 class ParamsList:
     params: List[Param]
@@ -0,0 +1,278 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .vendor import attr
+from .config import (
+    PRVSNR_JOB_RESULTS_DB,
+    PRVSNR_JOB_RESULTS_MAX_AGE,
+    PRVSNR_JOB_RESULTS_MAX_NUMBER
+)
+from .salt import (
+    RUNNER_JOB_FUN_PREFIX,
+    SaltJobsRunner,
+    salt_job_tracker,
+    process_provisioner_cmd_res,
+    process_runner_cmd_res
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _process_res(cmd: str, res: Dict):
+    # runner jobs are recorded by their full function name
+    if cmd.startswith(RUNNER_JOB_FUN_PREFIX):
+        return process_runner_cmd_res(res)
+    return process_provisioner_cmd_res(res)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    jid TEXT PRIMARY KEY,
+    cmd TEXT,
+    status TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS results_cmd ON results (cmd);
+CREATE INDEX IF NOT EXISTS results_start_time ON results (start_time);
+CREATE INDEX IF NOT EXISTS results_status ON results (status);
+"""
+
+
+class JobResultStatus(Enum):
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+
+def _jid_start_time(jid: str) -> float:
+    # salt jids are timestamps in a form of YYYYMMDDhhmmssffffff
+    try:
+        return datetime.strptime(str(jid)[:20], '%Y%m%d%H%M%S%f').timestamp()
+    except ValueError:
+        return time.time()
+
+
+@attr.s(auto_attribs=True)
+class JobResultsStore:
+    """Local index of provisioner jobs launched in nowait mode.
+
+    Keeps raw minion outputs of finished jobs so that the results
+    can be (re)read without querying the salt master.
+    """
+    path: Path = PRVSNR_JOB_RESULTS_DB
+    max_age: Optional[float] = PRVSNR_JOB_RESULTS_MAX_AGE
+    max_number: Optional[int] = PRVSNR_JOB_RESULTS_MAX_NUMBER
+
+    @contextmanager
+    def _db(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _record(row: sqlite3.Row, with_result=False) -> Dict:
+        res = dict(row)
+        if with_result:
+            if res['result'] is not None:
+                res['result'] = json.loads(res['result'])
+        else:
+            res.pop('result')
+        return res
+
+    def add(self, jid: str, cmd: str, start_time: Optional[float] = None):
+        if start_time is None:
+            start_time = time.time()
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO results (jid, cmd, status, start_time)"
+                " VALUES (?, ?, ?, ?)",
+                (jid, cmd, JobResultStatus.RUNNING.value, start_time)
+            )
+            self._gc(conn)
+
+    def update(
+        self, jid: str, cmd: str, status: JobResultStatus, result: Dict
+    ):
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO results (jid, cmd, status, start_time)"
+                " VALUES (?, ?, ?, ?)",
+                (jid, cmd, status.value, _jid_start_time(jid))
+            )
+            conn.execute(
+                "UPDATE results SET status = ?, end_time = ?, result = ?"
+                " WHERE jid = ?",
+                (status.value, time.time(), json.dumps(result), jid)
+            )
+
+    def get(self, jid: str) -> Optional[Dict]:
+        with self._db() as conn:
+            row = conn.execute(
+                "SELECT * FROM results WHERE jid = ?", (jid,)
+            ).fetchone()
+        return None if row is None else self._record(row, with_result=True)
+
+    def list(
+        self,
+        cmd: Optional[str] = None,
+        status: Optional[JobResultStatus] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        conds, params = [], []
+        if cmd is not None:
+            conds.append('cmd = ?')
+            params.append(cmd)
+        if status is not None:
+            conds.append('status = ?')
+            params.append(JobResultStatus(status).value)
+        if since is not None:
+            conds.append('start_time >= ?')
+            params.append(since)
+
+        query = "SELECT * FROM results"
+        if conds:
+            query += " WHERE " + " AND ".join(conds)
+        query += " ORDER BY start_time DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._db() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def _gc(self, conn) -> int:
+        removed = 0
+        if self.max_age is not None:
+            removed += conn.execute(
+                "DELETE FROM results WHERE start_time < ?",
+                (time.time() - self.max_age,)
+            ).rowcount
+        if self.max_number is not None:
+            removed += conn.execute(
+                "DELETE FROM results WHERE jid NOT IN ("
+                "SELECT jid FROM results ORDER BY start_time DESC LIMIT ?)",
+                (self.max_number,)
+            ).rowcount
+        return removed
+
+    def gc(self) -> int:
+        with self._db() as conn:
+            return self._gc(conn)
+
+
+_job_results_store = None
+
+
+def job_results_store() -> JobResultsStore:
+    global _job_results_store
+    if _job_results_store is None:
+        _job_results_store = JobResultsStore()
+    return _job_results_store
+
+
+def record_job(jid: str, cmd: str):
+    try:
+        job_results_store().add(jid, cmd)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Failed to record job '{jid}' ({cmd}): {exc}")
+
+
+def _fetch_result(jid: str, store: Optional[JobResultsStore] = None):
+    job = SaltJobsRunner.prvsnr_job(jid)
+    raw = SaltJobsRunner.prvsnr_job_raw_result(job)
+    cmd = (
+        job.function if SaltJobsRunner.is_runner_job(job)
+        else job.function.split('.', 1)[-1]
+    )
+
+    exc = None
+    try:
+        res = _process_res(cmd, raw)
+        status = JobResultStatus.FINISHED
+    # command's own error, might be of any type
+    except Exception as _exc:
+        exc = _exc
+        status = JobResultStatus.FAILED
+
+    if store is not None:
+        try:
+            store.update(jid, cmd, status, raw)
+        except (sqlite3.Error, OSError) as _exc:
+            logger.warning(f"Failed to store result of job '{jid}': {_exc}")
+
+    if exc is not None:
+        raise exc
+    return res
+
+
+def get_result(jid: str):
+    store = job_results_store()
+    try:
+        record = store.get(jid)
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning(f"Job results store is not available: {exc}")
+        store = record = None
+
+    if (
+        record is None
+        or record['status'] == JobResultStatus.RUNNING.value
+    ):
+        return _fetch_result(jid, store)
+
+    return _process_res(record['cmd'], record['result'])
+
+
+def list_results(
+    cmd: Optional[str] = None,
+    status: Optional[JobResultStatus] = None,
+    since: Optional[float] = None,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    store = job_results_store()
+
+    # refresh not yet finished jobs, only if that is cheap
+    # (the local job cache is readable)
+    if salt_job_tracker().available:
+        for record in store.list(status=JobResultStatus.RUNNING):
+            try:
+                _fetch_result(record['jid'], store)
+            except Exception:
+                # either not yet finished / not found or failed,
+                # the latter is already recorded
+                pass
+
+    return store.list(cmd=cmd, status=status, since=since, limit=limit)
@@ -15,20 +15,32 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import json
 import logging
+import os
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Tuple, Iterable, Union, Optional
+from typing import (
+    Any, List, Dict, Tuple, Iterable, Iterator, Union, Optional, Set
+)
 from copy import deepcopy
 from pathlib import Path
 
 from . import values
-from .errors import BadPillarDataError
+from .errors import BadPillarDataError, SaltCmdResultError
 from .vendor import attr
 from . import utils
-from .salt import pillar_get, pillar_refresh
+from .salt import (
+    pillar_get, pillar_get_keypaths, pillar_refresh, resolve_targets
+)
 from .config import (
     ALL_MINIONS,
-    PRVSNR_PILLAR_DIR
+    PILLAR_CACHE_TTL,
+    PILLAR_SNAPSHOT_PATH,
+    PRVSNR_PILLAR_DIR,
+    SALT_MINION_GRAINS_SOURCES
 )
 from .paths import (
     PillarPath,
@@ -52,6 +64,12 @@ class KeyPath:
         converter=(lambda v: None if v is None else Path(str(v))),
         validator=attr.validators.instance_of(Path)
     )
+    _parts: Tuple[str, ...] = attr.ib(
+        init=False, default=None, eq=False, repr=False
+    )
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, '_parts', self._path.parts)
 
     def __str__(self):
         return str(self._path)
@@ -59,9 +77,13 @@ class KeyPath:
     def __truediv__(self, key):
         return KeyPath(self._path / key)
 
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        return self._parts
+
     def parent_dict(self, key_dict: Dict, fix_missing=True):
         res = key_dict
-        for key in self._path.parts[:-1]:  # TODO optimize
+        for key in self._parts[:-1]:
             # ensure key exists
             if key not in res:
                 if fix_missing:
@@ -81,6 +103,134 @@ class KeyPath:
         return self.parent_dict(key_dict, fix_missing=False)[self.leaf]
 
 
+@attr.s(auto_attribs=True)
+class KeyPathIndex:
+    """Index of a nested dict (e.g. pillar data) by keypaths.
+
+    Nested dicts are indexed by tuples of keys on first access,
+    so repeated lookups and updates cost a hash of a keys tuple
+    rather than a walk from the top. Updates are journaled
+    (old values are kept by reference) and might be rolled back.
+
+    Note. the data is expected to be changed only through the index.
+    """
+    data: Dict = attr.Factory(dict)
+
+    # keys -> nested dict
+    _nodes: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    # (keys, existed, old value)
+    _journal: List = attr.ib(init=False, default=attr.Factory(list))
+
+    def __attrs_post_init__(self):
+        self._nodes[()] = self.data
+
+    @staticmethod
+    def keys(keypath) -> Tuple:
+        if isinstance(keypath, tuple):
+            return keypath
+        if not isinstance(keypath, KeyPath):
+            keypath = KeyPath(keypath)
+        return keypath.parts
+
+    def node(self, keys: Tuple, create: bool = False) -> Optional[Dict]:
+        """Returns a nested dict by keys, None if missed.
+
+        :param create: (optional) create missed dicts
+        """
+        res = self._nodes.get(keys)
+        if res is not None:
+            return res
+
+        # start from the longest indexed prefix
+        depth = len(keys) - 1
+        while keys[:depth] not in self._nodes:
+            depth -= 1
+        res = self._nodes[keys[:depth]]
+
+        for depth in range(depth + 1, len(keys) + 1):
+            key = keys[depth - 1]
+            if key not in res and create:
+                res[key] = {}
+            res = res.get(key)
+            if not isinstance(res, dict):
+                if create:
+                    raise TypeError(
+                        f"not a dict value for {'/'.join(keys[:depth])}"
+                    )
+                return None
+            self._nodes[keys[:depth]] = res
+        return res
+
+    def get(self, keypath, default=MISSED) -> Any:
+        keys = self.keys(keypath)
+        parent = self.node(keys[:-1])
+        if parent is None or keys[-1] not in parent:
+            return default
+        return parent[keys[-1]]
+
+    def _forget(self, keys: Tuple):
+        size = len(keys)
+        for _keys in [k for k in self._nodes if k[:size] == keys]:
+            del self._nodes[_keys]
+
+    def set(self, keypath, value: Any) -> None:
+        keys = self.keys(keypath)
+        parent = self.node(keys[:-1], create=True)
+        leaf = keys[-1]
+
+        existed = leaf in parent
+        old_value = parent.get(leaf)
+        self._journal.append((keys, existed, old_value))
+
+        parent[leaf] = value
+        if isinstance(old_value, dict):
+            self._forget(keys)
+
+    def rollback(self) -> None:
+        for keys, existed, old_value in reversed(self._journal):
+            parent = self.node(keys[:-1])
+            if existed:
+                parent[keys[-1]] = old_value
+            else:
+                parent.pop(keys[-1], None)
+            self._forget(keys)
+        self._journal.clear()
+
+    def commit(self) -> None:
+        self._journal.clear()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self._journal)
+
+    def items(self, prefix=None) -> Iterator[Tuple[Tuple, Any]]:
+        """Iterates over (keys, value) leaves under the prefix.
+
+        Empty dicts are considered as leaves.
+        """
+        keys = () if prefix is None else self.keys(prefix)
+        node = self.node(keys)
+        if node is None:
+            value = self.get(keys) if keys else MISSED
+            if value is not MISSED:
+                yield keys, value
+            return
+        yield from self._items(keys, node)
+
+    def _items(self, keys: Tuple, node: Dict):
+        # list: considering changes in the data during the iteration
+        for key, value in list(node.items()):
+            _keys = keys + (key,)
+            if isinstance(value, dict) and value:
+                self._nodes[_keys] = value
+                yield from self._items(_keys, value)
+            else:
+                yield _keys, value
+
+    def parent(self, keys: Tuple) -> Optional[Dict]:
+        return self.node(keys[:-1])
+
+
 class PillarKeyAPI(ABC):
     @property
     def keypath(self):
@@ -171,8 +321,10 @@ class PillarIterable(PillarItemsAPI):
         if self.expand:
             # expand the tree into separated items
             self._pillars = {
-                PillarKey(leaf.keypath, fpath=self.fpath): leaf.value
-                for leaf in utils.iterate_dict(self._pillars)
+                PillarKey(
+                    '/'.join(str(key) for key in keys), fpath=self.fpath
+                ): value
+                for keys, value in KeyPathIndex(self._pillars).items()
             }
 
     def pillar_items(self) -> Iterable[Tuple[PillarKeyAPI, Any]]:
@@ -222,33 +374,297 @@ class PillarEntry:
             del parent_dict[self.key_path.leaf]
 
 
+@attr.s(auto_attribs=True)
+class PillarCache:
+    """Process wide cache of rendered pillar keyed by (targets, local).
+
+    Besides the full pillar it keeps values of separate keypaths
+    (see :class:`PillarResolver` keypaths only mode).
+
+    The cache is dropped once the pillar is updated
+    (:meth:`PillarUpdater.apply`) and entries expire after ``ttl``
+    seconds. The pillar roots are not scanned on lookups since the scan
+    costs about as much as the rendering, so changes made bypassing
+    :class:`PillarUpdater` are noticed once the entries expire. Without
+    ``ttl`` the cache is dropped once any file under the pillar roots
+    is changed (tracked by mtime, checked on each lookup).
+    Cached data is returned as a copy so callers are free to modify it.
+    """
+    ttl: Optional[float] = PILLAR_CACHE_TTL
+
+    hits: int = attr.ib(init=False, default=0)
+    misses: int = attr.ib(init=False, default=0)
+
+    # (targets, local, keypath) -> (data, stored_at)
+    _entries: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    _roots_mtime: Optional[float] = attr.ib(init=False, default=None)
+    _lock: Any = attr.ib(init=False, default=attr.Factory(threading.Lock))
+
+    @staticmethod
+    def roots() -> List[Path]:
+        return [
+            PRVSNR_PILLAR_DIR,
+            USER_SHARED_PILLAR.root,
+            USER_LOCAL_PILLAR.root
+        ]
+
+    @classmethod
+    def _mtime(cls, path, _mtime=0) -> float:
+        try:
+            if not os.path.isdir(path):
+                return max(_mtime, os.stat(path).st_mtime)
+
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        _mtime = cls._mtime(entry.path, _mtime)
+                    else:
+                        _mtime = max(_mtime, entry.stat().st_mtime)
+            return max(_mtime, os.stat(path).st_mtime)
+        except OSError:
+            return _mtime
+
+    def roots_mtime(self) -> float:
+        """The latest modification time among the pillar roots files."""
+        res = 0
+        for path in self.roots():
+            res = self._mtime(str(path), res)
+        return res
+
+    @staticmethod
+    def _key(targets, local, keypath=None):
+        if isinstance(targets, (list, tuple)):
+            targets = tuple(sorted(targets))
+        return (targets, bool(local), keypath)
+
+    def _check_roots(self):
+        mtime = self.roots_mtime()
+        if mtime != self._roots_mtime:
+            self._entries.clear()
+            self._roots_mtime = mtime
+
+    def get(self, targets, local=False, keypath=None) -> Optional[Dict]:
+        """Returns a copy of cached data or None if missed."""
+        with self._lock:
+            if self.ttl is None:
+                self._check_roots()
+            entry = self._entries.get(self._key(targets, local, keypath))
+            if entry is not None and (
+                self.ttl is None or (time.monotonic() - entry[1]) < self.ttl
+            ):
+                self.hits += 1
+                return deepcopy(entry[0])
+            self.misses += 1
+            return None
+
+    def set(self, targets, local, data: Dict, keypath=None) -> None:
+        with self._lock:
+            self._entries[self._key(targets, local, keypath)] = (
+                deepcopy(data), time.monotonic()
+            )
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+    def stats(self) -> Dict:
+        return dict(
+            hits=self.hits, misses=self.misses, hit_rate=self.hit_rate,
+            entries=len(self._entries)
+        )
+
+
+_pillar_cache = PillarCache()
+
+
+def pillar_cache() -> PillarCache:
+    return _pillar_cache
+
+
+@attr.s(auto_attribs=True)
+class PillarSnapshot:
+    """Compiled pillar of the local minion kept on disk.
+
+    Serves local mode pillar reads without a salt caller. The snapshot
+    is considered stale (and is re-rendered by the next read) once
+    any file under the pillar roots or any of the minion grains sources
+    is changed (pillar top targets minions by grains).
+    """
+    path: Path = attr.ib(
+        default=PILLAR_SNAPSHOT_PATH, converter=utils.converter_path
+    )
+
+    @staticmethod
+    def sources() -> List[Path]:
+        return PillarCache.roots() + list(SALT_MINION_GRAINS_SOURCES)
+
+    def sources_mtime(self) -> float:
+        res = 0
+        for path in self.sources():
+            res = PillarCache._mtime(str(path), res)
+        return res
+
+    def load(self, sources_mtime: float) -> Optional[Dict]:
+        """Returns the pillar per minion or None if missed or stale."""
+        try:
+            data = utils.load_json(self.path)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('sources_mtime') != sources_mtime:
+            logger.debug(f"Pillar snapshot '{self.path}' is stale")
+            return None
+        return {data['minion_id']: data['pillar']}
+
+    def save(self, pillar: Dict, sources_mtime: float) -> None:
+        try:
+            (minion_id, _pillar), = pillar.items()
+            text = json.dumps(dict(
+                minion_id=minion_id,
+                sources_mtime=sources_mtime,
+                pillar=_pillar
+            ))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # pillar might include sensitive data
+            utils.write_text_atomic(self.path, text, mode=0o600)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning(f"Failed to save pillar snapshot: {exc}")
+
+
+_pillar_snapshot = PillarSnapshot()
+
+
+def pillar_snapshot() -> PillarSnapshot:
+    return _pillar_snapshot
+
+
 @attr.s(auto_attribs=True)
 class PillarResolver:
     targets: str = ALL_MINIONS
     local: bool = False
+    # fetch only the requested keys subtrees rather than the whole pillar
+    keypaths_only: bool = False
     _pillar: Dict = None
+    _keypaths: Set[str] = attr.Factory(set)
+    _keypaths_pillar: Dict = attr.Factory(dict)
+    # minion id -> pillar data index
+    _indexes: Dict = attr.Factory(dict)
 
     @property
     def pillar(self):
         if self._pillar is None:
-            self._pillar = pillar_get(
-                targets=self.targets, local=self.local
-            )
+            cache = pillar_cache()
+            self._pillar = cache.get(self.targets, self.local)
+            if self._pillar is None:
+                if self.local:
+                    self._pillar = self._local_pillar()
+                else:
+                    self._pillar = pillar_get(targets=self.targets)
+                cache.set(self.targets, self.local, self._pillar)
         return self._pillar
 
+    def _local_pillar(self) -> Dict:
+        snapshot = pillar_snapshot()
+        # taken before the rendering to not miss changes made meanwhile
+        sources_mtime = snapshot.sources_mtime()
+
+        res = snapshot.load(sources_mtime)
+        if res is None:
+            res = pillar_get(targets=self.targets, local=True)
+            snapshot.save(res, sources_mtime)
+        return res
+
+    def _fetch_keypaths(self, keypaths: Set[str]) -> Optional[Dict]:
+        """Per keypath minions values, None if they can't be fetched.
+
+        Cached keypaths are served by the pillar cache, missed ones
+        are fetched in one call for all the targets.
+        """
+        cache = pillar_cache()
+        # keypath -> {minion_id: value}
+        fetched = {}
+        for keypath in keypaths:
+            cached = cache.get(self.targets, self.local, keypath)
+            if cached is not None:
+                fetched[keypath] = cached
+
+        missed = keypaths - set(fetched)
+        if missed:
+            try:
+                res = pillar_get_keypaths(
+                    sorted(missed), targets=self.targets, local=self.local
+                )
+            except SaltCmdResultError as exc:
+                logger.warning(
+                    "Failed to get pillar keypaths, "
+                    f"full pillar is used instead: {exc}"
+                )
+                return None
+
+            for keypath in missed:
+                fetched[keypath] = {
+                    minion_id: minion_values.get(keypath, MISSED)
+                    for minion_id, minion_values in res.items()
+                }
+                cache.set(
+                    self.targets, self.local, fetched[keypath], keypath
+                )
+
+        return fetched
+
+    def _pillar_for(self, pi_keys: Iterable[PillarKeyAPI]) -> Dict:
+        """Per minion pillar data that includes the keys.
+
+        In keypaths only mode the trees include only the keys subtrees.
+        The full pillar is used if the custom execution module
+        is not available on the minions.
+        """
+        # Note. local pillar is served by the snapshot
+        if not self.keypaths_only or self.local or self._pillar is not None:
+            return self.pillar
+
+        keypaths = set(str(pk.keypath) for pk in pi_keys) - self._keypaths
+        fetched = self._fetch_keypaths(keypaths)
+        if fetched is None:
+            return self.pillar
+
+        for keypath, minions_values in sorted(fetched.items()):
+            keypath = KeyPath(keypath)
+            for minion_id, value in minions_values.items():
+                pillar = self._keypaths_pillar.setdefault(minion_id, {})
+                if value is not MISSED:
+                    keypath.parent_dict(pillar)[keypath.leaf] = value
+        self._keypaths.update(keypaths)
+        # subtrees might be replaced
+        self._indexes.clear()
+
+        return self._keypaths_pillar
+
+    def _index(self, minion_id: str, pillar: Dict) -> KeyPathIndex:
+        p_index = self._indexes.get(minion_id)
+        if p_index is None or p_index.data is not pillar:
+            p_index = self._indexes[minion_id] = KeyPathIndex(pillar)
+        return p_index
+
     # TODO return value
     def get(
         self,
         pi_keys: Iterable[PillarKeyAPI],
         fail_on_undefined: bool = False
     ):
+        pi_keys = list(pi_keys)
+
         # TODO provide results per target
         # - for now just use the first target's pillar value
         res = {}
-        for minion_id, pillar in self.pillar.items():
-            res[minion_id] = {
-                pk: PillarEntry(pk.keypath, pillar).get() for pk in pi_keys
-            }
+        for minion_id, pillar in self._pillar_for(pi_keys).items():
+            p_index = self._index(minion_id, pillar)
+            res[minion_id] = {pk: p_index.get(pk.keypath) for pk in pi_keys}
 
         if fail_on_undefined:
             for node_id, pillar in res.items():
@@ -273,9 +689,7 @@ class PillarResolverNew(PillarResolver):
     def pillar(self):
         if self._pillar is None:
             if self.client is None:
-                self._pillar = pillar_get(
-                    targets=self.targets, local=self.local
-                )
+                return super().pillar
             else:
                 # TODO IMPROVE optional targetting should
                 #      be taken care only inside client parameters
@@ -284,11 +698,8 @@ class PillarResolverNew(PillarResolver):
         return self._pillar
 
 
-# TODO verify that targets are resoloved to real minions
-# TODO for now targeting supports either ALL or one single,
-#      need to support any syntax that salt supports, option:
-#      - convert any targets string to list of minions using
-#        call to the salt
+# Note. targets other than ALL are resolved to minions
+#       (see salt.resolve_targets) and updated per minion
 @attr.s(auto_attribs=True)
 class PillarUpdater:
     targets: str = ALL_MINIONS
@@ -296,13 +707,38 @@ class PillarUpdater:
 
     _pillar_path: PillarPath = attr.ib(init=False, default=None)
     _pillars: Dict = attr.Factory(dict)
-    _p_entries: List[PillarEntry] = attr.Factory(list)
+    # (index, keypath) of the updated entries
+    _p_entries: List[Tuple[KeyPathIndex, KeyPath]] = attr.Factory(list)
+    _minions: Optional[List[str]] = attr.ib(init=False, default=None)
+    # path -> pillar data as it is on disk (None if file is missed)
+    _dumped: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    # path -> minion id (None for all hosts pillar)
+    _paths_minions: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    # path -> pillar data index
+    _indexes: Dict = attr.ib(init=False, default=attr.Factory(dict))
 
     def __attrs_post_init__(self):
         self._pillar_path = (
             USER_LOCAL_PILLAR if self.local else USER_SHARED_PILLAR
         )
 
+    @property
+    def minions(self) -> List[str]:
+        """Minions the targets (other than all minions) are matched to."""
+        if self._minions is None:
+            if isinstance(self.targets, str) and re.fullmatch(
+                r'[\w.-]+', self.targets
+            ):
+                # a plain minion id
+                minions = [self.targets]
+            else:
+                minions = resolve_targets(self.targets, tgt_type='compound')
+
+            if not minions:
+                raise ValueError(f'no minions matched by {self.targets}')
+            self._minions = minions
+        return self._minions
+
     @staticmethod
     def ensure_exists(path: Path):
         if not path.exists():
@@ -381,21 +817,55 @@ class PillarUpdater:
     #             all is group vars) ??? TODO
     #       2-3. minion-UNDEFINED: make value undefined for a minion
     #       2-5. minion-value: set value for a minion
-    def pillar(self, path: Path):
+    def pillar_file(self, path: Path, minion_id: Optional[str] = None):
         if self.targets == ALL_MINIONS:
             _path = self._pillar_path.all_hosts_dir / path
         else:
             _path = Path(
-                self._pillar_path.host_dir_tmpl.format(minion_id=self.targets)
+                self._pillar_path.host_dir_tmpl.format(
+                    minion_id=(minion_id or self.targets)
+                )
             ) / path
 
-        _path = self.add_merge_prefix(_path, local=self.local)
+        return self.add_merge_prefix(_path, local=self.local)
 
-        if _path not in self._pillars:
-            self._pillars[_path] = (
-                utils.load_yaml(_path) if _path.exists() else {}
-            )
-        return self._pillars[_path]
+    def pillar(self, path: Path, minion_id: Optional[str] = None):
+        return self._load(
+            self.pillar_file(path, minion_id),
+            None if self.targets == ALL_MINIONS
+            else (minion_id or self.targets)
+        )
+
+    def _load(self, path: Path, minion_id: Optional[str] = None) -> Dict:
+        if path not in self._pillars:
+            if path.exists():
+                self._pillars[path] = utils.load_yaml(path)
+                self._dumped[path] = deepcopy(self._pillars[path])
+            else:
+                self._pillars[path] = {}
+                self._dumped[path] = None
+            self._paths_minions[path] = minion_id
+            self._indexes[path] = KeyPathIndex(self._pillars[path])
+        return self._pillars[path]
+
+    def _pillars_minions(self) -> List[Optional[str]]:
+        if self.targets == ALL_MINIONS:
+            return [None]
+        # per minion pillars for any other targets
+        return self.minions
+
+    def pillars(self, path: Path) -> List[Dict]:
+        return [
+            self.pillar(path, minion_id)
+            for minion_id in self._pillars_minions()
+        ]
+
+    def indexes(self, path: Path) -> List[KeyPathIndex]:
+        res = []
+        for minion_id in self._pillars_minions():
+            self.pillar(path, minion_id)
+            res.append(self._indexes[self.pillar_file(path, minion_id)])
+        return res
 
     # TODO IMPROVE add option to verify updated pillar
     #      (resolve actual pillar data after update)
@@ -406,9 +876,7 @@ class PillarUpdater:
 
         for pi_group in pi_groups:
             for pi_key, value in pi_group.pillar_items():
-                p_entry = PillarEntry(
-                    pi_key.keypath, self.pillar(pi_key.fpath)
-                )
+                key_path = KeyPath(pi_key.keypath)
 
                 if value is not UNCHANGED:
                     if value is MISSED:
@@ -416,12 +884,12 @@ class PillarUpdater:
                               "Total removal of a pillar "
                               "entry is not allowed, "
                               "key_path: {}"
-                              .format(p_entry.key_path)
+                              .format(key_path)
                         )
                         raise ValueError(
                             "Total removal of a pillar entry is not allowed, "
                             "key_path: {}"
-                            .format(p_entry.key_path)
+                            .format(key_path)
                         )
 
                     if value is UNDEFINED:
@@ -433,42 +901,75 @@ class PillarUpdater:
                         logger.error(
                               "Reset to factory default "
                               "is not yet supported, key_path: {}"
-                              .format(p_entry.key_path)
+                              .format(key_path)
                         )
                         raise NotImplementedError(
                             "Reset to factory default is not yet supported, "
                             "key_path: {}"
-                            .format(p_entry.key_path)
+                            .format(key_path)
                         )
 
-                    p_entry.set(value)
-
-                # register an entry in any valid case to mark update started
-                self._p_entries.append(p_entry)
+                for p_index in self.indexes(pi_key.fpath):
+                    if value is not UNCHANGED:
+                        p_index.set(key_path, value)
+                    # register an entry in any valid case
+                    # to mark update started
+                    self._p_entries.append((p_index, key_path))
 
     def rollback(self) -> None:
-        # TODO might be safe without list()
-        for p_entry in list(self._p_entries[::-1]):
-            p_entry.rollback()
-            self._p_entries.pop()
-
-    def dump(self) -> None:
+        # each index journals its updates and is rolled back once
+        p_indexes = {id(p_index): p_index for p_index, _ in self._p_entries}
+        for p_index in p_indexes.values():
+            p_index.rollback()
+        self._p_entries.clear()
+
+    def is_dirty(self, path: Path) -> bool:
+        dumped = self._dumped.get(path)
+        if dumped is None:
+            # an empty pillar for a missed file is not worth to write
+            return bool(self._pillars[path])
+        return self._pillars[path] != dumped
+
+    def dump(self) -> List[Path]:
+        """Writes changed pillar files, returns the paths written."""
+        res = []
         for path, pillar in self._pillars.items():
-            self.ensure_exists(path)
-            utils.dump_yaml(path, pillar)
+            if not self.is_dirty(path):
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            utils.write_text_atomic(path, utils.dump_yaml_str(pillar))
+            self._dumped[path] = deepcopy(pillar)
+            res.append(path)
+        return res
+
+    def refresh_targets(self, paths: Iterable[Path]):
+        """Targets to refresh pillar on once the paths are changed."""
+        minions = set()
+        for path in paths:
+            minion_id = self._paths_minions.get(path)
+            if minion_id is None:
+                return ALL_MINIONS
+            minions.add(minion_id)
+        return sorted(minions)
 
     # TODO test
     def apply(self, rollback_on_error=False) -> None:
         try:
-            self.dump()
-            if not self.local:
-                self.refresh(self.targets)
+            changed = self.dump()
+            if changed and not self.local:
+                self.refresh(self.refresh_targets(changed))
         except Exception:
+            pillar_cache().invalidate()
             if rollback_on_error:
                 self.rollback()
                 self.apply(rollback_on_error=False)
             raise
 
+        if changed:
+            pillar_cache().invalidate()
+        else:
+            logger.debug("Pillar is not changed, refresh is skipped")
+
     @staticmethod
     def refresh(targets: str = ALL_MINIONS):
         return pillar_refresh(targets=targets)
@@ -524,17 +1025,18 @@ class PillarUpdaterNew(PillarUpdater):
         else:
             return path.with_name(f"{pillar_path.prefix}{path.name}")
 
-    def pillar(self, path: Path):
+    @property
+    def minions(self) -> List[str]:
+        # targets are matched by the client's master
+        return [self.targets]
+
+    def pillar_file(self, path: Path, minion_id: Optional[str] = None):
         if self.targets == ALL_MINIONS:
-            _path = self.pillar_path.all_hosts_path(path)
+            return self.pillar_path.all_hosts_path(path)
         else:
-            _path = self.pillar_path.host_path(path, self.targets)
-
-        if _path not in self._pillars:
-            self._pillars[_path] = (
-                utils.load_yaml(_path) if _path.exists() else {}
+            return self.pillar_path.host_path(
+                path, (minion_id or self.targets)
             )
-        return self._pillars[_path]
 
     def refresh(self, targets: str = ALL_MINIONS):
         return self.client.pillar_refresh(targets=targets)
@@ -21,6 +21,7 @@ from typing import Union, Any, List
 from .vendor import attr
 from . import inputs
 from .salt import provisioner_cmd
+from .job_results import record_job
 from .errors import ProvisionerError
 
 
@@ -52,18 +53,21 @@ class SimpleRunner:
 
         # TODO IMPROVE
         salt_job = (
-            (command != 'get_result') and
+            (command not in ('get_result', 'list_results')) and
             (self.nowait or (os.getenv('PRVSNR_SALT_JOB', 'no') == 'yes'))
         )
 
         if salt_job:
             try:
-                return provisioner_cmd(
+                res = provisioner_cmd(
                     command,
                     fun_args=args,
                     fun_kwargs=kwargs,
                     nowait=self.nowait
                 )
+                if self.nowait:
+                    record_job(res, command)
+                return res
             except ProvisionerError:
                 raise
             except Exception as exc:
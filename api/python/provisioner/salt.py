@@ -16,43 +16,60 @@
 #
 
 from abc import ABC, abstractmethod
+import os
+import re
+import salt.cache
 import salt.config
+import salt.loader
+import salt.utils.data
+import salt.utils.event
 from salt.client import LocalClient, Caller
 from salt.runner import RunnerClient
 from typing import (
-    List, Union, Dict, Tuple, Iterable, Any, Callable, Type, Optional
+    List, Union, Dict, Tuple, Iterable, Any, Callable, Type, Optional, Set
 )
 from salt.client.ssh.client import SSHClient
+from salt.exceptions import AuthenticationError
 from pathlib import Path
+from contextlib import contextmanager
+import fnmatch
 import logging
-from pprint import pformat
+import math
+import threading
+import time
+import weakref
 
 from .vendor import attr
 from .config import (
    ALL_MINIONS, LOCAL_MINION,
    PRVSNR_USER_FILEROOT_DIR,
-   SECRET_MASK
+   SECRET_MASK,
+   SALT_MASTER_CONFIG_DEFAULT,
+   SALT_CLIENT_POOL_MAX_IDLE,
+   SALT_CLIENT_POOL_IDLE_TTL,
+   SALT_GRAINS_CACHE_TTL
 )
 from .errors import (
     ProvisionerError,
     SaltError, SaltNoReturnError,
-    SaltCmdRunError, SaltCmdResultError,
+    SaltCmdRunError, SaltCmdResultError, SaltTargetsResolveError,
     PrvsnrCmdNotFinishedError, PrvsnrCmdNotFoundError
 )
-from .ssh import copy_id
+from .ssh import copy_id, SSHControlMaster
 from .values import is_special
 from ._api_cli import process_cli_result
-from .utils import load_yaml
+from .utils import load_yaml, lazy_pformat
 
 logger = logging.getLogger(__name__)
 
+# runner jobs functions are prefixed so in the master job cache
+RUNNER_JOB_FUN_PREFIX = 'runner.'
+
 _eauth = 'pam'
 _username = None
 _password = None
 
 
-_salt_local_client = None
-_salt_runner_client = None
 _salt_caller = None
 _salt_caller_local = None
 _salt_ssh_client = None
@@ -116,17 +133,26 @@ class SaltArgsMixin:
         return dict(arg=self.fun_args, kwarg=self.fun_kwargs, **self.kw)
 
     def __str__(self):
-        _dct = self._as_dict()
-        _self_safe = type(self)(**_dct)
-        return str(attr.asdict(_self_safe))
+        return str(self._as_dict())
 
     def _as_dict(self):
-        _dct = attr.asdict(self)
+        # a shallow masked view (EOS-14361): fields values are not
+        # deep-copied, nested dicts are copied only to be masked
+        _dct = {
+            _attr.name: getattr(self, _attr.name)
+            for _attr in attr.fields(type(self))
+        }
+        # as attr.asdict does
+        for key, value in _dct.items():
+            if isinstance(value, tuple):
+                _dct[key] = list(value)
         if 'password' in _dct['kw']:
-            _dct['kw']['password'] = SECRET_MASK
+            _dct['kw'] = dict(_dct['kw'], password=SECRET_MASK)
 
         if 'password' in _dct['fun_kwargs']:
-            _dct['fun_kwargs']['password'] = SECRET_MASK
+            _dct['fun_kwargs'] = dict(
+                _dct['fun_kwargs'], password=SECRET_MASK
+            )
 
         # we do not mask the 'kw' more since
         # it should include only salt related parameters
@@ -198,8 +224,11 @@ class SaltClientArgsBase(SaltArgsMixin):
 
     def __attrs_post_init__(self):
         if isinstance(self.targets, (list, tuple)):
-            self.targets = '|'.join(self.targets)
-            self.kw['tgt_type'] = 'pcre'
+            if self.kw.get('tgt_type') == 'list':
+                self.targets = ','.join(self.targets)
+            else:
+                self.targets = '|'.join(self.targets)
+                self.kw['tgt_type'] = 'pcre'
 
     @property
     def args(self):
@@ -486,22 +515,159 @@ def eauth():
     return _eauth
 
 
+@attr.s(auto_attribs=True)
+class SaltClientPool:
+    """Thread-safe pool of warm salt clients.
+
+    Salt clients are not safe to share across threads, so each client
+    is either idle in the pool or leased by exactly one caller.
+    Reusing idle clients saves options loading and master handshake
+    for each call. Note. eauth credentials are still passed with each
+    call (see ``_set_auth``), eauth tokens are not shared.
+    """
+    factory: Callable
+    max_idle: int = SALT_CLIENT_POOL_MAX_IDLE
+    idle_ttl: Optional[float] = SALT_CLIENT_POOL_IDLE_TTL
+
+    hits: int = attr.ib(init=False, default=0)
+    misses: int = attr.ib(init=False, default=0)
+    discards: int = attr.ib(init=False, default=0)
+
+    _idle: List = attr.ib(init=False, default=attr.Factory(list))
+    _leased: weakref.WeakSet = attr.ib(
+        init=False, default=attr.Factory(weakref.WeakSet)
+    )
+    _lock: Any = attr.ib(init=False, default=attr.Factory(threading.Lock))
+
+    def _is_expired(self, released_at: float, now: float) -> bool:
+        return (
+            self.idle_ttl is not None and
+            (now - released_at) > self.idle_ttl
+        )
+
+    def acquire(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                client, released_at = self._idle.pop()
+                if self._is_expired(released_at, now):
+                    self.discards += 1
+                    continue
+                self.hits += 1
+                self._leased.add(client)
+                return client
+            self.misses += 1
+
+        # client creation might be slow, so do that out of the lock
+        client = self.factory()
+        with self._lock:
+            self._leased.add(client)
+        return client
+
+    def release(self, client, discard: bool = False) -> bool:
+        with self._lock:
+            # not ours (e.g. created by someone else), ignore
+            if client not in self._leased:
+                return False
+
+            self._leased.discard(client)
+            if discard or len(self._idle) >= self.max_idle:
+                self.discards += 1
+            else:
+                self._idle.append((client, time.monotonic()))
+        return True
+
+    @contextmanager
+    def borrow(self):
+        client = self.acquire()
+        try:
+            yield client
+        except Exception:
+            # the client state is unknown, do not reuse it
+            self.release(client, discard=True)
+            raise
+        else:
+            self.release(client)
+
+    def clear(self):
+        with self._lock:
+            self.discards += len(self._idle)
+            self._idle = []
+
+    @property
+    def metrics(self) -> Dict:
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                discards=self.discards,
+                idle=len(self._idle),
+                leased=len(self._leased)
+            )
+
+
+def _salt_runner_client_factory():
+    __opts__ = salt.config.client_config(SALT_MASTER_CONFIG_DEFAULT)
+    return RunnerClient(opts=__opts__)
+
+
+_salt_local_client_pool = SaltClientPool(LocalClient)
+_salt_runner_client_pool = SaltClientPool(_salt_runner_client_factory)
+
+
+def salt_local_client_pool() -> SaltClientPool:
+    return _salt_local_client_pool
+
+
+def salt_runner_client_pool() -> SaltClientPool:
+    return _salt_runner_client_pool
+
+
+def salt_client_pools_metrics() -> Dict:
+    return {
+        'local': _salt_local_client_pool.metrics,
+        'runner': _salt_runner_client_pool.metrics
+    }
+
+
 def salt_local_client():
-    global _salt_local_client
-    # TODO IMPROVE in case of minion retsart old handler will
-    #      lead to Authentication error, so always recreate it
-    #      as a workaround for now
-    if not _salt_local_client or True:
-        _salt_local_client = LocalClient()
-    return _salt_local_client
+    # Note. should be returned back using 'salt_client_release'
+    return _salt_local_client_pool.acquire()
 
 
 def salt_runner_client():
-    global _salt_runner_client
-    if not _salt_runner_client:
-        __opts__ = salt.config.client_config('/etc/salt/master')
-        _salt_runner_client = RunnerClient(opts=__opts__)
-    return _salt_runner_client
+    # Note. should be returned back using 'salt_client_release'
+    return _salt_runner_client_pool.acquire()
+
+
+def salt_client_release(client, discard: bool = False):
+    for pool in (_salt_local_client_pool, _salt_runner_client_pool):
+        if pool.release(client, discard=discard):
+            break
+
+
+def _salt_pooled_cmd(get_client: Callable, method: str, *args, **kwargs):
+    # a pooled client might become stale (e.g. salt-master has been
+    # restarted) that leads to authentication error, retry once
+    # with another client in that case
+    for attempt in range(2):
+        client = get_client()
+        try:
+            res = getattr(client, method)(*args, **kwargs)
+        except AuthenticationError:
+            salt_client_release(client, discard=True)
+            if attempt:
+                raise
+            logger.warning(
+                'salt client authentication failed, retrying'
+                ' with a new client'
+            )
+        except Exception:
+            salt_client_release(client, discard=True)
+            raise
+        else:
+            salt_client_release(client)
+            return res
 
 
 def salt_caller():
@@ -574,10 +740,9 @@ class SaltClientBase(ABC):
         )
 
         logger.debug(
-            f"Running function '{fun}' on '{targets}', args: {cmd_args}"
+            "Running function '%s' on '%s', args: %s", fun, targets, cmd_args
         )
 
-        # TODO IMPROVE EOS-14361 make a View class instead
         cmd_args_view = cmd_args._as_dict()
 
         try:
@@ -596,8 +761,8 @@ class SaltClientBase(ABC):
         else:
             try:
                 logger.debug(
-                    f"Function '{fun}' on '{targets}' "
-                    f"resulted in {pformat(res.results)}"
+                    "Function '%s' on '%s' resulted in %s",
+                    fun, targets, lazy_pformat(res.results)
                 )
             except Exception as exc:
                 if (type(exc).__name__ == 'OSError' and exc.strerror == 'Message too long'):  # noqa: E501
@@ -665,6 +830,8 @@ class SaltClient(SaltClientBase):
 class SaltSSHClient(SaltClientBase):
     roster_file: str = None
     ssh_options: Optional[Dict] = None
+    # shared ssh connections for the default roster hosts
+    control_master: Optional[SSHControlMaster] = None
 
     _client: SSHClient = attr.ib(init=False, default=None)
 
@@ -825,16 +992,34 @@ class SaltSSHClient(SaltClientBase):
 
     # TODO TYPE EOS-8473
     def run(self, *args, roster_file=None, ssh_options=None, **kwargs):
+        if ssh_options is None:
+            ssh_options = self.ssh_options
         if roster_file is None:
             roster_file = self.roster_file
+            # NOTE not for custom rosters (e.g. bootstrap ones) since
+            #      a connection authenticated with a different key
+            #      would be reused otherwise
+            if self.control_master:
+                ssh_options = self.control_master.ssh_options(ssh_options)
         if roster_file:
             kwargs['roster_file'] = str(roster_file)
-        if ssh_options is None:
-            ssh_options = self.ssh_options
         if ssh_options:
             kwargs['ssh_options'] = ssh_options
         return super().run(*args, **kwargs)
 
+    def close(self):
+        """Closes shared ssh connections if any."""
+        if self.control_master and self.roster_file:
+            roster = load_yaml(self.roster_file) or {}
+            self.control_master.close(
+                [
+                    (params.get('host'), params.get('user'),
+                     params.get('port'))
+                    for params in roster.values()
+                ],
+                self.ssh_options
+            )
+
 
 def local_minion_id():
     global _local_minion_id
@@ -880,12 +1065,6 @@ def _salt_runner_cmd(  # noqa: C901 FIXME
     secure=False,
     **kwargs
 ):
-    # TODO FEATURE not yet supported
-    if nowait:
-        raise NotImplementedError(
-            'async calls for RunnerClient are not supported yet'
-        )
-
     # TODO log username / password ??? / eauth
     cmd_args = SaltRunnerArgs(
         fun, fun_args, fun_kwargs, nowait, kw=kwargs,
@@ -895,29 +1074,36 @@ def _salt_runner_cmd(  # noqa: C901 FIXME
     _set_auth(cmd_args.kw)
 
     eauth = 'username' in cmd_args.kw
-    if not eauth:
-        if nowait:
-            raise NotImplementedError(
-                'async calls without external auth for RunnerClient'
-                ' are not supported yet'
-            )
+    if not (eauth or nowait):
         cmd_args.kw['print_event'] = False
         cmd_args.kw['full_return'] = True
 
-    # TODO IMPROVE EOS-14361 make a View class instead
     cmd_args_view = cmd_args._as_dict()
 
     try:
-        if eauth:
-            _cmd_f = (
-                salt_runner_client().cmd_async if nowait
-                else salt_runner_client().cmd_sync
-            )
+        if nowait:
+            # Note. the runner is executed in a detached process,
+            #       its return is stored in the master job cache
+            #       as for any other salt job
+            low = dict(fun=fun, **cmd_args.kwargs)
+            if eauth:
+                salt_res = _salt_pooled_cmd(
+                    salt_runner_client, 'cmd_async', low
+                )
+            else:
+                salt_res = _salt_pooled_cmd(
+                    salt_runner_client, 'asynchronous', fun, low
+                )
+        elif eauth:
             low = dict(fun=fun, **cmd_args.kwargs)
-            salt_res = _cmd_f(low, full_return=True)
+            salt_res = _salt_pooled_cmd(
+                salt_runner_client, 'cmd_sync', low, full_return=True
+            )
         else:
-            _cmd_f = salt_runner_client().cmd
-            salt_res = _cmd_f(*cmd_args.args, **cmd_args.kwargs)
+            salt_res = _salt_pooled_cmd(
+                salt_runner_client, 'cmd',
+                *cmd_args.args, **cmd_args.kwargs
+            )
     except Exception as exc:
         logger.error(
             "salt command failed, reason {}, args {}"
@@ -942,7 +1128,16 @@ def _salt_runner_cmd(  # noqa: C901 FIXME
         )
 
     if nowait:
-        return salt_res
+        if 'jid' not in salt_res:
+            reason = (
+                'no jid key in RunnerClient async result dictionary: {}'
+                .format(salt_res)
+            )
+            logger.error(
+                "salt command failed, reason {}, args {}"
+                .format(reason, cmd_args_view))
+            raise SaltCmdRunError(cmd_args_view, reason)
+        return salt_res['jid']
 
     if eauth:
         if 'data' not in salt_res:
@@ -983,14 +1178,12 @@ def runner_function_run(
     **kwargs
 ):
     logger.debug(
-        "Running runner function '{}', fun_args: {},"
-        " fun_kwargs: {}, kwargs: {}"
-        .format(
-            fun,
-            (SECRET_MASK if secure else fun_args),
-            (SECRET_MASK if secure else fun_kwargs),
-            kwargs
-        )
+        "Running runner function '%s', fun_args: %s,"
+        " fun_kwargs: %s, kwargs: %s",
+        fun,
+        (SECRET_MASK if secure else fun_args),
+        (SECRET_MASK if secure else fun_kwargs),
+        kwargs
     )
 
     try:
@@ -1003,8 +1196,7 @@ def runner_function_run(
         raise
 
     logger.debug(
-        f"Runner function '{fun}' "
-        f"resulted in {pformat(res)}"
+        "Runner function '%s' resulted in %s", fun, lazy_pformat(res)
     )
 
     return res
@@ -1035,23 +1227,24 @@ def _salt_client_cmd(
         _set_auth(cmd_args.kw)
         cmd_args.kw['full_return'] = True
 
-    # TODO IMPROVE EOS-14361 make a View class instead
     cmd_args_view = cmd_args._as_dict()
 
+    client = None
     if local:
         client = salt_caller_local()
         salt_res_t = SaltCallerClientResult
     else:
-        client = salt_local_client()
         salt_res_t = SaltClientResult
 
     try:
         if local:
-            _cmd_f = client.cmd
+            salt_res = client.cmd(*cmd_args.args, **cmd_args.kwargs)
         else:
-            _cmd_f = (client.cmd_async if nowait else client.cmd)
-
-        salt_res = _cmd_f(*cmd_args.args, **cmd_args.kwargs)
+            salt_res = _salt_pooled_cmd(
+                salt_local_client,
+                ('cmd_async' if nowait else 'cmd'),
+                *cmd_args.args, **cmd_args.kwargs
+            )
     except Exception as exc:
         logger.error(
                 "salt command failed, reason {}, args {}"
@@ -1072,7 +1265,12 @@ def _salt_client_cmd(
     res = salt_res_t(salt_res, cmd_args_view, client)
 
     if res.fails:
-        raise SaltCmdResultError(cmd_args_view, res.fails)
+        raise SaltCmdResultError(
+            cmd_args_view, res.fails, {
+                target: ret for target, ret in res.results.items()
+                if target not in res.fails
+            }
+        )
     else:
         return res.results
 
@@ -1095,15 +1293,13 @@ def function_run(
     # return _salt_caller_cmd(fun, *args, **kwargs)
 
     logger.debug(
-        "Running function '{}' on '{}', fun_args: {},"
-        " fun_kwargs: {}, kwargs: {}"
-        .format(
-            fun,
-            targets,
-            (SECRET_MASK if secure else fun_args),
-            (SECRET_MASK if secure else fun_kwargs),
-            kwargs
-        )
+        "Running function '%s' on '%s', fun_args: %s,"
+        " fun_kwargs: %s, kwargs: %s",
+        fun,
+        targets,
+        (SECRET_MASK if secure else fun_args),
+        (SECRET_MASK if secure else fun_kwargs),
+        kwargs
     )
 
     try:
@@ -1116,17 +1312,591 @@ def function_run(
         raise
 
     logger.debug(
-        f"Function '{fun}' on '{targets}' "
-        f"resulted in {pformat(res)}"
+        "Function '%s' on '%s' resulted in %s",
+        fun, targets, lazy_pformat(res)
     )
 
+    if fun in GRAINS_CHANGING_FUNS:
+        salt_grains_cache().invalidate()
+
     return res
 
 
+# TODO TEST
+@attr.s(auto_attribs=True)
+class SaltBatchCall:
+    fun: str = attr.ib(converter=str)
+    targets: Union[str, list, tuple] = ALL_MINIONS
+    fun_args: Union[Tuple, List, None] = None
+    fun_kwargs: Union[Dict, None] = None
+    secure: bool = False
+    kw: Dict = attr.Factory(dict)
+
+    @classmethod
+    def from_spec(cls, spec: Union['SaltBatchCall', Tuple, List, Dict]):
+        if isinstance(spec, cls):
+            return spec
+        elif isinstance(spec, dict):
+            return cls(**spec)
+        else:
+            # (fun, targets, fun_args, fun_kwargs)
+            return cls(*spec)
+
+
+@attr.s(auto_attribs=True)
+class SaltBatchCallResult:
+    call: SaltBatchCall
+    results: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def get(self):
+        if self.error is not None:
+            raise self.error
+        return self.results
+
+
+def _salt_batch_collect(client, pub_data: Dict, timeout, cmd_args):
+    salt_res = {}
+    for fn_ret in client.get_cli_event_returns(
+        pub_data['jid'], pub_data['minions'], timeout,
+        cmd_args.targets, cmd_args.kw.get('tgt_type', 'glob')
+    ):
+        if fn_ret:
+            salt_res.update(fn_ret)
+
+    # the same as LocalClient.cmd does for minions that do not respond
+    for failed in set(pub_data['minions']) - set(salt_res):
+        salt_res[failed] = False
+
+    return salt_res
+
+
+def function_run_batch(
+    calls: Union[Dict[Any, Any], Iterable[Any]],
+    timeout: Optional[int] = None
+) -> Dict[Any, SaltBatchCallResult]:
+    """Run multiple salt functions concurrently.
+
+    All the calls are published at once (as async jobs) and then
+    their returns are gathered from the master event bus, so the whole
+    batch takes about as long as the slowest call.
+
+    :param calls: either a list or a dictionary of calls, each call
+        is a SaltBatchCall or a (fun, targets, fun_args, fun_kwargs)
+        tuple (trailing items are optional)
+    :param timeout: salt timeout for the whole batch (master's
+        default if not specified)
+    :return: a dictionary of call results, keys are the same
+        as for dictionary input or calls indexes for a list
+    """
+    if not isinstance(calls, dict):
+        calls = dict(enumerate(calls))
+
+    ret = {}
+
+    with salt_local_client_pool().borrow() as client:
+        was_listening = client.event.cpub
+        try:
+            _function_run_batch(client, calls, timeout, ret)
+        finally:
+            if not was_listening:
+                client.event.close_pub()
+
+    for key, call_res in ret.items():
+        if call_res.failed:
+            logger.debug(
+                f"Batch call '{key}' failed: {call_res.error!r}"
+            )
+
+    return ret
+
+
+def _function_run_batch(client, calls: Dict, timeout, ret: Dict):
+    jobs = {}
+
+    # the calls run concurrently, so all of them share one deadline
+    if timeout is None:
+        timeout = client.opts['timeout']
+    deadline = time.monotonic() + timeout
+
+    for key, spec in calls.items():
+        call = SaltBatchCall.from_spec(spec)
+        ret[key] = call_res = SaltBatchCallResult(call)
+
+        targets = call.targets
+        if targets == LOCAL_MINION:
+            targets = local_minion_id()
+
+        cmd_args = SaltClientArgs(
+            targets, call.fun, call.fun_args, call.fun_kwargs,
+            kw=dict(call.kw), secure=call.secure
+        )
+        _set_auth(cmd_args.kw)
+        cmd_args_view = cmd_args._as_dict()
+
+        logger.debug(
+            f"Publishing function '{call.fun}' on '{targets}'"
+            " as a part of a batch"
+        )
+
+        try:
+            # listen to the job's events before it is published
+            pub_data = client.run_job(
+                *cmd_args.args, **cmd_args.kwargs,
+                timeout=timeout, listen=True
+            )
+        except Exception as exc:
+            call_res.error = SaltCmdRunError(cmd_args_view, repr(exc))
+            continue
+
+        if not pub_data:
+            call_res.error = SaltNoReturnError(
+                cmd_args_view, 'Empty salt result: {}'.format(pub_data)
+            )
+            continue
+
+        jobs[key] = (pub_data, cmd_args, cmd_args_view)
+
+    for key, (pub_data, cmd_args, cmd_args_view) in jobs.items():
+        call_res = ret[key]
+        # salt expects whole seconds
+        remaining = max(math.ceil(deadline - time.monotonic()), 0)
+        try:
+            salt_res = _salt_batch_collect(
+                client, pub_data, remaining, cmd_args
+            )
+        except Exception as exc:
+            call_res.error = SaltCmdRunError(cmd_args_view, repr(exc))
+            continue
+
+        res = SaltClientResult(salt_res, cmd_args_view)
+        if res.fails:
+            call_res.error = SaltCmdResultError(cmd_args_view, res.fails)
+        else:
+            call_res.results = res.results
+
+
+# functions that (might) change minions grains
+GRAINS_CHANGING_FUNS = (
+    'saltutil.sync_grains',
+    'saltutil.sync_all',
+    'saltutil.refresh_grains',
+    'grains.setval',
+    'grains.setvals',
+    'grains.append',
+    'grains.delkey',
+    'grains.delval',
+    'grains.remove'
+)
+
+
+@attr.s(auto_attribs=True)
+class SaltGrainsCache:
+    """Cache of minions grains keyed by (minion, grain).
+
+    Besides separate grains it keeps full minions grains
+    (``grains.items``) and the minions matched by previously
+    used targets.
+    """
+    ttl: Optional[float] = SALT_GRAINS_CACHE_TTL
+
+    # (minion, grain) -> (value, stored_at)
+    _grains: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    # minion -> (grains, stored_at)
+    _items: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    # targets -> (minions, stored_at)
+    _targets: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    _lock: Any = attr.ib(init=False, default=attr.Factory(threading.Lock))
+
+    def _fresh(self, entry):
+        if entry is None:
+            return False
+        return self.ttl is None or (time.monotonic() - entry[1]) < self.ttl
+
+    @staticmethod
+    def _targets_key(targets):
+        if isinstance(targets, (list, tuple)):
+            return tuple(sorted(targets))
+        return targets
+
+    def minions(self, targets) -> Optional[List[str]]:
+        if targets == LOCAL_MINION:
+            return [local_minion_id()]
+        if isinstance(targets, (list, tuple)):
+            return list(targets)
+        # a plain minion id
+        if re.fullmatch(r'[\w.-]+', targets):
+            return [targets]
+
+        entry = self._targets.get(self._targets_key(targets))
+        return list(entry[0]) if self._fresh(entry) else None
+
+    def get(self, minion: str, grain: str):
+        """Returns a cached grain value, raises KeyError if missed."""
+        entry = self._grains.get((minion, grain))
+        if self._fresh(entry):
+            return entry[0]
+
+        entry = self._items.get(minion)
+        if self._fresh(entry):
+            # the same lookup as grains.get does
+            value = entry[0]
+            for key in grain.split(':'):
+                if not isinstance(value, dict) or key not in value:
+                    return ''
+                value = value[key]
+            return value
+
+        raise KeyError((minion, grain))
+
+    def has_items(self, minion: str) -> bool:
+        return self._fresh(self._items.get(minion))
+
+    def update(self, targets, grain: str, res: Dict):
+        now = time.monotonic()
+        with self._lock:
+            if targets is not None:
+                self._targets[self._targets_key(targets)] = (list(res), now)
+            for minion, value in res.items():
+                self._grains[(minion, grain)] = (value, now)
+
+    def update_items(self, targets, res: Dict):
+        now = time.monotonic()
+        with self._lock:
+            self._targets[self._targets_key(targets)] = (list(res), now)
+            for minion, grains in res.items():
+                self._items[minion] = (grains, now)
+
+    def invalidate(self, minions: Optional[Iterable[str]] = None):
+        with self._lock:
+            if minions is None:
+                self._grains.clear()
+                self._items.clear()
+                self._targets.clear()
+                return
+
+            minions = set(minions)
+            for key in [k for k in self._grains if k[0] in minions]:
+                del self._grains[key]
+            for minion in minions:
+                self._items.pop(minion, None)
+
+
+_salt_grains_cache = SaltGrainsCache()
+
+
+def salt_grains_cache() -> SaltGrainsCache:
+    return _salt_grains_cache
+
+
+def grains_get(
+    grain: str, targets=ALL_MINIONS, refresh: bool = False, **kwargs
+) -> Dict:
+    """Returns a grain value per minion using the grains cache.
+
+    :param grain: a grain key, nested keys are separated by ':'
+    :param targets: (optional) targets to get the grain for
+    :param refresh: (optional) ignore the cached values
+    """
+    cache = salt_grains_cache()
+    if not (refresh or kwargs):
+        minions = cache.minions(targets)
+        if minions:
+            try:
+                return {minion: cache.get(minion, grain) for minion in minions}
+            except KeyError:
+                pass
+
+    res = function_run(
+        'grains.get', fun_args=[grain], targets=targets, **kwargs
+    )
+    # targets matching might be customized by kwargs (e.g. tgt_type)
+    cache.update(None if kwargs else targets, grain, res)
+    return res
+
+
+def grains_prefetch(targets=ALL_MINIONS, refresh: bool = False) -> Dict:
+    """Caches all the grains of the targeted minions at once.
+
+    Minions with already cached grains are not requested again
+    unless ``refresh`` is set.
+    """
+    cache = salt_grains_cache()
+    if not refresh:
+        minions = cache.minions(targets)
+        if minions and all(cache.has_items(minion) for minion in minions):
+            return {}
+
+    res = function_run('grains.items', targets=targets)
+    cache.update_items(targets, res)
+    return res
+
+
+@attr.s(auto_attribs=True)
+class _CompoundTargetsParser:
+    """Matches compound targets using a targets resolver.
+
+    The same grammar as salt has: 'and' binds tighter than 'or',
+    parentheses should be separated by spaces.
+    """
+    resolver: 'SaltTargetResolver'
+    expr: str
+    minions: List[str]
+    _tokens: List[str] = attr.ib(init=False, default=None)
+    _pos: int = attr.ib(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        self._tokens = self.expr.split()
+
+    def _peek(self) -> Optional[str]:
+        return (
+            self._tokens[self._pos] if self._pos < len(self._tokens)
+            else None
+        )
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise SaltTargetsResolveError(
+                f'unexpected end of the compound targets: {self.expr}'
+            )
+        self._pos += 1
+        return token
+
+    def _or(self) -> Set:
+        res = self._and()
+        while self._peek() == 'or':
+            self._next()
+            res = res | self._and()
+        return res
+
+    def _and(self) -> Set:
+        res = self._not()
+        while self._peek() == 'and':
+            self._next()
+            res = res & self._not()
+        return res
+
+    def _not(self) -> Set:
+        if self._peek() == 'not':
+            self._next()
+            return set(self.minions) - self._not()
+        return self._term()
+
+    def _term(self) -> Set:
+        token = self._next()
+        if token == '(':
+            res = self._or()
+            if self._next() != ')':
+                raise SaltTargetsResolveError(
+                    f'unbalanced parentheses in targets: {self.expr}'
+                )
+            return res
+        elif token in (')', 'and', 'or'):
+            raise SaltTargetsResolveError(
+                f"unexpected '{token}' in targets: {self.expr}"
+            )
+        return self._matcher(token)
+
+    def _matcher(self, token: str) -> Set:
+        if len(token) > 2 and token[1] == '@':
+            tgt_type = self.resolver.COMPOUND_MATCHERS.get(token[0])
+            if tgt_type is None:
+                raise SaltTargetsResolveError(
+                    f"matcher '{token[:2]}' is not supported: {self.expr}"
+                )
+            return self.resolver._match(token[2:], tgt_type, self.minions)
+        return self.resolver._match(token, 'glob', self.minions)
+
+    def parse(self) -> Set:
+        res = self._or()
+        if self._peek() is not None:
+            raise SaltTargetsResolveError(
+                f"unexpected '{self._peek()}' in targets: {self.expr}"
+            )
+        return res
+
+
+@attr.s(auto_attribs=True)
+class SaltTargetResolver:
+    """Resolves salt targets to minions ids locally.
+
+    Targets are matched against an index of accepted minions keys
+    (the master pki dir) and minions grains (the master minions data
+    cache), so no master round-trips are needed to learn which minions
+    match. The keys are re-read once the pki dir is changed (a key is
+    accepted, rejected or deleted), the grains are kept for ``ttl``
+    seconds.
+
+    Supported targets types: glob, list, pcre, grain, grain_pcre
+    and compound (with ``G@``, ``P@``, ``L@`` and ``E@`` matchers).
+    """
+    c_path: str = SALT_MASTER_CONFIG_DEFAULT
+    ttl: Optional[float] = SALT_GRAINS_CACHE_TTL
+
+    _opts: Optional[Dict] = attr.ib(init=False, default=None)
+    _cache: Any = attr.ib(init=False, default=None)
+    _keys: Optional[List[str]] = attr.ib(init=False, default=None)
+    _keys_mtime: Optional[float] = attr.ib(init=False, default=None)
+    # minion -> (grains, stored_at)
+    _grains: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    _lock: Any = attr.ib(init=False, default=attr.Factory(threading.Lock))
+
+    COMPOUND_MATCHERS = {
+        'G': 'grain',
+        'P': 'grain_pcre',
+        'L': 'list',
+        'E': 'pcre'
+    }
+
+    @property
+    def opts(self) -> Dict:
+        if self._opts is None:
+            self._opts = salt.config.client_config(self.c_path)
+        return self._opts
+
+    @property
+    def keys_dir(self) -> Path:
+        return Path(self.opts['pki_dir']) / 'minions'
+
+    def minions(self) -> List[str]:
+        """Returns ids of minions with accepted keys."""
+        try:
+            mtime = self.keys_dir.stat().st_mtime
+        except OSError as exc:
+            raise SaltTargetsResolveError(
+                f'minions keys are not available: {exc}'
+            )
+
+        with self._lock:
+            if self._keys is None or mtime != self._keys_mtime:
+                self._keys = sorted(
+                    path.name for path in self.keys_dir.iterdir()
+                    if not path.name.startswith('.')
+                )
+                self._keys_mtime = mtime
+                # grains of the removed minions are not needed anymore
+                for minion in set(self._grains) - set(self._keys):
+                    del self._grains[minion]
+            return list(self._keys)
+
+    def grains(self, minion: str) -> Dict:
+        entry = self._grains.get(minion)
+        if entry is not None and (
+            self.ttl is None or (time.monotonic() - entry[1]) < self.ttl
+        ):
+            return entry[0]
+
+        if self._cache is None:
+            self._cache = salt.cache.factory(self.opts)
+
+        try:
+            data = self._cache.fetch('minions/{}'.format(minion), 'data')
+        except Exception as exc:
+            raise SaltTargetsResolveError(
+                f'minion {minion} data is not available: {exc!r}'
+            )
+
+        if not data or 'grains' not in data:
+            raise SaltTargetsResolveError(
+                f'minion {minion} grains are not cached by the master'
+            )
+
+        with self._lock:
+            self._grains[minion] = (data['grains'], time.monotonic())
+        return data['grains']
+
+    def invalidate(self):
+        with self._lock:
+            self._keys = self._keys_mtime = None
+            self._grains.clear()
+
+    def _match(self, expr: str, tgt_type: str, minions: List[str]) -> Set:
+        if tgt_type == 'glob':
+            return set(fnmatch.filter(minions, expr))
+        elif tgt_type == 'list':
+            return set(minions) & set(
+                expr.split(',') if isinstance(expr, str) else expr
+            )
+        elif tgt_type == 'pcre':
+            regex = re.compile(expr)
+            return {minion for minion in minions if regex.match(minion)}
+        elif tgt_type in ('grain', 'grain_pcre'):
+            return {
+                minion for minion in minions
+                if salt.utils.data.subdict_match(
+                    self.grains(minion), expr,
+                    regex_match=(tgt_type == 'grain_pcre')
+                )
+            }
+        elif tgt_type == 'compound':
+            return self._match_compound(expr, minions)
+        else:
+            raise SaltTargetsResolveError(
+                f'targets type {tgt_type} is not supported'
+            )
+
+    def _match_compound(self, expr: str, minions: List[str]) -> Set:
+        return _CompoundTargetsParser(self, expr, minions).parse()
+
+    def resolve(self, targets, tgt_type: str = 'glob') -> List[str]:
+        """Returns sorted ids of the minions matched by the targets."""
+        if targets == LOCAL_MINION:
+            return [local_minion_id()]
+        if isinstance(targets, (list, tuple)):
+            tgt_type = 'list'
+
+        try:
+            return sorted(self._match(targets, tgt_type, self.minions()))
+        except re.error as exc:
+            raise SaltTargetsResolveError(
+                f'invalid regular expression in targets {targets}: {exc}'
+            )
+
+
+_salt_target_resolver = SaltTargetResolver()
+
+
+def salt_target_resolver() -> SaltTargetResolver:
+    return _salt_target_resolver
+
+
+def resolve_targets(targets=ALL_MINIONS, tgt_type: str = 'glob') -> List[str]:
+    """Returns ids of the minions matched by the targets.
+
+    Targets are resolved locally if possible, otherwise the matching
+    is done by the master using responding minions.
+    """
+    try:
+        return salt_target_resolver().resolve(targets, tgt_type)
+    except SaltTargetsResolveError as exc:
+        logger.debug(
+            "Targets %s are not resolved locally: %s", targets, exc
+        )
+
+    return sorted(
+        function_run('test.ping', targets=targets, tgt_type=tgt_type)
+    )
+
+
 def pillar_get(targets=ALL_MINIONS, **kwargs):
     return function_run('pillar.items', targets=targets, **kwargs)
 
 
+# Note. relies on the custom execution module 'srv/_modules/pillar_ops.py'
+def pillar_get_keypaths(keypaths, targets=ALL_MINIONS, **kwargs):
+    return function_run(
+        'pillar_ops.get_keypaths',
+        fun_args=[list(keypaths)],
+        targets=targets,
+        **kwargs
+    )
+
+
 def pillar_refresh(targets=ALL_MINIONS, **kwargs):
     return function_run('saltutil.refresh_pillar', targets=targets, **kwargs)
 
@@ -1200,6 +1970,33 @@ def process_provisioner_cmd_res(res):
     return process_cli_result(prvsnr_res)
 
 
+def process_runner_cmd_res(res):
+    if not isinstance(res, dict) or len(res) != 1:
+        raise ProvisionerError(
+            f'Expected a dictionary of len = 1, provided: {type(res)}, {res}'
+        )
+
+    # the master job cache keeps a runner return under the master id
+    data = next(iter(res.values()))
+    if isinstance(data, dict) and 'return' in data and 'fun' not in data:
+        data = data['return']
+
+    try:
+        runner_res = SaltRunnerResult.from_salt_res(data)
+    except (TypeError, AttributeError):
+        raise ProvisionerError(
+            f'Failed to parse salt runner result: {data}'
+        )
+
+    if runner_res.success:
+        return runner_res.result
+    else:
+        raise SaltCmdResultError(
+            dict(fun=runner_res.fun, fun_args=runner_res.fun_args),
+            runner_res.result
+        )
+
+
 def provisioner_cmd(
     cmd,
     fun_args: Union[List, Tuple, None] = None,
@@ -1243,9 +2040,155 @@ def provisioner_cmd(
             return process_provisioner_cmd_res(res)
 
 
+@attr.s(auto_attribs=True)
+class StatesBatch:
+    """Options of a rolling (batch) states appliance.
+
+    :param size: a number of minions in a batch or a percentage
+        of the matched minions, e.g. ``'25%'``
+    :param max_failures: a number of failed minions to tolerate,
+        the rollout is stopped once it is exceeded
+    :param health_check: (optional) a callable that is called after
+        each batch with a list of the batch minions and their results,
+        the rollout is stopped if it returns a falsy value
+    """
+    size: Union[int, str] = attr.ib()
+    max_failures: int = attr.ib(default=0, converter=int)
+    health_check: Optional[Callable[[List[str], Dict], Any]] = None
+
+    @size.validator
+    def _check_size(self, attribute, value):
+        size = str(value).strip()
+        try:
+            if size.endswith('%'):
+                ok = 0 < float(size[:-1]) <= 100
+            else:
+                ok = int(size) > 0
+        except ValueError:
+            ok = False
+
+        if not ok:
+            raise ValueError(
+                f"batch size should be a positive integer"
+                f" or a percentage, provided: {value!r}"
+            )
+
+    @classmethod
+    def from_spec(
+        cls, spec: Union['StatesBatch', Dict, int, str, None]
+    ) -> Optional['StatesBatch']:
+        if spec is None or isinstance(spec, cls):
+            return spec
+        elif isinstance(spec, dict):
+            return cls(**spec)
+        else:
+            return cls(spec)
+
+    def batch_size(self, total: int) -> int:
+        size = str(self.size).strip()
+        if size.endswith('%'):
+            # ceil, at least one minion in a batch
+            return max(1, int(-(-total * float(size[:-1]) // 100)))
+        return int(size)
+
+    def split(self, minions: List[str]) -> List[List[str]]:
+        size = self.batch_size(len(minions))
+        return [
+            minions[idx:idx + size] for idx in range(0, len(minions), size)
+        ]
+
+
+def _batch_minions(targets, tgt_type='glob') -> List[str]:
+    if targets == LOCAL_MINION:
+        return [local_minion_id()]
+
+    if tgt_type == 'list':
+        if isinstance(targets, str):
+            targets = targets.split(',')
+        return list(targets)
+
+    # only responding minions are considered
+    return sorted(
+        function_run('test.ping', targets=targets, tgt_type=tgt_type)
+    )
+
+
+def _states_apply_batch(
+    states: List[Union[str, State]], targets, batch: StatesBatch, **kwargs
+):
+    minions = _batch_minions(targets, kwargs.pop('tgt_type', 'glob'))
+    kwargs['tgt_type'] = 'list'
+
+    ret = {}
+    failed = {}
+    for state in states:
+        state = State(state)
+        ret[state.name] = state_res = {}
+
+        # minions failed on previous states are not touched anymore
+        batches = batch.split([m for m in minions if m not in failed])
+        for idx, batch_minions in enumerate(batches, 1):
+            logger.info(
+                f"Applying '{state.name}', batch {idx}/{len(batches)}:"
+                f" {batch_minions}"
+            )
+            try:
+                res = function_run(
+                    'state.apply', fun_args=[state.name],
+                    targets=batch_minions, **kwargs
+                )
+            except SaltCmdResultError as exc:
+                fails = (
+                    exc.reason if isinstance(exc.reason, dict)
+                    else {m: exc.reason for m in batch_minions}
+                )
+                failed.update({
+                    minion: {state.name: _fails}
+                    for minion, _fails in fails.items()
+                })
+                if len(failed) > batch.max_failures:
+                    logger.error(
+                        f"Rollout of '{state.name}' is stopped: {len(failed)}"
+                        f" failed minions, max allowed {batch.max_failures}"
+                    )
+                    raise SaltCmdResultError(
+                        dict(states=[str(s) for s in states],
+                             targets=targets, batch=batch_minions),
+                        failed
+                    ) from exc
+                # results of the succeeded batch minions
+                res = {
+                    minion: ret for minion, ret in exc.results.items()
+                    if minion not in fails
+                }
+
+            state_res.update(res)
+
+            if batch.health_check and not batch.health_check(
+                batch_minions, res
+            ):
+                raise ProvisionerError(
+                    f"Rollout of '{state.name}' is stopped: health check"
+                    f" failed after batch {idx}/{len(batches)}:"
+                    f" {batch_minions}"
+                )
+
+    if failed:
+        raise SaltCmdResultError(
+            dict(states=[str(s) for s in states], targets=targets), failed
+        )
+
+    return ret
+
+
 def states_apply(
-    states: List[Union[str, State]], targets=ALL_MINIONS, **kwargs
+    states: List[Union[str, State]], targets=ALL_MINIONS,
+    batch: Union[StatesBatch, Dict, int, str, None] = None, **kwargs
 ):
+    batch = StatesBatch.from_spec(batch)
+    if batch is not None:
+        return _states_apply_batch(states, targets, batch, **kwargs)
+
     # TODO multiple states at once
     ret = {}
     for state in states:
@@ -1364,6 +2307,118 @@ class StateFunExecuter:
         )
 
 
+# TODO TEST
+@attr.s(auto_attribs=True)
+class SaltJobTracker:
+    """Tracks salt jobs by their JIDs.
+
+    Job data is read from the master job cache directly by JID
+    (no job list scans) and job completion is awaited
+    using the master event bus.
+    """
+    c_path: str = SALT_MASTER_CONFIG_DEFAULT
+    # how often (in seconds) to re-check the job cache while waiting
+    poll_interval: float = 1
+
+    _opts: Optional[Dict] = attr.ib(init=False, default=None)
+    _returners: Any = attr.ib(init=False, default=None)
+
+    @property
+    def opts(self) -> Dict:
+        if self._opts is None:
+            self._opts = salt.config.client_config(self.c_path)
+        return self._opts
+
+    @property
+    def available(self) -> bool:
+        # the job cache is readable by privileged users only
+        return os.access(
+            os.path.join(self.opts['cachedir'], 'jobs'), os.R_OK | os.X_OK
+        )
+
+    def _job_cache_fun(self, fun: str) -> Callable:
+        if self._returners is None:
+            self._returners = salt.loader.returners(self.opts, {})
+        return self._returners[
+            '{}.{}'.format(self.opts['master_job_cache'], fun)
+        ]
+
+    def get_job(self, jid: str) -> Optional[SaltJob]:
+        load = self._job_cache_fun('get_load')(jid)
+        if not load:
+            return None
+
+        return SaltJob(
+            jid,
+            function=load.get('fun', ''),
+            arguments=load.get('arg', []),
+            target=load.get('tgt', ''),
+            target_type=load.get('tgt_type', ''),
+            user=load.get('user', ''),
+            minions=load.get('minions', []),
+            result=self._job_cache_fun('get_jid')(jid)
+        )
+
+    @staticmethod
+    def is_finished(job: SaltJob) -> bool:
+        return bool(job.result) and set(job.minions).issubset(job.result)
+
+    def get_result(self, jid: str) -> SaltJob:
+        job = self.get_job(jid)
+        if job is None:
+            raise PrvsnrCmdNotFoundError(jid)
+        if not self.is_finished(job):
+            raise PrvsnrCmdNotFinishedError(jid)
+        return job
+
+    def wait(self, jid: str, timeout: Optional[float] = None) -> SaltJob:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        event = salt.utils.event.get_master_event(
+            self.opts, self.opts['sock_dir'], listen=True
+        )
+        try:
+            # Note. the job cache is checked after the subscription
+            #       to not miss returns that come meanwhile
+            while True:
+                # Note. the job load might be not yet stored
+                #       right after the job is published
+                try:
+                    return self.get_result(jid)
+                except (
+                    PrvsnrCmdNotFoundError, PrvsnrCmdNotFinishedError
+                ) as exc:
+                    last_exc = exc
+
+                wait = self.poll_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise last_exc
+                    wait = min(wait, remaining)
+
+                # a return would be stored in the cache a bit later
+                # than the event is fired, so the cache is re-checked
+                # on the next iteration in any case
+                # runners returns are fired as salt/run/<jid>/ret
+                event.get_event(
+                    wait=wait, tag=r'salt/(job|run)/{}/ret'.format(jid),
+                    full=True, match_type='pcre'
+                )
+        finally:
+            event.destroy()
+
+
+_salt_job_tracker = None
+
+
+def salt_job_tracker() -> SaltJobTracker:
+    global _salt_job_tracker
+    if not _salt_job_tracker:
+        _salt_job_tracker = SaltJobTracker()
+    return _salt_job_tracker
+
+
 # TODO TEST
 @attr.s(auto_attribs=True)
 class SaltJobsRunner:
@@ -1399,26 +2454,72 @@ class SaltJobsRunner:
         )
 
     @classmethod
-    def prvsnr_job_result(cls, jid):
-        jobs = cls.provisioner_jobs()
-        if jid in jobs:
-            job = cls.print_job(jid)
-            if not job.result:
-                raise PrvsnrCmdNotFinishedError(jid)
-            else:
-                # FIXME EOS-14361 that might disclosure some secure data
-                #       since 'secure' arg is not set
-                cmd_args = SaltClientArgs(
-                    targets=job.minions,  # TODO ??? or job.target
-                    fun=job.function,
-                    fun_args=job.arguments
-                )
-                cmd_args_view = cmd_args._as_dict()
-                client_res = SaltClientResult(job.result, cmd_args_view)
-                return process_provisioner_cmd_res(client_res.results)
+    def _printed_job_result(cls, jid) -> SaltJob:
+        # lookup by jid using the master, still no job list scans
+        job = cls.print_job(jid)
+        if job.error:
+            raise PrvsnrCmdNotFoundError(jid)
+        if not job.result:
+            raise PrvsnrCmdNotFinishedError(jid)
+        return job
+
+    @classmethod
+    def _printed_job_wait(cls, jid, timeout=None, poll_interval=1) -> SaltJob:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return cls._printed_job_result(jid)
+            except (PrvsnrCmdNotFoundError, PrvsnrCmdNotFinishedError):
+                wait = poll_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise
+                    wait = min(wait, remaining)
+            time.sleep(wait)
+
+    @classmethod
+    def prvsnr_job(cls, jid, wait=False, timeout=None) -> SaltJob:
+        tracker = salt_job_tracker()
+        if tracker.available:
+            job = (
+                tracker.wait(jid, timeout=timeout) if wait
+                else tracker.get_result(jid)
+            )
+        elif wait:
+            job = cls._printed_job_wait(
+                jid, timeout=timeout, poll_interval=tracker.poll_interval
+            )
         else:
+            job = cls._printed_job_result(jid)
+
+        if not (
+            job.function.startswith('provisioner.')
+            or cls.is_runner_job(job)
+        ):
             raise PrvsnrCmdNotFoundError(jid)
 
+        return job
+
+    @staticmethod
+    def is_runner_job(job: SaltJob) -> bool:
+        return job.function.startswith(RUNNER_JOB_FUN_PREFIX)
+
+    @staticmethod
+    def prvsnr_job_raw_result(job: SaltJob):
+        if SaltJobsRunner.is_runner_job(job):
+            return job.result
+
+        # FIXME EOS-14361 that might disclosure some secure data
+        #       since 'secure' arg is not set
+        cmd_args = SaltClientArgs(
+            targets=job.minions,  # TODO ??? or job.target
+            fun=job.function,
+            fun_args=job.arguments
+        )
+        cmd_args_view = cmd_args._as_dict()
+        return SaltClientResult(job.result, cmd_args_view).results
+
 
 def get_last_txn_ids(targets: str, multiple_targets_ok: bool = False) -> dict:
     """
@@ -68,17 +68,26 @@ class SaltArgsBase:
 
     def __str__(self):
         """Return str presentation."""
-        _dct = self._as_dict()
-        _self_safe = type(self)(**_dct)
-        return str(attr.asdict(_self_safe))
+        return str(self._as_dict())
 
     def _as_dict(self):
-        _dct = attr.asdict(self)
+        # a shallow masked view (EOS-14361): fields values are not
+        # deep-copied, nested dicts are copied only to be masked
+        _dct = {
+            _attr.name: getattr(self, _attr.name)
+            for _attr in attr.fields(type(self))
+        }
+        # as attr.asdict does
+        for key, value in _dct.items():
+            if isinstance(value, tuple):
+                _dct[key] = list(value)
         if 'password' in _dct['kw']:
-            _dct['kw']['password'] = config.SECRET_MASK
+            _dct['kw'] = dict(_dct['kw'], password=config.SECRET_MASK)
 
         if 'password' in _dct['fun_kwargs']:
-            _dct['fun_kwargs']['password'] = config.SECRET_MASK
+            _dct['fun_kwargs'] = dict(
+                _dct['fun_kwargs'], password=config.SECRET_MASK
+            )
 
         # we do not mask the 'kw' more since
         # it should include only salt related parameters
@@ -290,12 +299,11 @@ class SaltClientBase(ABC):
             fun, fun_args, fun_kwargs, secure, **kwargs
         )
 
-        # TODO IMPROVE EOS-14361 make a View class instead
         cmd_args_view = cmd_args._as_dict()
 
         logger.debug(
-            f"'{type(self)}' client: Running function '{fun}' "
-            f"with args: {cmd_args}"
+            "'%s' client: Running function '%s' with args: %s",
+            type(self), fun, cmd_args
         )
 
         try:
@@ -316,8 +324,8 @@ class SaltClientBase(ABC):
 
         try:
             logger.debug(
-                f"'{type(self)}' client: Function '{fun}' resulted in "
-                f"{res.results}"
+                "'%s' client: Function '%s' resulted in %s",
+                type(self), fun, res.results
             )
         except Exception as exc:
             if (type(exc).__name__ == 'OSError' and exc.strerror == 'Message too long'):  # noqa: E501
@@ -19,6 +19,7 @@ from salt.client import LocalClient
 from typing import (
     Dict, Type, Union, Tuple
 )
+from contextlib import contextmanager
 import logging
 
 from .. import inputs
@@ -37,21 +38,10 @@ from .base import (
     SaltClientJIDResult
 )
 from .auth import _set_auth
+from ..salt import salt_local_client_pool
 
 logger = logging.getLogger(__name__)
 
-_salt_local_client = None
-
-
-def salt_local_client():
-    global _salt_local_client
-    # TODO IMPROVE in case of minion retsart old handler will
-    #      lead to Authentication error, so always recreate it
-    #      as a workaround for now
-    if not _salt_local_client or True:
-        _salt_local_client = LocalClient()
-    return _salt_local_client
-
 
 # TODO TEST EOS-8473
 @attr.s(auto_attribs=True)
@@ -100,10 +90,17 @@ class SaltLocalClient(SaltClientBase):
 
     def __attrs_post_init__(self):
         """Do post init."""
+        # shared clients are borrowed from the pool per call
+        if not self.shared:
+            self._client = LocalClient(c_path=str(self.c_path))
+
+    @contextmanager
+    def _client_session(self):
         if self.shared:
-            self._client = salt_local_client()
+            with salt_local_client_pool().borrow() as client:
+                yield client
         else:
-            self._client = LocalClient(c_path=str(self.c_path))
+            yield self._client
 
     @property
     def _cmd_args_t(self) -> Type[SaltArgsBase]:
@@ -132,7 +129,8 @@ class SaltLocalClient(SaltClientBase):
         return cmd_args
 
     def _run(self, cmd_args: SaltArgsBase):
-        return self._client.cmd(*cmd_args.args, **cmd_args.kwargs)
+        with self._client_session() as client:
+            return client.cmd(*cmd_args.args, **cmd_args.kwargs)
 
     def run(
         self,
@@ -156,4 +154,5 @@ class SaltLocalAsyncClient(SaltLocalClient):
         return SaltClientJIDResult
 
     def _run(self, cmd_args: SaltArgsBase):
-        return self._client.cmd_async(*cmd_args.args, **cmd_args.kwargs)
+        with self._client_session() as client:
+            return client.cmd_async(*cmd_args.args, **cmd_args.kwargs)
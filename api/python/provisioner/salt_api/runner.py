@@ -20,6 +20,7 @@ from salt.runner import RunnerClient
 from typing import (
     List, Dict, Any, Type, Union, Tuple, Optional
 )
+from contextlib import contextmanager
 import logging
 
 from .. import inputs
@@ -32,21 +33,11 @@ from .base import (
     SaltClientJIDResult
 )
 from .auth import _set_auth
+from ..salt import salt_runner_client_pool
 
 logger = logging.getLogger(__name__)
 
 
-_salt_runner_client = None
-
-
-def salt_runner_client():
-    global _salt_runner_client
-    if not _salt_runner_client:
-        __opts__ = salt.config.client_config('/etc/salt/master')
-        _salt_runner_client = RunnerClient(opts=__opts__)
-    return _salt_runner_client
-
-
 # TODO TEST
 @attr.s(auto_attribs=True)
 class SaltRunnerClientArgs(SaltArgsBase):
@@ -136,12 +127,19 @@ class SaltRunnerClient(SaltClientBase):
 
     def __attrs_post_init__(self):
         """Do post init."""
-        if self.shared:
-            self._client = salt_runner_client()
-        else:
+        # shared clients are borrowed from the pool per call
+        if not self.shared:
             __opts__ = salt.config.client_config(str(self.c_path))
             self._client = RunnerClient(opts=__opts__)
 
+    @contextmanager
+    def _client_session(self):
+        if self.shared:
+            with salt_runner_client_pool().borrow() as client:
+                yield client
+        else:
+            yield self._client
+
     @property
     def _cmd_args_t(self) -> Type[SaltArgsBase]:
         return SaltRunnerClientArgs
@@ -172,11 +170,12 @@ class SaltRunnerClient(SaltClientBase):
         return cmd_args
 
     def _run(self, cmd_args: SaltArgsBase):
-        if 'username' in cmd_args.kw:
-            low = dict(fun=cmd_args.fun, **cmd_args.kwargs)
-            return self._client.cmd_sync(low, full_return=True)
-        else:
-            return self._client.cmd(*cmd_args.args, **cmd_args.kwargs)
+        with self._client_session() as client:
+            if 'username' in cmd_args.kw:
+                low = dict(fun=cmd_args.fun, **cmd_args.kwargs)
+                return client.cmd_sync(low, full_return=True)
+            else:
+                return client.cmd(*cmd_args.args, **cmd_args.kwargs)
 
     def _fun_fun(
         self,
@@ -194,12 +193,6 @@ class SaltRunnerClient(SaltClientBase):
 @attr.s(auto_attribs=True)
 class SaltRunnerAsyncClient(SaltRunnerClient):
 
-    def __attrs_post_init__(self):
-        """Do post init."""
-        raise NotImplementedError(
-            'async calls for RunnerClient are not supported yet'
-        )
-
     @property
     def _salt_client_res_t(self) -> Type[SaltClientResultBase]:
         return SaltClientJIDResult
@@ -217,14 +210,19 @@ class SaltRunnerAsyncClient(SaltRunnerClient):
             fun, fun_args, fun_kwargs, secure, **kwargs
         )
 
-        if 'username' not in cmd_args.kw:
-            raise NotImplementedError(
-                'async calls without external auth for RunnerClient'
-                ' are not supported yet'
-            )
+        # sync only options
+        cmd_args.kw.pop('print_event', None)
+        cmd_args.kw.pop('full_return', None)
 
         return cmd_args
 
     def _run(self, cmd_args: SaltArgsBase):
+        # Note. the runner is executed in a detached process,
+        #       its return is stored in the master job cache
         low = dict(fun=cmd_args.fun, **cmd_args.kwargs)
-        return salt_runner_client().cmd_async(low, full_return=True)
+        with self._client_session() as client:
+            if 'username' in cmd_args.kw:
+                res = client.cmd_async(low)
+            else:
+                res = client.asynchronous(cmd_args.fun, low)
+        return res.get('jid') if isinstance(res, dict) else res
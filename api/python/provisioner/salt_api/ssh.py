@@ -25,7 +25,7 @@ import logging
 
 from .. import inputs, config
 from ..vendor import attr
-from ..ssh import copy_id
+from ..ssh import copy_id, SSHControlMaster
 from .. import utils
 from ..errors import (
     SaltCmdResultError
@@ -303,6 +303,8 @@ class SaltSSHClient(SaltClientBase):
         }
     )
     re_config: bool = False
+    # shared ssh connections for the default roster hosts
+    control_master: Optional[SSHControlMaster] = None
 
     _client: SSHClient = attr.ib(init=False, default=None)
     _def_roster_data: Dict = attr.ib(init=False, default=attr.Factory(dict))
@@ -410,10 +412,19 @@ class SaltSSHClient(SaltClientBase):
         secure=False,
         **kwargs
     ):
+        # NOTE not for custom rosters (e.g. bootstrap ones) since
+        #      a connection authenticated with a different key
+        #      would be reused otherwise
+        shared_conn = (
+            self.control_master and kwargs.get('roster_file') is None
+        )
+
         for arg in ('roster_file', 'ssh_options', 'targets'):
             arg_v = kwargs.pop(arg, None)
             if arg_v is None:
                 arg_v = getattr(self, arg)
+            if arg == 'ssh_options' and shared_conn:
+                arg_v = self.control_master.ssh_options(arg_v)
             if arg_v:
                 kwargs[arg] = (
                     str(arg_v) if arg == 'roster_file' else arg_v
@@ -421,6 +432,18 @@ class SaltSSHClient(SaltClientBase):
 
         return super().run(fun, fun_args, fun_kwargs, secure, **kwargs)
 
+    def close(self):
+        """Closes shared ssh connections if any."""
+        if self.control_master:
+            self.control_master.close(
+                [
+                    (params.get('host'), params.get('user'),
+                     params.get('port'))
+                    for params in self._def_roster_data.values()
+                ],
+                self.ssh_options
+            )
+
     # TODO TEST EOS-8473
     def ensure_access(
         self, targets: Optional[List] = None, bootstrap_roster_file=None
@@ -15,15 +15,21 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
-from typing import Dict, List
+import os
+import salt.config
+import salt.utils.event
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import logging
-import functools
+import time
 
-
-from .config import ALL_MINIONS
+from .vendor import attr
+from .config import (
+    ALL_MINIONS,
+    SALT_MASTER_CONFIG_DEFAULT,
+    SALT_MINIONS_READY_TIMEOUT
+)
 from .errors import ProvisionerError
 from .salt import runner_function_run, StatesApplier, function_run
-from .utils import ensure
 
 logger = logging.getLogger(__name__)
 
@@ -51,11 +57,147 @@ def check_salt_minions_are_ready(targets: List):
     return not (set(targets) - set(ready))
 
 
-def ensure_salt_minions_are_ready(targets: List):
-    ensure(
-        functools.partial(check_salt_minions_are_ready, targets),
-        tries=20, wait=30
-    )
+@attr.s(auto_attribs=True)
+class MinionPresenceTracker:
+    """Tracks minions connections using the master event bus.
+
+    Minions are considered connected once they are seen by ``manage.up``
+    or reported by start, auth or presence events (the latter requires
+    ``presence_events`` to be enabled for the salt-master), so waiting
+    for minions ends as soon as they are back rather than
+    on a next poll.
+    """
+    c_path: str = SALT_MASTER_CONFIG_DEFAULT
+    # how often (in seconds) to re-check minions using manage.up
+    poll_interval: float = 10
+
+    _opts: Optional[Dict] = attr.ib(init=False, default=None)
+
+    @property
+    def opts(self) -> Dict:
+        if self._opts is None:
+            self._opts = salt.config.client_config(self.c_path)
+        return self._opts
+
+    @property
+    def available(self) -> bool:
+        # the master event bus is accessible by privileged users only
+        return os.access(self.opts['sock_dir'], os.R_OK | os.X_OK)
+
+    @staticmethod
+    def parse_event(event: Dict) -> Tuple[Set[str], Set[str]]:
+        """Returns ids of minions that are connected and lost."""
+        tag = event.get('tag', '')
+        data = event.get('data') or {}
+
+        if tag in ('minion_start', 'salt/auth') or (
+            tag.startswith('salt/minion/') and tag.endswith('/start')
+        ):
+            if tag == 'salt/auth' and (
+                data.get('act') != 'accept' or not data.get('result', True)
+            ):
+                return set(), set()
+            return ({data['id']} if data.get('id') else set()), set()
+        elif tag == 'salt/presence/present':
+            return set(data.get('present', [])), set()
+        elif tag == 'salt/presence/change':
+            return set(data.get('new', [])), set(data.get('lost', []))
+        else:
+            return set(), set()
+
+    def _poll(self, targets: Set[str], deadline: Optional[float]) -> bool:
+        while True:
+            if not (targets - set(list_minions())):
+                return True
+
+            wait = self.poll_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            time.sleep(wait)
+
+    def wait_for_minions(
+        self, targets: Iterable[str], timeout: Optional[float] = None
+    ) -> bool:
+        """Waits for the minions to connect.
+
+        :param targets: minions ids
+        :param timeout: (optional) time in seconds to wait for,
+            waits infinitely by default
+        :return: ``True`` if all minions are connected, ``False`` otherwise
+        """
+        targets = set(targets)
+        if not targets:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not self.available:
+            logger.debug(
+                'master event bus is not available, falling back to polling'
+            )
+            return self._poll(targets, deadline)
+
+        event = salt.utils.event.get_master_event(
+            self.opts, self.opts['sock_dir'], listen=True
+        )
+        try:
+            # Note. minions are checked after the subscription
+            #       to not miss connections that come meanwhile
+            present = set()
+            next_check = time.monotonic()
+            while True:
+                now = time.monotonic()
+                if now >= next_check:
+                    present.update(list_minions())
+                    next_check = now + self.poll_interval
+
+                missed = targets - present
+                if not missed:
+                    return True
+
+                wait = next_check - now
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                    if wait <= 0:
+                        return False
+
+                logger.debug(
+                    'waiting for minions %s up to %.1f seconds', missed, wait
+                )
+                data = event.get_event(wait=wait, full=True)
+                if data:
+                    connected, lost = self.parse_event(data)
+                    present.difference_update(lost)
+                    present.update(connected)
+        finally:
+            event.destroy()
+
+
+_minion_presence_tracker = None
+
+
+def minion_presence_tracker() -> MinionPresenceTracker:
+    global _minion_presence_tracker
+    if not _minion_presence_tracker:
+        _minion_presence_tracker = MinionPresenceTracker()
+    return _minion_presence_tracker
+
+
+def wait_for_minions(
+    targets: Iterable[str], timeout: Optional[float] = None
+) -> bool:
+    return minion_presence_tracker().wait_for_minions(targets, timeout)
+
+
+def ensure_salt_minions_are_ready(
+    targets: List, timeout: float = SALT_MINIONS_READY_TIMEOUT
+):
+    if not wait_for_minions(targets, timeout):
+        raise ProvisionerError(
+            f'minions {targets} are not ready in {timeout} seconds'
+        )
 
 # FIXME
 # 1) slat-minion might start even with malformed config
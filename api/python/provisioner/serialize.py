@@ -17,11 +17,17 @@
 
 import json
 import functools
-from typing import Any
+from typing import Any, Callable, Dict, Tuple
 from importlib import import_module
 
 from .errors import PrvsnrTypeDecodeError
 
+# optional faster backend, used for payloads without provisioner types
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 PRVSNR_TYPE_ATTR = '_prvsnr_type_'
 TO_ARGS_METHOD = 'to_args'
@@ -31,10 +37,19 @@ PRVSNR_TYPE_KEY = PRVSNR_TYPE_ATTR
 PRVSNR_ARGS_KEY = 'args'
 PRVSNR_KWARGS_KEY = 'kwargs'
 
+# (module name, class name) -> class
+_types: Dict[Tuple[str, str], type] = {}
+# class -> callable returning (args, kwargs) for an object
+_encoders: Dict[type, Callable] = {}
+
 
 class PrvsnrType:
     _prvsnr_type_ = True
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        register_type(cls)
+
     def to_args(self) -> Any:
         return self.to_args_default(self)
 
@@ -57,6 +72,33 @@ class PrvsnrType:
         return cls(*args, **kwargs)
 
 
+def register_type(cls: type) -> type:
+    _types[(cls.__module__, cls.__name__)] = cls
+    return cls
+
+
+def resolve_type(m_name: str, cls_name: str) -> type:
+    try:
+        return _types[(m_name, cls_name)]
+    except KeyError:
+        cls = getattr(import_module(m_name), cls_name)
+        # Note. only successfully resolved types are remembered
+        _types[(m_name, cls_name)] = cls
+        return cls
+
+
+def _encoder(cls: type) -> Callable:
+    try:
+        return _encoders[cls]
+    except KeyError:
+        if hasattr(cls, PRVSNR_TYPE_ATTR):
+            res = getattr(cls, TO_ARGS_METHOD, PrvsnrType.to_args_default)
+        else:  # BaseException
+            res = PrvsnrType.to_args_default
+        _encoders[cls] = res
+        return res
+
+
 # TODO DOC works on for classes defined in the top level of a module
 # TODO explore how pickle iplements similar logic
 #      https://docs.python.org/3.6/library/pickle.html#what-can-be-pickled-and-unpickled
@@ -66,14 +108,7 @@ class PrvsnrJSONEncoder(json.JSONEncoder):
             try:
                 cls = type(obj)
                 res = {PRVSNR_TYPE_KEY: [cls.__module__, cls.__name__]}
-
-                if hasattr(obj, PRVSNR_TYPE_ATTR):
-                    args, kwargs = getattr(
-                        obj, TO_ARGS_METHOD,
-                        functools.partial(PrvsnrType.to_args_default, obj)
-                    )()
-                else:  # BaseException
-                    args, kwargs = PrvsnrType.to_args_default(obj)
+                args, kwargs = _encoder(cls)(obj)
 
                 if args:
                     res[PRVSNR_ARGS_KEY] = args
@@ -94,7 +129,7 @@ class PrvsnrJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def json_prvsnr_type_hook(dct, strict=True):
+def json_prvsnr_type_hook(dct, strict=True, errors=None):
     prvsnr_type = dct.get(PRVSNR_TYPE_KEY, None)
     if prvsnr_type:
         try:
@@ -107,8 +142,7 @@ def json_prvsnr_type_hook(dct, strict=True):
                     .format(PRVSNR_TYPE_KEY, prvsnr_type)
                 )
 
-            module = import_module(m_name)
-            cls = getattr(module, cls_name)
+            cls = resolve_type(m_name, cls_name)
             args = dct.get(PRVSNR_ARGS_KEY, ())
             kwargs = dct.get(PRVSNR_KWARGS_KEY, {})
             return getattr(
@@ -118,12 +152,36 @@ def json_prvsnr_type_hook(dct, strict=True):
         except Exception as exc:
             if strict:
                 raise PrvsnrTypeDecodeError(dct, exc)
+            elif errors is not None:
+                errors.append(PrvsnrTypeDecodeError(dct, exc))
     return dct
 
 
-def loads(s, strict=True, *args, **kwargs):
+def _has_prvsnr_types(s) -> bool:
+    key = PRVSNR_TYPE_KEY
+    if isinstance(s, (bytes, bytearray)):
+        key = key.encode()
+    return key in s
+
+
+def loads(s, strict=True, *args, errors=None, **kwargs):
+    """Decode JSON restoring provisioner types.
+
+    In non-strict mode undecodable objects are returned as is, related
+    decode errors are appended to `errors` list if it is provided.
+    """
+    if not (args or kwargs or _has_prvsnr_types(s)):
+        # no object hook is needed, so C level parsing is enough
+        if orjson is not None:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # e.g. NaN or big integers, let json decide
+                pass
+        return json.loads(s)
+
     kwargs['object_hook'] = functools.partial(
-        json_prvsnr_type_hook, strict=strict
+        json_prvsnr_type_hook, strict=strict, errors=errors
     )
     return json.loads(s, *args, **kwargs)
 
@@ -17,14 +17,23 @@
 
 import logging
 import os
+import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Union
+from typing import Union, Optional, List, Iterable, Tuple
 from getpass import getpass
 
+from .vendor import attr
+from .config import SSH_CONTROL_PERSIST
+from .errors import SubprocessCmdError
 from .utils import run_subprocess_cmd
 
 logger = logging.getLogger(__name__)
 
+# interactive prompts should not interleave
+_prompt_lock = threading.Lock()
+
 
 # TODO TEST EOS-8473
 def keygen(
@@ -71,9 +80,93 @@ def copy_id(
     if os.getenv("SSHPASS"):
         cmd = (['sshpass', '-e'] + cmd)
     else:
-        password = getpass(prompt=f"Enter {user} user password for {target}:")
+        with _prompt_lock:
+            password = getpass(
+                prompt=f"Enter {user} user password for {target}:"
+            )
         cmd = (['sshpass', '-p', password] + cmd)
 
     logger.info("Copying keys for ssh password-less connectivity.")
     logger.debug(f"Command: {cmd}")
     run_subprocess_cmd(cmd)
+
+
+# TODO TEST EOS-8473
+@attr.s(auto_attribs=True)
+class SSHControlMaster:
+    """Multiplexed ssh connections (OpenSSH ControlMaster).
+
+    A master connection to a host is established by the first ssh
+    session and reused by the following ones until it is closed
+    or stays idle for ``persist`` seconds.
+
+    Explicitly passed ``Control*`` ssh options take precedence,
+    e.g. ``ControlMaster=no`` turns multiplexing off.
+    """
+    persist: int = SSH_CONTROL_PERSIST
+    control_dir: Optional[Path] = None
+
+    _own_dir: bool = attr.ib(init=False, default=False)
+
+    @staticmethod
+    def _opts_dict(ssh_options: Iterable[str]):
+        return {
+            opt.split('=', 1)[0].strip().lower(): opt.split('=', 1)[-1]
+            for opt in ssh_options
+        }
+
+    def _control_dir(self) -> Path:
+        if self.control_dir is None:
+            # NOTE a short path since unix socket paths are limited
+            self.control_dir = Path(tempfile.mkdtemp(prefix='prvsnr-ssh-'))
+            self._own_dir = True
+        return self.control_dir
+
+    def ssh_options(self, ssh_options: Optional[List[str]] = None):
+        ssh_options = list(ssh_options or [])
+        opts = self._opts_dict(ssh_options)
+
+        if opts.get('controlmaster', '').strip().lower() == 'no':
+            return ssh_options
+
+        defaults = [
+            ('controlmaster', 'ControlMaster=auto'),
+            # %C - a hash of local host, host, port and user
+            ('controlpath', f'ControlPath={self._control_dir()}/%C'),
+            ('controlpersist', f'ControlPersist={self.persist}')
+        ]
+        return ssh_options + [
+            opt for key, opt in defaults if key not in opts
+        ]
+
+    def close(
+        self,
+        hosts: Iterable[Tuple[str, Optional[str], Optional[int]]],
+        ssh_options: Optional[List[str]] = None
+    ):
+        """Closes master connections to the hosts.
+
+        :param hosts: hosts as (host, user, port) tuples
+        :param ssh_options: ssh options the connections were made with
+        """
+        if self.control_dir is None:
+            return
+
+        for host, user, port in hosts:
+            cmd = ['ssh', '-O', 'exit']
+            for opt in self.ssh_options(ssh_options):
+                cmd.extend(['-o', opt])
+            if port:
+                cmd.extend(['-p', str(port)])
+            cmd.append(f"{user}@{host}" if user else f"{host}")
+
+            try:
+                # no master for a host is not an error
+                run_subprocess_cmd(cmd, check=False)
+            except SubprocessCmdError:
+                logger.warning(f"Failed to close ssh connection to {host}")
+
+        if self._own_dir:
+            shutil.rmtree(str(self.control_dir), ignore_errors=True)
+            self.control_dir = None
+            self._own_dir = False
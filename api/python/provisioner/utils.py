@@ -23,24 +23,29 @@ from typing import (
     Type,
     Any,
     Callable,
+    Iterable,
     Iterator,
     BinaryIO
 )
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import configparser
 import json
 import logging
+import marshal
+import os
 import random
 import subprocess
 import time
 import string
+import tempfile
 from shlex import quote
-from pathlib import Path, PosixPath
-import yaml
+from pprint import pformat
+from pathlib import Path
 from packaging.version import Version
 from provisioner.config import RELEASE_DELIMITERS
 
-from . import config
+from . import config, yaml_codec
 
 from .errors import (
     BadPillarDataError, SubprocessCmdError, NoMoreTriesError
@@ -177,7 +182,7 @@ def validator__subclass_of(
 
 
 def load_yaml_str(data):
-    return yaml.safe_load(data)
+    return yaml_codec.loads(data)
 
 
 def dump_yaml_str(
@@ -188,24 +193,7 @@ def dump_yaml_str(
     canonical=False,
     **kwargs
 ):
-    # TODO: Either check if this is the right way to accomplish this
-    # Or we should work to use a add_constructor
-    def posix_path_representer(dumper_obj, posix_path_obj):
-        return dumper_obj.represent_scalar(
-            "tag:yaml.org,2002:str",
-            str(posix_path_obj)
-        )
-    yaml.add_representer(PosixPath, posix_path_representer)
-
-    # return yaml.safe_dump(
-    #     data,
-    #     default_flow_style=default_flow_style,
-    #     canonical=canonical,
-    #     width=width,
-    #     indent=indent,
-    #     **kwargs
-    # )
-    return yaml.dump(
+    return yaml_codec.dumps(
         data,
         default_flow_style=default_flow_style,
         canonical=canonical,
@@ -221,6 +209,50 @@ def load_yaml(path):
     return load_yaml_str(path.read_text())
 
 
+def load_yaml_cached(path, cache_dir=None):
+    """Loads yaml file using its compiled (marshal) copy if it is actual.
+
+    The copy is keyed by the source path, size and mtime and is
+    (re)built on a miss. Any cache failure falls back to yaml parsing.
+
+    Only the raw yaml data is cached: the processed specs hold
+    classes and callables that marshal can't store.
+    """
+    path = Path(str(path)).resolve()
+    if cache_dir is None:
+        cache_dir = config.SPEC_CACHE_DIR
+    cache_dir = Path(str(cache_dir))
+
+    stat = path.stat()
+    key = (
+        str(path), stat.st_size, stat.st_mtime_ns, marshal.version
+    )
+    cache_path = cache_dir / '{}.{}.marshal'.format(
+        path.name, hashlib.md5(str(path).encode()).hexdigest()[:8]
+    )
+
+    try:
+        cached_key, data = marshal.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.debug(f"Broken spec cache '{cache_path}': {exc!r}")
+    else:
+        if cached_key == key:
+            return data
+
+    data = load_yaml(path)
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_bytes_atomic(cache_path, marshal.dumps((key, data)), mode=0o600)
+    except (OSError, ValueError) as exc:
+        # e.g. read-only home or not marshallable data
+        logger.debug(f"Failed to cache spec '{path}': {exc!r}")
+
+    return data
+
+
 def load_json_str(data: str):
     """
     JSON load helper. Loads JSON from a string
@@ -269,6 +301,47 @@ def dump_yaml(path, data, **kwargs):
     path.write_text(dump_yaml_str(data, **kwargs))
 
 
+def _write_atomic(path, data, open_mode: str, mode: Optional[int] = None):
+    path = Path(str(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, open_mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is None:
+            try:
+                mode = path.stat().st_mode & 0o777
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_text_atomic(path, text: str, mode: Optional[int] = None):
+    """Writes a file using a temporary file and rename.
+
+    So readers never see a partially written content. Permissions
+    of already existent file are preserved unless ``mode`` is specified.
+    """
+    _write_atomic(path, text, 'w', mode=mode)
+
+
+def write_bytes_atomic(path, data: bytes, mode: Optional[int] = None):
+    """Binary version of `write_text_atomic`."""
+    _write_atomic(path, data, 'wb', mode=mode)
+
+
 def quote_shell_cmd(cmd: List):
     return [quote(p) for p in cmd]
 
@@ -316,6 +389,60 @@ def ensure(  # noqa: C901 FIXME
                 raise NoMoreTriesError(f'no more tries for {name}')
 
 
+class LazyStr:
+    """A string presentation that is built on demand.
+
+    Intended to be passed as a logging argument, e.g.
+    ``logger.debug("result: %s", LazyStr(pformat, res))``,
+    so the formatting is skipped if the record is not emitted.
+    """
+    __slots__ = ('_fun', '_args')
+
+    def __init__(self, fun: Callable, *args):
+        self._fun = fun
+        self._args = args
+
+    def __str__(self):
+        return str(self._fun(*self._args))
+
+
+def lazy_pformat(obj) -> LazyStr:
+    return LazyStr(pformat, obj)
+
+
+def run_parallel(
+    fun: Callable, args: Iterable, max_workers: Optional[int] = None
+) -> List:
+    """Calls ``fun`` for each of ``args`` using a pool of threads.
+
+    Results are returned in order of ``args``. All the calls are waited
+    for, the first (in order of ``args``) error is raised if any.
+    """
+    args = list(args)
+    if len(args) < 2 or (max_workers is not None and max_workers < 2):
+        return [fun(arg) for arg in args]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers or len(args), len(args))
+    ) as executor:
+        futures = [executor.submit(fun, arg) for arg in args]
+
+    res = []
+    exc = None
+    for arg, future in zip(args, futures):
+        try:
+            res.append(future.result())
+        except Exception as _exc:
+            logger.error(f"Call of {fun} for {arg} failed: {_exc!r}")
+            if exc is None:
+                exc = _exc
+
+    if exc is not None:
+        raise exc
+
+    return res
+
+
 def run_subprocess_cmd(cmd, check=True, **kwargs):
     _kwargs = dict(
         universal_newlines=True,
@@ -419,7 +546,7 @@ def node_hostname_validator(
 
     logger.debug(
         "Validating list of nodes: "
-        f"{yaml.dump(node_dict, default_flow_style=False)}"
+        f"{yaml_codec.dumps(node_dict)}"
     )
     logger.debug(f"Config file path: {config_path}")
 
@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""YAML load / dump helpers backed by libyaml when it is available."""
+
+from pathlib import PosixPath
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader, CDumper as _Dumper
+    LIBYAML = True
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, Dumper as _Dumper
+    LIBYAML = False
+
+
+class Loader(_SafeLoader):
+    pass
+
+
+class Dumper(_Dumper):
+    pass
+
+
+def _posix_path_representer(dumper, path):
+    return dumper.represent_scalar("tag:yaml.org,2002:str", str(path))
+
+
+# registered once on the dedicated class, yaml.Dumper is left intact
+Dumper.add_representer(PosixPath, _posix_path_representer)
+
+
+def loads(data):
+    return yaml.load(data, Loader=Loader)
+
+
+# Note. defaults match yaml.dump ones, pillar specific formatting
+#       (width, indent) is set by the callers
+def dumps(data, default_flow_style=False, canonical=False, **kwargs):
+    return yaml.dump(
+        data,
+        Dumper=Dumper,
+        default_flow_style=default_flow_style,
+        canonical=canonical,
+        **kwargs
+    )
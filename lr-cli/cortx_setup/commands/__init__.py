@@ -15,80 +15,40 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
-from .hostname import Hostname
-from .confstore import PrepareConfstore
-from .pillar_sync import PillarSync
-from .salt_cleanup import SaltCleanup
-from .network.config import NetworkConfig
-from .node.initialize import NodeInitialize
-from .node.prepare.server import NodePrepareServer
-from .node.finalize import NodeFinalize
-from .node.prepare.finalize import NodePrepareFinalize
-from .cluster.create import ClusterCreate
-from .cluster.encrypt import EncryptSecrets
-from .cluster.generate import GenerateCluster
-from .cluster.show import ClusterShow
-from .cluster.prepare import ClusterPrepare
-from .cluster.config.component import ClusterConfigComponent
-from .security.config import SecurityConfig
-from .resource.show import ResourceShow
-from .resource.discover import ResourceDiscover
-from .node.prepare.firewall import NodePrepareFirewall
-from .node.prepare.network import NodePrepareNetwork
-from .node.prepare.time import NodePrepareTime
-from .node.prepare.storage import NodePrepareStorage
-from .server.config import ServerConfig
-from .signature.get import GetSignature
-from .signature.set import SetSignature
-from .storage.config import StorageEnclosureConfig
-from .storage.commons import Commons
-from .storageset.create import CreateStorageSet
-from .storageset.add.node import AddServerNode
-from .storageset.add.enclosure import AddStorageEnclosure
-from .storageset.config.durability import DurabilityConfig
-from .enclosure.refresh import RefreshEnclosureId
-from .config.set import SetConfiguration
-from .config.get import GetConfiguration
-from .cluster.start import ClusterStart
-from .cluster.status import ClusterStatus
-from .cluster.reset import ClusterResetNode
+# Note. command modules are not imported here on purpose,
+#       they are resolved on demand by the CLI (see api_spec.yaml)
 
-__all__ = [
-    'AddServerNode',
-    'AddStorageEnclosure',
-    'Commons',
-    'ClusterCreate',
-    'ClusterPrepare',
-    'ClusterConfigComponent',
-    'ClusterShow',
-    'CreateStorageSet',
-    'DurabilityConfig',
-    'EncryptSecrets',
-    'NodePrepareFinalize',
-    'GenerateCluster',
-    'GetSignature',
-    'Hostname',
-    'NetworkConfig',
-    'NodeInitialize',
-    'NodeFinalize',
-    'NodePrepareFirewall',
-    'NodePrepareNetwork',
-    'NodePrepareServer',
-    'NodePrepareTime',
-    'NodePrepareStorage',
-    'RefreshEnclosureId',
-    'ResourceShow',
-    'ResourceDiscover',
-    'SecurityConfig',
-    'ServerConfig',
-    'SetSignature',
-    'StorageEnclosureConfig',
-    'SaltCleanup',
-    'PrepareConfstore',
-    'PillarSync',
-    'SetConfiguration',
-    'GetConfiguration',
-    'ClusterStart',
-    'ClusterStatus',
-    'ClusterResetNode'
- ]
+from importlib import import_module
+
+
+def get_command(cmd_path: str):
+    """Returns a command class by its '<module>.<Class>' path.
+
+    Raises ValueError if the path doesn't point to a command class.
+    """
+    mod_path, _, cls_name = cmd_path.rpartition('.')
+    if not (mod_path and cls_name):
+        raise ValueError(
+            f"Invalid command '{cmd_path}': '<module>.<Class>' is expected"
+        )
+
+    mod_name = f'{__name__}.{mod_path}'
+    try:
+        mod = import_module(mod_name)
+    except ModuleNotFoundError as exc:
+        # missing dependencies of the command module are not masked
+        if not (
+            exc.name == mod_name or mod_name.startswith(f'{exc.name}.')
+        ):
+            raise
+        raise ValueError(
+            f"Invalid command '{cmd_path}': no module '{mod_name}'"
+        ) from None
+
+    cls = getattr(mod, cls_name, None)
+    if not isinstance(cls, type):
+        raise ValueError(
+            f"Invalid command '{cmd_path}': "
+            f"no class '{cls_name}' in '{mod_name}'"
+        )
+    return cls
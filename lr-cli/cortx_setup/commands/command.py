@@ -33,8 +33,9 @@ class Command(object):
         parent_dir = config.CONFSTORE_CLUSTER_FILE.parent
         parent_dir.mkdir(parents=True, exist_ok=True)
 
-    def get_args(self):
-        return self._args
+    @classmethod
+    def get_args(cls):
+        return cls._args
 
     def load_conf_store(self, index, path):
         try:
@@ -19,9 +19,10 @@ import json
 from provisioner.salt import (
     cmd_run,
     local_minion_id,
-    function_run
+    grains_get
 )
 from provisioner.commands import reset_machine_id
+from provisioner.config import LOCAL_MINION
 from cortx.utils.security.cipher import Cipher
 from provisioner.pillar import (
     PillarResolver,
@@ -41,7 +42,9 @@ def get_pillar_data(key: str):
 
     """
     pillar_key = PillarKey(key)
-    pillar = PillarResolver(local_minion_id(), local=True).get([pillar_key])
+    # Note. targets are not matched for local pillar, so the local
+    #       minion id is not resolved (that requires a salt caller)
+    pillar = PillarResolver(LOCAL_MINION, local=True).get([pillar_key])
     pillar = next(iter(pillar.values()))
     return pillar[PillarKey(key)]
 
@@ -56,24 +59,43 @@ def get_machine_id(node: str):
         minion_id for the node
 
     """
-    machine_id = function_run('grains.get', fun_args=['machine_id'],
-                                targets=node)[f'{node}']
+    machine_id = grains_get('machine_id', targets=node)[f'{node}']
     if not machine_id:
         try:
             reset_machine_id.ResetMachineId().run()
-            get_machine_id(node)
+            machine_id = grains_get(
+                'machine_id', targets=node, refresh=True
+            )[f'{node}']
         except Exception as ex:
             raise ex
 
     return machine_id
 
 
+def get_machine_ids(nodes: list):
+    """
+    Get Machine_IDs for the list of nodes using a single salt call
+
+    Parameters
+    ----------
+    nodes: list
+        minion_ids of the nodes
+
+    """
+    machine_ids = grains_get('machine_id', targets=list(nodes))
+    for node in nodes:
+        if not machine_ids.get(node):
+            machine_ids[node] = get_machine_id(node)
+
+    return {node: machine_ids[node] for node in nodes}
+
+
 def get_cluster_id():
     """
     Get Cluster_id
 
     """
-    cluster_id = list(function_run('grains.get', fun_args=['cluster_id']).values())[0]
+    cluster_id = list(grains_get('cluster_id').values())[0]
 
     if not cluster_id:
         raise ValueError("cluster_id not set or missing")
@@ -91,8 +113,7 @@ def get_enclosure_id(node: str):
         minion_id for the node
 
     """
-    enclosure_id = function_run('grains.get', fun_args=['enclosure_id'],
-                                targets=node)[f'{node}']
+    enclosure_id = grains_get('enclosure_id', targets=node)[f'{node}']
     if not enclosure_id:
         raise ValueError("enclosure_id is not set or missing")
 
@@ -16,7 +16,7 @@
 #
 
 from cortx_setup.commands.command import Command
-from cortx_setup.commands import SaltCleanup
+from cortx_setup.commands.salt_cleanup import SaltCleanup
 
 
 class NodePrepareFinalize(Command):
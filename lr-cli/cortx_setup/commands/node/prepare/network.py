@@ -27,7 +27,9 @@ from provisioner import (
     set_public_data_network,
     set_private_data_network
 )
-from provisioner.salt import local_minion_id, function_run, StatesApplier
+from provisioner.salt import (
+    local_minion_id, function_run, grains_get, StatesApplier
+)
 from cortx.utils.conf_store import Conf
 from provisioner.commands import PillarSet
 
@@ -143,8 +145,7 @@ class NodePrepareNetwork(Command):
 
         if network_type is not None:
 
-            server_type = function_run('grains.get', fun_args=['virtual'],
-                                targets=node_id)[f'{node_id}']
+            server_type = grains_get('virtual', targets=node_id)[f'{node_id}']
             if not server_type:
                 raise Exception("server_type missing in grains")
             mtu = '1500' if server_type == 'virtual' or network_type == 'management' else '9000'
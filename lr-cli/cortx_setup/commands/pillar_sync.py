@@ -37,6 +37,7 @@ class PillarSync(Command):
             self.provisioner.auth_init(kwargs['username'], kwargs['password'])
 
         self.logger.debug("Updating pillar data")
+        pillar_items = {}
         for pillar in config.local_pillars:
             res_pillar = {}
             res = cmd_run(
@@ -53,10 +54,8 @@ class PillarSync(Command):
                     value[f'enclosure-{enc_num[1]}'] = value.pop('enclosure-0')
                 res_pillar.update(value)
             self.logger.info(f"Updating {pillar} pillar data")
-            self.provisioner.pillar_set(
-                f'{pillar}',
-                res_pillar
-            )
+            pillar_items[f'{pillar}'] = res_pillar
+        self.provisioner.pillar_set_many(pillar_items)
         conf_path = str(PRVSNR_FACTORY_PROFILE_DIR / 'confstore')
         # backup local consftore data
         self.logger.debug(f"Copy local confstore file to {conf_path}")
@@ -22,7 +22,7 @@ from cortx_setup.commands.command import Command
 from cortx_setup.config import CONFSTORE_CLUSTER_FILE
 from cortx_setup.commands.common_utils import (
     get_cluster_id,
-    get_machine_id,
+    get_machine_ids,
     get_pillar_data
 )
 
@@ -113,8 +113,8 @@ class AddServerNode(Command):
                 )
 
             # Get corresponding machine-id of each node
-            for node in server_node:
-                machine_id.append(get_machine_id(node))
+            machine_ids = get_machine_ids(server_node)
+            machine_id = [machine_ids[node] for node in server_node]
 
             self.logger.debug(
                 f"Adding machine_id '{machine_id}' to storage-set "
@@ -132,7 +132,7 @@ class AddServerNode(Command):
             )
 
             for node in server_node:
-                machine_id = get_machine_id(node)
+                machine_id = machine_ids[node]
                 self.logger.debug(
                     f"Adding storage set ID:{storage_set_name} to "
                     f"server {node} with machine id: {machine_id}"
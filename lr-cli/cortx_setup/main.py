@@ -15,6 +15,7 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import sys
 from pathlib import Path
 from .log import Log
 import argparse
@@ -23,17 +24,19 @@ from . import commands
 import json
 
 
-def handle_parser(subparsers, name, cls_name):
+def handle_parser(subparsers, name, cmd_path):
     parser = subparsers.add_parser(name)
-    cls = getattr(commands, cls_name)
-    args = cls().get_args()
+    cls = commands.get_command(cmd_path)
+    args = cls.get_args()
     for arg, value in args.items():
+        # Note. a copy, args are defined on a class level
+        value = dict(value)
         cmd = arg
         if value['optional']:
             cmd = "--"+arg
         value.pop('optional')
         parser.add_argument(cmd, **value)
-    parser.set_defaults(command=cls_name)
+    parser.set_defaults(command=cmd_path)
 
 
 def handle_sub_parser(subparsers, name):
@@ -41,12 +44,17 @@ def handle_sub_parser(subparsers, name):
     return parser
 
 
-def handle_apis(parser, apis):
+def handle_apis(parser, apis, argv):
+    # only the invoked command is resolved (its module is imported),
+    # others are added by name to be listed in the help
+    invoked = argv[0] if argv else None
     subparsers = parser.add_subparsers()
     for key, value in apis.items():
-        if isinstance(value, dict):
+        if key != invoked:
+            handle_sub_parser(subparsers, key)
+        elif isinstance(value, dict):
             new_parser = handle_sub_parser(subparsers, key)
-            handle_apis(new_parser, value)
+            handle_apis(new_parser, value, argv[1:])
         else:
             handle_parser(subparsers, key, value)
 
@@ -57,12 +65,12 @@ def main():
     pa = Path(parent / 'api_spec.yaml')
     apis = yaml.safe_load(pa.read_text())
     parser = argparse.ArgumentParser(prog='cortx_setup CLI ')
-    handle_apis(parser, apis)
+    handle_apis(parser, apis, sys.argv[1:])
 
     args = parser.parse_args()
     args = vars(args)
-    cls_name = args.pop('command')
-    cls = getattr(commands, cls_name)
+    cmd_path = args.pop('command')
+    cls = commands.get_command(cmd_path)
     try:
         result = cls().run(**args)
         if result:
@@ -43,6 +43,8 @@ def storage_device_config():
         node for node in provisioner.pillar_get("cluster").keys()
         if "srvnode-" in node
     ]
+    # all the nodes are updated at once with a single pillar refresh
+    updates = {}
     for node in server_nodes:
         cluster_dict = provisioner.pillar_get(f"cluster/{node}/roles", targets=node)
 
@@ -87,11 +89,14 @@ def storage_device_config():
         metadata_devices = list()
         metadata_devices.append(f"/dev/disk/by-id/dm-name-{device_list[0]}")
         metadata_field = f"cluster/{node}/storage/metadata_devices".format(node)
-        provisioner.pillar_set(metadata_field, metadata_devices)
 
         data_device = [f"/dev/disk/by-id/dm-name-{device}" for device in device_list[1:]]
         data_field = f"cluster/{node}/storage/data_devices"
-        provisioner.pillar_set(data_field, data_device)
+        updates[metadata_field] = metadata_devices
+        updates[data_field] = data_device
+
+    if updates:
+        provisioner.pillar_set_many(updates)
 
     if (len(provisioner.pillar_get("cluster/srvnode-1/storage/data_devices"))
         != len(provisioner.pillar_get("cluster/srvnode-2/storage/data_devices"))):
@@ -115,6 +120,8 @@ def jbod_storage_config():
     metadata_devices = ["/dev/disk/by-id/dm-name-{0}".format(_device_list[0])]
     data_device = ["/dev/disk/by-id/dm-name-{0}".format(device) for device in _device_list[1:]]
 
-    provisioner.pillar_set(_metadata_field, metadata_devices)
-    provisioner.pillar_set(_data_field, data_device)
+    provisioner.pillar_set_many({
+        _metadata_field: metadata_devices,
+        _data_field: data_device
+    })
     return True
@@ -25,7 +25,6 @@ import sys
 import logging
 import string
 import secrets
-import provisioner
 
 logging.basicConfig(format='%(levelname)s:%(message)s')
 logger = logging.getLogger(__name__)
@@ -37,7 +36,13 @@ def _import_cipher():
 
 
 def encrypt(decrypt=False):
+    """Encrypts (or decrypts) pillar secrets.
 
+    All the leaves with "secret" in a key name are processed in memory
+    and written to the pillar files at once with a single pillar refresh.
+    Already encrypted values are detected (they are decrypted
+    successfully) and left as is.
+    """
     logger.debug(f"encrypt called with decrypt={decrypt}")
 
     __pillar__ = getattr(sys.modules[__name__], '__pillar__')
@@ -45,55 +50,93 @@ def encrypt(decrypt=False):
     pillar_list = __pillar__.keys()
     cluster_id = getattr(sys.modules[__name__], '__grains__')['cluster_id']
     new_passwd = _generate_secret()
-    logger.debug(f"generated password for blank entries: {new_passwd}")
+    logger.debug("generated a password for blank entries")
 
+    updates = {}
     for pillar_name in pillar_list:
         logger.debug(f"processing pillar: {pillar_name}")
+        # the key is the same for all the secrets of a pillar section
         cipher_key = cipher.Cipher.generate_key(cluster_id, pillar_name)
         _update(
             __pillar__[pillar_name],
             pillar_name,
-            cluster_id,
             new_passwd,
             cipher,
             cipher_key,
-            decrypt
+            decrypt,
+            updates
         )
 
+    if updates:
+        _pillar_set_many(updates)
+
     return True
 
 
-def _update(data, path, cluster_id, new_passwd, cipher, cipher_key, decrypt):
+def get_keypaths(keypaths, delimiter='/'):
+    """Return pillar values for the keypaths only.
+
+    The pillar is rendered on the minion (as `pillar.items` does)
+    but only the requested subtrees are sent back.
+    Keypaths missed in the pillar are not listed in the result.
+    """
+    if isinstance(keypaths, str):
+        keypaths = [keypaths]
+
+    pillar = getattr(sys.modules[__name__], '__salt__')['pillar.items']()
+
+    res = {}
+    for keypath in keypaths:
+        value = pillar
+        try:
+            for key in str(keypath).strip(delimiter).split(delimiter):
+                value = value[key]
+        except (KeyError, TypeError):
+            continue
+        res[keypath] = value
 
+    return res
+
+
+def _update(data, path, new_passwd, cipher, cipher_key, decrypt, updates):
+    """Collects secrets updates (keypath -> value) for the pillar data."""
     for key, val in data.items():
-        logger.debug(f"Updating pillar {key}::{val}")
+        keypath = path + '/' + key
         if isinstance(val, dict):
-            data[key] = _update(val, path + '/' + key, cluster_id,
-                                new_passwd, cipher, cipher_key, decrypt)
-        else:
-            if ("secret" in key):
-                if not val:
-                    val = new_passwd
-
-                try:
-                    temp = cipher.Cipher.decrypt(
-                        cipher_key, val.encode("utf-8")).decode("utf-8")
-                    if decrypt:
-                        provisioner.pillar_set(path + '/' + key, temp)
-                except cipher.CipherInvalidToken:
-                    val = val.strip('\"')
-                    val = val.strip("\'")
-                    if decrypt:
-                        provisioner.pillar_set(path + '/' + key, val)
-                    else:
-                        logger.debug(
-                            f"Setting pillar {path + '/' + key} to {val}")
-                        provisioner.pillar_set(
-                            path + '/' + key,
-                            str(cipher.Cipher.encrypt(cipher_key,
-                                                      bytes(val, 'utf8')), 'utf-8')
-                        )
-    return True
+            _update(
+                val, keypath, new_passwd, cipher, cipher_key, decrypt, updates
+            )
+        elif "secret" in key:
+            if not val:
+                val = new_passwd
+
+            try:
+                temp = cipher.Cipher.decrypt(
+                    cipher_key, val.encode("utf-8")).decode("utf-8")
+                if decrypt:
+                    updates[keypath] = temp
+            except cipher.CipherInvalidToken:
+                val = val.strip('\"')
+                val = val.strip("\'")
+                if decrypt:
+                    updates[keypath] = val
+                else:
+                    logger.debug(f"Setting pillar {keypath}")
+                    updates[keypath] = str(
+                        cipher.Cipher.encrypt(cipher_key, bytes(val, 'utf8')),
+                        'utf-8'
+                    )
+    return updates
+
+
+def _pillar_set_many(updates):
+    """Updates the pillar files in-process with a single refresh."""
+    from provisioner.pillar import PillarIterable, PillarUpdater
+
+    logger.debug(f"Updating {len(updates)} pillar secrets")
+    pillar_updater = PillarUpdater()
+    pillar_updater.update(PillarIterable(updates))
+    pillar_updater.apply(rollback_on_error=True)
 
 
 def _generate_secret():
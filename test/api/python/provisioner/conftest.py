@@ -29,6 +29,16 @@ def unit():
     pass
 
 
+@pytest.fixture(autouse=True)
+def pillar_cache_invalidate(monkeypatch, tmpdir_function):
+    # rendered pillar is cached process wide and on disk for local mode
+    pillar.pillar_cache().invalidate()
+    monkeypatch.setattr(
+        pillar, '_pillar_snapshot',
+        pillar.PillarSnapshot(tmpdir_function / 'pillar_snapshot.json')
+    )
+
+
 @pytest.fixture
 def pillar_dir(monkeypatch, tmpdir_function):
     pillar_dir = tmpdir_function / 'pillar'
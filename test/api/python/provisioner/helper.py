@@ -15,13 +15,86 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import os
+import subprocess
+import sys
 from functools import partial
-from typing import Callable, Any, Tuple, Dict
+from pathlib import Path
+from typing import Callable, Any, Tuple, Dict, List, Set
+
+import yaml
+
+import provisioner
 from provisioner.vendor import attr
 
 # TODO consider to use mocks (e.g. pytest-mock plugin)
 
 
+PILLAR_SAMPLES_DIR = Path(__file__).resolve().parents[4] / 'pillar'
+
+
+def run_python(code: str, *args) -> subprocess.CompletedProcess:
+    """Runs python code in a fresh interpreter with provisioner importable."""
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(Path(provisioner.__file__).parents[1])]
+        + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else [])
+    )
+    return subprocess.run(
+        [sys.executable, *args, '-c', code],
+        env=env, check=True, universal_newlines=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+
+def run_cli(*argv, python_args=()) -> Tuple[subprocess.CompletedProcess, Set]:
+    """Runs provisioner CLI as `python -m provisioner` does.
+
+    Returns the process and all the modules loaded by the end
+    of the CLI run (the exit status is not checked).
+    """
+    code = (
+        'import runpy, sys\n'
+        f'sys.argv = {["provisioner", *argv]!r}\n'
+        'try:\n'
+        "    runpy.run_module('provisioner', run_name='__main__')\n"
+        'except SystemExit:\n'
+        '    pass\n'
+        "print('\\nMODULES:', ' '.join(sorted(sys.modules)))\n"
+    )
+    res = run_python(code, *python_args)
+    modules = res.stdout.rsplit('MODULES:', 1)[1].split()
+    return res, set(modules)
+
+
+def importtime_summary(stderr: str, top: int = 10) -> List[Tuple[str, int]]:
+    """Parses `python -X importtime` output.
+
+    Returns `top` modules with the largest cumulative import time (us).
+    """
+    res = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, module = line.split('|')
+        try:
+            res.append((module.strip(), int(cumulative)))
+        except ValueError:  # header
+            continue
+    return sorted(res, key=lambda item: item[1], reverse=True)[:top]
+
+
+def pillar_samples() -> Dict[Path, Any]:
+    res = {}
+    for path in sorted(PILLAR_SAMPLES_DIR.glob('**/*.sls')):
+        try:
+            res[path] = yaml.safe_load(path.read_text())
+        except yaml.YAMLError:
+            # jinja templated ones
+            continue
+    return res
+
+
 @attr.s(auto_attribs=True)
 class MockRes:
     key: str
@@ -0,0 +1,334 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Simulated salt backend.
+
+Fakes for salt python clients (``LocalClient``, ``RunnerClient``
+and ``Caller``) that simulate a number of minions with configurable
+latency, returns sizes and failure rates. Intended to measure
+provisioner side overhead without a real cluster, e.g.::
+
+    sim = SaltSimulator(minions_num=3, latency=0.01)
+    sim.plug(monkeypatch)
+    salt.function_run('test.ping')
+"""
+
+from copy import deepcopy
+import itertools
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import salt.utils.data
+
+from provisioner import salt as prvsnr_salt
+from provisioner.config import ALL_MINIONS
+from provisioner.vendor import attr
+
+
+def _state_ret(state, result=True, comment=''):
+    return {
+        f'sim_|-{state}_|-{state}_|-apply': {
+            'result': result,
+            'comment': comment,
+            'changes': {},
+            '__run_num__': 0
+        }
+    }
+
+
+def _traverse(data, key, default=''):
+    return salt.utils.data.traverse_dict_and_list(
+        data, key, default, delimiter=':'
+    )
+
+
+DEFAULT_FUNS = {
+    'test.ping': lambda sim, minion: True,
+    'pillar.items': lambda sim, minion: deepcopy(sim.pillar),
+    'pillar.get': (
+        lambda sim, minion, key, default='', **kwargs:
+        deepcopy(_traverse(sim.pillar, key, default))
+    ),
+    'pillar_ops.get_keypaths': (
+        lambda sim, minion, keypaths, **kwargs: {
+            keypath: deepcopy(_traverse(sim.pillar, keypath.replace('/', ':')))
+            for keypath in keypaths
+        }
+    ),
+    'grains.items': lambda sim, minion: sim.minion_grains(minion),
+    'grains.get': (
+        lambda sim, minion, key, default='', **kwargs:
+        _traverse(sim.minion_grains(minion), key, default)
+    ),
+    'state.apply': lambda sim, minion, state=None, **kwargs: _state_ret(state),
+    'state.sls': lambda sim, minion, state=None, **kwargs: _state_ret(state),
+    'state.single': (
+        lambda sim, minion, fun=None, *args, **kwargs: _state_ret(fun)
+    ),
+    'state.sls_exists': lambda sim, minion, state, **kwargs: True,
+    'cmd.run': lambda sim, minion, *args, **kwargs: '',
+}
+
+DEFAULT_RUNNERS = {
+    'manage.up': lambda sim, *args, **kwargs: list(sim.minion_ids),
+    'fileserver.clear_file_list_cache': lambda sim, *args, **kwargs: {},
+}
+
+
+class SimTargetResolver(prvsnr_salt.SaltTargetResolver):
+    """Matches targets against the simulated minions."""
+
+    def __init__(self, sim: 'SaltSimulator'):
+        super().__init__()
+        self.sim = sim
+
+    def minions(self) -> List[str]:
+        return list(self.sim.minion_ids)
+
+    def grains(self, minion: str) -> Dict:
+        return self.sim.minion_grains(minion)
+
+
+@attr.s(auto_attribs=True)
+class SaltSimulator:
+    minions_num: int = 3
+    # seconds per salt call
+    latency: float = 0
+    # size (in bytes) of a padding added to each minion's return
+    ret_size: int = 0
+    # a share of minions returns that fail
+    failure_rate: float = 0
+    seed: Optional[int] = 0
+    pillar: Dict = attr.Factory(dict)
+    grains: Dict = attr.Factory(dict)
+    # custom execution / runner functions: fun -> callable(sim, minion, ...)
+    funs: Dict[str, Callable] = attr.Factory(dict)
+    runners: Dict[str, Callable] = attr.Factory(dict)
+
+    calls: List = attr.ib(init=False, default=attr.Factory(list))
+    jobs: Dict = attr.ib(init=False, default=attr.Factory(dict))
+    _random: Any = attr.ib(init=False, default=None)
+    _jids: Any = attr.ib(init=False, default=None)
+    _resolver: Any = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self):
+        self._random = random.Random(self.seed)
+        self._jids = itertools.count(20201010101010000000)
+        self._resolver = SimTargetResolver(self)
+
+    @property
+    def minion_ids(self) -> List[str]:
+        return [f'srvnode-{idx}' for idx in range(1, self.minions_num + 1)]
+
+    @property
+    def local_minion_id(self) -> str:
+        return self.minion_ids[0]
+
+    @property
+    def target_resolver(self) -> SimTargetResolver:
+        return self._resolver
+
+    def minion_grains(self, minion: str) -> Dict:
+        return dict(deepcopy(self.grains), id=minion)
+
+    def new_jid(self) -> str:
+        return str(next(self._jids))
+
+    def match(self, targets, tgt_type='glob') -> List[str]:
+        return self._resolver.resolve(targets, tgt_type)
+
+    def _padded(self, ret):
+        if not self.ret_size:
+            return ret
+        padding = 'x' * self.ret_size
+        if isinstance(ret, dict):
+            return dict(ret, sim_padding=padding)
+        elif isinstance(ret, str):
+            return ret + padding
+        return ret
+
+    def execute(self, fun: str, minion: str, args=(), kwargs=None):
+        """Returns a (ret, retcode) pair of a minion function call."""
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            if fun.startswith('state.'):
+                return _state_ret(fun, False, 'simulated failure'), 1
+            return f'simulated failure of {fun}', 1
+
+        handler = self.funs.get(fun) or DEFAULT_FUNS.get(fun)
+        if handler is None:
+            ret = True
+        else:
+            ret = handler(self, minion, *(args or ()), **(kwargs or {}))
+        return self._padded(ret), 0
+
+    def run(
+        self, targets, fun, args=(), kwargs=None, tgt_type='glob',
+        jid=None
+    ) -> Dict:
+        self.calls.append((fun, targets))
+        if self.latency:
+            time.sleep(self.latency)
+
+        jid = jid or self.new_jid()
+        res = {}
+        for minion in self.match(targets, tgt_type):
+            ret, retcode = self.execute(fun, minion, args, kwargs)
+            res[minion] = {'ret': ret, 'retcode': retcode, 'jid': jid}
+        return res
+
+    def run_runner(self, fun: str, args=(), kwargs=None, jid=None) -> Dict:
+        self.calls.append((f'runner.{fun}', ALL_MINIONS))
+        if self.latency:
+            time.sleep(self.latency)
+
+        handler = self.runners.get(fun) or DEFAULT_RUNNERS.get(fun)
+        ret = (
+            True if handler is None
+            else handler(self, *(args or ()), **(kwargs or {}))
+        )
+        return {
+            'jid': jid or self.new_jid(),
+            'fun': f'runner.{fun}',
+            'fun_args': list(args or ()),
+            'success': True,
+            'return': ret,
+            'user': 'root',
+            '_stamp': '2020-10-10T10:10:10.000000'
+        }
+
+    def plug(self, monkeypatch):
+        """Makes provisioner salt clients talk to the simulator."""
+        for pool in (
+            prvsnr_salt.salt_local_client_pool(),
+            prvsnr_salt.salt_runner_client_pool()
+        ):
+            pool.clear()
+            monkeypatch.setattr(pool, '_idle', [])
+
+        monkeypatch.setattr(
+            prvsnr_salt.salt_local_client_pool(), 'factory',
+            lambda: SimLocalClient(self)
+        )
+        monkeypatch.setattr(
+            prvsnr_salt.salt_runner_client_pool(), 'factory',
+            lambda: SimRunnerClient(self)
+        )
+        caller = SimCaller(self)
+        monkeypatch.setattr(prvsnr_salt, 'salt_caller', lambda: caller)
+        monkeypatch.setattr(prvsnr_salt, 'salt_caller_local', lambda: caller)
+        monkeypatch.setattr(
+            prvsnr_salt, '_local_minion_id', self.local_minion_id
+        )
+        monkeypatch.setattr(
+            prvsnr_salt, '_salt_target_resolver', self._resolver
+        )
+        prvsnr_salt.salt_grains_cache().invalidate()
+
+
+class SimEvent:
+    cpub = False
+
+    def close_pub(self):
+        pass
+
+
+class SimLocalClient:
+    def __init__(self, sim: SaltSimulator):
+        self.sim = sim
+        self.event = SimEvent()
+
+    def cmd(
+        self, tgt, fun, arg=(), timeout=None, tgt_type='glob',
+        ret='', jid='', full_return=False, kwarg=None, **kwargs
+    ):
+        res = self.sim.run(tgt, fun, arg, kwarg, tgt_type)
+        if full_return:
+            return res
+        return {minion: _res['ret'] for minion, _res in res.items()}
+
+    def cmd_async(
+        self, tgt, fun, arg=(), tgt_type='glob', ret='', jid='',
+        kwarg=None, **kwargs
+    ):
+        pub_data = self.run_job(tgt, fun, arg, tgt_type, kwarg=kwarg)
+        return pub_data['jid']
+
+    def run_job(
+        self, tgt, fun, arg=(), tgt_type='glob', ret='', timeout=None,
+        jid='', kwarg=None, listen=False, **kwargs
+    ):
+        res = self.sim.run(tgt, fun, arg, kwarg, tgt_type)
+        jid = self.sim.new_jid()
+        self.sim.jobs[jid] = res
+        return {'jid': jid, 'minions': list(res)}
+
+    def get_cli_event_returns(
+        self, jid, minions, timeout=None, tgt='*', tgt_type='glob',
+        **kwargs
+    ):
+        for minion, res in self.sim.jobs.pop(jid, {}).items():
+            yield {minion: res}
+
+
+class SimRunnerClient:
+    def __init__(self, sim: SaltSimulator):
+        self.sim = sim
+
+    def cmd(
+        self, fun, arg=None, pub_data=None, kwarg=None,
+        print_event=True, full_return=False, **kwargs
+    ):
+        data = self.sim.run_runner(fun, arg, kwarg)
+        return data if full_return else data['return']
+
+    def cmd_sync(self, low, timeout=None, full_return=False):
+        data = self.sim.run_runner(
+            low['fun'], low.get('arg'), low.get('kwarg')
+        )
+        return {'data': data} if full_return else data['return']
+
+    def asynchronous(self, fun, low, user='UNKNOWN', pub=None):
+        jid = self.sim.new_jid()
+        self.sim.jobs[jid] = self.sim.run_runner(
+            fun, low.get('arg'), low.get('kwarg'), jid=jid
+        )
+        return {'jid': jid, 'tag': f'salt/run/{jid}'}
+
+    def cmd_async(self, low):
+        return self.asynchronous(low['fun'], low)
+
+
+class SimCaller:
+    def __init__(self, sim: SaltSimulator):
+        self.sim = sim
+        self.context = {}
+
+        class _Functions:
+            pack = {'__context__': self.context}
+
+        class _SMinion:
+            functions = _Functions()
+
+        self.sminion = _SMinion()
+
+    def cmd(self, fun, *args, **kwargs):
+        ret, retcode = self.sim.execute(
+            fun, self.sim.local_minion_id, args, kwargs
+        )
+        self.context['retcode'] = retcode
+        return ret
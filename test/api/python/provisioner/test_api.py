@@ -18,8 +18,12 @@
 import pytest
 
 from provisioner import _api as api
+from provisioner import api as provisioner_api
+from provisioner.config import ALL_MINIONS
 from provisioner.errors import UnknownParamError
-from provisioner import inputs
+from provisioner.paths import PillarPath
+from provisioner.utils import load_yaml
+from provisioner import inputs, pillar
 
 
 @pytest.mark.patch_logging([(inputs, ('error',))])
@@ -29,3 +33,65 @@ def test_api_get_params_fails_for_unknown_param(
     monkeypatch.setattr(api, 'api_spec', {})
     with pytest.raises(UnknownParamError):
         api.get_params('some-param')
+
+
+def test_api_pillar_set_many(monkeypatch, tmpdir_function):
+    pillar_dir = tmpdir_function / 'pillar'
+    monkeypatch.setattr(
+        pillar, 'USER_SHARED_PILLAR', PillarPath(pillar_dir, 'uu_')
+    )
+    refreshed = []
+    monkeypatch.setattr(
+        pillar, 'pillar_refresh',
+        lambda targets=ALL_MINIONS, **kwargs: refreshed.append(targets)
+    )
+
+    api.pillar_set_many({
+        'cluster/srvnode-1/hostname': 'host1',
+        'cluster/srvnode-2/hostname': 'host2',
+        'release/target_build': 'some-url'
+    })
+
+    all_hosts_dir = pillar_dir / 'groups/all'
+    assert load_yaml(all_hosts_dir / 'uu_cluster.sls') == {
+        'cluster': {
+            'srvnode-1': {'hostname': 'host1'},
+            'srvnode-2': {'hostname': 'host2'}
+        }
+    }
+    assert load_yaml(all_hosts_dir / 'uu_release.sls') == {
+        'release': {'target_build': 'some-url'}
+    }
+    assert refreshed == [ALL_MINIONS]
+
+
+def test_api_pillar_transaction(monkeypatch):
+    calls = []
+
+    def _api_call(fun, *args, **kwargs):
+        calls.append((fun, args, kwargs))
+
+    monkeypatch.setattr(provisioner_api, '_api_call', _api_call)
+
+    with provisioner_api.pillar_transaction(targets='srvnode-1') as items:
+        items['1/2'] = 3
+        items['1/4'] = 5
+        assert not calls
+
+    assert calls == [(
+        'pillar_set_many', ({'1/2': 3, '1/4': 5},),
+        dict(fpath=None, targets='srvnode-1', nowait=False)
+    )]
+
+    # nothing is set on errors
+    calls[:] = []
+    with pytest.raises(ValueError):
+        with provisioner_api.pillar_transaction() as items:
+            items['1/2'] = 3
+            raise ValueError('some error')
+    assert not calls
+
+    # nothing to set
+    with provisioner_api.pillar_transaction():
+        pass
+    assert not calls
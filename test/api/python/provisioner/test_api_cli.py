@@ -206,3 +206,14 @@ def test_api_cli_set_env(mocker, patch_logging):
 
     api._run_cmd([cmd_name], env=env)
     run_m.assert_called_once_with([cmd_name], env=expected)
+
+
+@pytest.mark.patch_logging([(api, ('error',))])
+def test_api_cli_process_cli_result_undecodable(mocker, patch_logging):
+    loads_m = mocker.spy(api.serialize, 'loads')
+    bad_obj = {"_prvsnr_type_": ["builtins", "SomeClass"], "args": [123]}
+    stdout = json.dumps({'ret': {'some-key': bad_obj}})
+
+    assert api.process_cli_result(stdout) == {'some-key': bad_obj}
+    # decoded in a single pass
+    loads_m.assert_called_once()
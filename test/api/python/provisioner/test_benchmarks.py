@@ -0,0 +1,317 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+"""Benchmarks of the provisioner hot paths.
+
+Salt is simulated (see salt_sim), so only provisioner side overhead
+is measured. Requires pytest-benchmark plugin, e.g.::
+
+    pytest test/api/python/provisioner/test_benchmarks.py \
+        --benchmark-autosave --benchmark-compare
+
+CI runs them once each as smoke tests with ``--benchmark-disable``.
+"""
+
+import copy
+import logging
+from pprint import pformat
+
+import pytest
+import yaml
+
+from provisioner import (
+    salt, pillar, serialize, yaml_codec, utils, config, api_spec
+)
+from provisioner._api_cli import process_cli_result
+from provisioner.commands.check import Check
+from provisioner.commands.deploy import Deploy, run_args_type
+from provisioner.config import ALL_MINIONS
+from provisioner.errors import SaltCmdResultError
+from provisioner.paths import PillarPath
+from provisioner.pillar import (
+    PillarIterable, PillarKey, PillarResolver, PillarUpdater
+)
+
+from .helper import importtime_summary, pillar_samples, run_cli
+from .salt_sim import SaltSimulator
+
+pytest.importorskip('pytest_benchmark')
+
+
+MINIONS_NUM = 3
+
+YAML_CODECS = {
+    'libyaml': (yaml_codec.Loader, yaml_codec.Dumper),
+    'python': (yaml.SafeLoader, yaml.Dumper),
+}
+
+
+def _pillar(minions_num=MINIONS_NUM, components_num=100):
+    cluster = {
+        'type': 'dual',
+        'cluster_ip': '192.168.0.100',
+    }
+    for idx in range(1, minions_num + 1):
+        cluster[f'srvnode-{idx}'] = {
+            'hostname': f'srvnode-{idx}.localdomain',
+            'network': {
+                'data': {
+                    'public_ip': f'192.168.0.{idx}',
+                    'private_ip': f'192.168.1.{idx}',
+                }
+            }
+        }
+
+    return {
+        'cluster': cluster,
+        'release': {'upgrade': {'repos': {'cortx': 'some-url'}}},
+        'setup': {'grains': {'hostname_status': {'Chassis': 'server'}}},
+        # bulk data to make pillar size close to a real one
+        'components': {
+            f'component-{idx}': {
+                'settings': {f'key-{key}': f'value-{key}' for key in range(20)}
+            } for idx in range(components_num)
+        }
+    }
+
+
+@pytest.fixture
+def salt_sim(monkeypatch):
+    sim = SaltSimulator(
+        minions_num=MINIONS_NUM, pillar=_pillar(),
+        grains={'os': 'CentOS', 'virtual': 'physical'}
+    )
+    sim.plug(monkeypatch)
+    return sim
+
+
+@pytest.fixture
+def pillar_roots(monkeypatch, tmpdir_function):
+    path = PillarPath(tmpdir_function / 'pillar', 'zzz_')
+    monkeypatch.setattr(pillar, 'USER_SHARED_PILLAR', path)
+    return path
+
+
+@pytest.mark.parametrize('ret_size', [0, 100 * 1024], ids=['empty', '100K'])
+def test_bench_function_run(benchmark, salt_sim, ret_size):
+    salt_sim.ret_size = ret_size
+    res = benchmark(salt.function_run, 'cmd.run', fun_args=['uptime'])
+    assert sorted(res) == salt_sim.minion_ids
+
+
+@pytest.mark.parametrize('states_num', [10, 500])
+def test_bench_salt_client_result(benchmark, salt_sim, states_num):
+    raw = {
+        minion: {
+            'ret': {
+                f'file_|-state-{idx}_|-/some/path/{idx}_|-managed': {
+                    'result': True, 'comment': 'ok', 'changes': {},
+                    '__run_num__': idx
+                } for idx in range(states_num)
+            },
+            'retcode': 0,
+            'jid': salt_sim.new_jid()
+        } for minion in salt_sim.minion_ids
+    }
+    cmd_args_view = salt.SaltClientArgs(
+        ALL_MINIONS, 'state.apply', ['some.state']
+    )._as_dict()
+
+    res = benchmark(salt.SaltClientResult, raw, cmd_args_view)
+    assert not res.fails
+
+
+@pytest.mark.parametrize('secure', [False, True], ids=['plain', 'secure'])
+def test_bench_salt_client_args_view(benchmark, secure):
+    # the view is built for each salt call result
+    cmd_args = salt.SaltClientArgs(
+        ALL_MINIONS, 'state.apply', ['some.state'],
+        fun_kwargs={'pillar': _pillar(components_num=500)},
+        kw={'username': 'user', 'password': 'secret'},
+        secure=secure
+    )
+
+    res = benchmark(cmd_args._as_dict)
+    assert res['kw']['password'] == salt.SECRET_MASK
+
+
+@pytest.mark.parametrize('lazy', [False, True], ids=['pformat', 'lazy'])
+def test_bench_log_salt_result(benchmark, lazy):
+    # debug records are not emitted in production
+    logger = logging.getLogger('provisioner.bench')
+    logger.setLevel(logging.INFO)
+    res = _pillar(components_num=500)
+    _format = utils.lazy_pformat if lazy else pformat
+
+    benchmark(lambda: logger.debug("Result: %s", _format(res)))
+
+
+@pytest.mark.parametrize('cached', [False, True], ids=['cold', 'cached'])
+@pytest.mark.parametrize(
+    'keypaths_only', [False, True], ids=['full', 'keypaths']
+)
+def test_bench_pillar_resolver_get(
+    benchmark, salt_sim, keypaths_only, cached
+):
+    pi_keys = [
+        PillarKey('release/upgrade'),
+        PillarKey('cluster/srvnode-1/hostname'),
+        PillarKey('setup/grains/hostname_status/Chassis'),
+    ]
+
+    def _get():
+        if not cached:
+            pillar.pillar_cache().invalidate()
+        return PillarResolver(keypaths_only=keypaths_only).get(pi_keys)
+
+    res = benchmark(_get)
+    assert res['srvnode-1'][pi_keys[1]] == 'srvnode-1.localdomain'
+
+
+@pytest.mark.parametrize(
+    'targets', [ALL_MINIONS, 'srvnode-1', 'not srvnode-1'],
+    ids=['all', 'minion', 'compound']
+)
+def test_bench_pillar_updater(benchmark, salt_sim, pillar_roots, targets):
+    items = PillarIterable({
+        f'component-{idx}/settings/key': f'value-{idx}' for idx in range(20)
+    })
+
+    def _update():
+        pillar_updater = PillarUpdater(targets)
+        pillar_updater.update(items)
+        pillar_updater.apply()
+
+    benchmark(_update)
+    assert any(
+        fun == 'saltutil.refresh_pillar' for fun, _ in salt_sim.calls
+    )
+
+
+def test_bench_check_run(benchmark, salt_sim):
+    def _run():
+        return [
+            Check().run(check_name)
+            for check_name in ('network', 'communicability', 'connectivity')
+        ]
+
+    for res in benchmark(_run):
+        assert res.is_passed
+
+
+def test_bench_deploy_run_states_planning(benchmark, salt_sim):
+    run_args = run_args_type(targets='srvnode-*')
+
+    def _run():
+        salt_sim.calls[:] = []
+        Deploy()._run_states('system', run_args)
+        return list(salt_sim.calls)
+
+    calls = benchmark(_run)
+    assert ('state.apply', run_args.targets) in calls
+
+
+@pytest.fixture(params=list(YAML_CODECS))
+def yaml_codec_classes(request):
+    if request.param == 'libyaml' and not yaml_codec.LIBYAML:
+        pytest.skip('libyaml is not available')
+    return YAML_CODECS[request.param]
+
+
+def test_bench_yaml_load_pillar_samples(benchmark, yaml_codec_classes):
+    loader, _ = yaml_codec_classes
+    samples = [
+        path.read_text() for path in pillar_samples()
+    ]
+
+    def _load():
+        return [yaml.load(data, Loader=loader) for data in samples]
+
+    assert len(benchmark(_load)) == len(samples)
+
+
+def test_bench_yaml_dump_pillar_samples(benchmark, yaml_codec_classes):
+    _, dumper = yaml_codec_classes
+    samples = list(pillar_samples().values())
+
+    def _dump():
+        return [
+            yaml.dump(
+                data, Dumper=dumper, default_flow_style=False,
+                canonical=False, width=1, indent=4
+            ) for data in samples
+        ]
+
+    assert len(benchmark(_dump)) == len(samples)
+
+
+@pytest.mark.parametrize(
+    'spec_path',
+    [
+        config.API_SPEC_PATH, config.PARAMS_SPEC_PATH,
+        config.CLI_SPEC_PATH, config.ATTRS_SPEC_PATH
+    ],
+    ids=['api', 'params', 'cli', 'attrs']
+)
+@pytest.mark.parametrize('cached', [False, True], ids=['yaml', 'cached'])
+def test_bench_load_spec(benchmark, tmpdir_function, spec_path, cached):
+    cache_dir = tmpdir_function / 'specs'
+    if cached:
+        res = benchmark(utils.load_yaml_cached, spec_path, cache_dir)
+    else:
+        res = benchmark(utils.load_yaml, spec_path)
+    assert res == utils.load_yaml(spec_path)
+
+
+def test_bench_process_param_spec(benchmark, tmpdir_function):
+    # the processing cost that is paid on top of the (cached) yaml loading
+    spec = utils.load_yaml_cached(
+        config.PARAMS_SPEC_PATH, tmpdir_function / 'specs'
+    )
+    res = benchmark(
+        lambda: api_spec.process_param_spec(copy.deepcopy(spec))
+    )
+    assert res.keys() == api_spec.param_spec.keys()
+
+
+@pytest.mark.parametrize('with_types', [False, True], ids=['plain', 'typed'])
+def test_bench_serialize_loads_cli_result(benchmark, with_types):
+    ret = {
+        minion: _pillar(components_num=500)
+        for minion in [f'srvnode-{idx}' for idx in range(1, MINIONS_NUM + 1)]
+    }
+    if with_types:
+        ret['srvnode-1']['exc'] = SaltCmdResultError('some-cmd', 'some-reason')
+    stdout = serialize.dumps({'ret': ret}, sort_keys=True, indent=4)
+
+    res = benchmark(process_cli_result, stdout)
+    assert res.keys() == ret.keys()
+
+
+def test_bench_import_get_result_cmd(benchmark):
+    res, modules = benchmark.pedantic(
+        run_cli, args=('get_result', '123'),
+        kwargs=dict(python_args=('-X', 'importtime')), rounds=5
+    )
+
+    benchmark.extra_info['importtime'] = importtime_summary(
+        res.stderr, top=20
+    )
+    assert 'provisioner.commands' in modules
+    assert 'provisioner.commands.deploy' not in modules
+    assert 'provisioner.commands.setup_provisioner' not in modules
+    assert 'provisioner.commands.bootstrap_provisioner' not in modules
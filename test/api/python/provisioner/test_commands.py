@@ -38,7 +38,7 @@ from provisioner import (
 from provisioner.salt import State, YumRollbackManager
 from provisioner.values import MISSED
 
-from .helper import mock_fun_echo, mock_fun_result
+from .helper import mock_fun_echo, mock_fun_result, run_cli, run_python
 
 
 # HELPERS and FIXTURE
@@ -95,6 +95,59 @@ def state_fun_executer_m(mocker):
     )
 
 
+# ### CommandsRegistry ###
+
+def test_commands_registry(mocker):
+    spec = {
+        'pillar_get': {'type': 'PillarGet'},
+        'some_cmd': {'type': 'some_module.SomeCmd'}
+    }
+    from_spec_m = mocker.spy(commands.PillarGet, 'from_spec')
+    registry = commands.CommandsRegistry(spec)
+
+    assert list(registry) == list(spec)
+    assert len(registry) == 2
+    assert 'some_cmd' in registry
+    assert 'unknown' not in registry
+    from_spec_m.assert_not_called()
+
+    cmd = registry['pillar_get']
+    assert isinstance(cmd, commands.PillarGet)
+    # resolved once
+    assert registry['pillar_get'] is cmd
+    from_spec_m.assert_called_once_with()
+    # spec is not changed
+    assert spec['pillar_get'] == {'type': 'PillarGet'}
+
+    with pytest.raises(KeyError):
+        registry['unknown']
+
+
+def test_commands_registry_lazy_imports():
+    heavy = [
+        'provisioner.commands.deploy',
+        'provisioner.commands.setup_provisioner',
+        'provisioner.commands.upgrade',
+        'provisioner.commands.mini_api',
+        'provisioner.commands.check',
+    ]
+    # the whole CLI dispatch path, not only the registry
+    _, modules = run_cli('get_result', '123')
+    assert 'provisioner.commands' in modules
+    assert not set(heavy).intersection(modules)
+
+
+def test_commands_registry_resolve_order():
+    # attributes defined earlier should not affect later ones
+    run_python(
+        'import provisioner.resources.provisioner\n'
+        'import provisioner.resources.cortx_repos\n'
+        'from provisioner.commands import commands\n'
+        'for cmd_name in commands:\n'
+        '    commands[cmd_name]\n'
+    )
+
+
 # ### PillarGet ###
 
 @pytest.mark.outdated
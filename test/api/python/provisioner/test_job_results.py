@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import json
+import pytest
+import time
+
+from provisioner import job_results
+from provisioner.errors import SaltCmdResultError
+from provisioner.job_results import JobResultsStore, JobResultStatus
+from provisioner.salt import SaltJob
+
+
+def _cli_res(ret):
+    return {'some-minion': '{{"ret": {}}}'.format(ret)}
+
+
+def test_job_results_store(tmpdir_function):
+    store = JobResultsStore(
+        path=tmpdir_function / 'results.sqlite', max_age=None, max_number=3
+    )
+
+    store.add('1', 'cmd1', start_time=1)
+    store.add('2', 'cmd2', start_time=2)
+    store.add('3', 'cmd1', start_time=3)
+    store.update('2', 'cmd2', JobResultStatus.FINISHED, _cli_res(2))
+
+    assert store.get('2')['status'] == 'finished'
+    assert store.get('2')['result'] == _cli_res(2)
+    assert store.get('4') is None
+
+    assert [r['jid'] for r in store.list()] == ['3', '2', '1']
+    assert [r['jid'] for r in store.list(cmd='cmd1')] == ['3', '1']
+    assert [r['jid'] for r in store.list(status='running')] == ['3', '1']
+    assert [r['jid'] for r in store.list(since=2)] == ['3', '2']
+    assert [r['jid'] for r in store.list(limit=1)] == ['3']
+    assert 'result' not in store.list()[0]
+
+    # max number retention
+    store.add('4', 'cmd1', start_time=4)
+    assert [r['jid'] for r in store.list()] == ['4', '3', '2']
+
+    # max age retention
+    store.max_age = 60
+    store.add('5', 'cmd1')
+    assert [r['jid'] for r in store.list()] == ['5']
+
+
+def test_job_results_get_result(monkeypatch, tmpdir_function):
+    store = JobResultsStore(path=tmpdir_function / 'results.sqlite')
+    monkeypatch.setattr(job_results, '_job_results_store', store)
+
+    calls = []
+
+    def prvsnr_job(jid, *args, **kwargs):
+        calls.append(jid)
+        return SaltJob(jid=jid, function='provisioner.some_cmd')
+
+    monkeypatch.setattr(
+        job_results.SaltJobsRunner, 'prvsnr_job', prvsnr_job
+    )
+    monkeypatch.setattr(
+        job_results.SaltJobsRunner, 'prvsnr_job_raw_result',
+        lambda job: _cli_res(1)
+    )
+    monkeypatch.setattr(
+        job_results, 'process_provisioner_cmd_res',
+        lambda res: json.loads(next(iter(res.values())))['ret']
+    )
+
+    job_results.record_job('20201010101010101010', 'some_cmd')
+    assert store.get('20201010101010101010')['status'] == 'running'
+
+    assert job_results.get_result('20201010101010101010') == 1
+    assert calls == ['20201010101010101010']
+    record = store.get('20201010101010101010')
+    assert record['status'] == 'finished'
+    assert record['end_time'] <= time.time()
+
+    # already finished jobs are not requested from salt anymore
+    assert job_results.get_result('20201010101010101010') == 1
+    assert calls == ['20201010101010101010']
+
+    # unknown jobs are requested and stored as well
+    assert job_results.get_result('20201010101010101011') == 1
+    assert store.get('20201010101010101011')['cmd'] == 'some_cmd'
+
+
+def test_job_results_get_runner_result(monkeypatch, tmpdir_function):
+    store = JobResultsStore(path=tmpdir_function / 'results.sqlite')
+    monkeypatch.setattr(job_results, '_job_results_store', store)
+
+    def _ret(success):
+        return {'some-master': {'return': {
+            'fun': 'runner.manage.up', 'jid': '20201010101010101010',
+            'success': success, 'return': ['srvnode-1'], 'user': 'root',
+            '_stamp': 'some-timestamp'
+        }}}
+
+    job = SaltJob(
+        jid='20201010101010101010', function='runner.manage.up',
+        result=_ret(True)
+    )
+    monkeypatch.setattr(
+        job_results.SaltJobsRunner, 'prvsnr_job', lambda jid: job
+    )
+
+    assert job_results.get_result('20201010101010101010') == ['srvnode-1']
+    record = store.get('20201010101010101010')
+    assert record['cmd'] == 'runner.manage.up'
+    assert record['status'] == 'finished'
+    # stored results are processed as runner ones as well
+    assert job_results.get_result('20201010101010101010') == ['srvnode-1']
+
+    job.jid = '20201010101010101011'
+    job.result = _ret(False)
+    with pytest.raises(SaltCmdResultError):
+        job_results.get_result('20201010101010101011')
+    assert store.get('20201010101010101011')['status'] == 'failed'
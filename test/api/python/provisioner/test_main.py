@@ -28,6 +28,8 @@ from provisioner.config import (
     LOG_ROOT_DIR
 )
 
+from .helper import run_cli
+
 
 @pytest.fixture
 def set_logging_m(mocker, mock_manager):
@@ -303,3 +305,14 @@ def test_main_happy_path(
         ])
 
     assert mock_manager.mock_calls == expected_calls
+
+
+def test_main_get_result_lazy_imports():
+    _, modules = run_cli('get_result', '123')
+    assert 'provisioner.commands' in modules
+    assert not {
+        'provisioner.commands.setup_provisioner',
+        'provisioner.commands.deploy',
+        'provisioner.commands.bootstrap_provisioner',
+        'provisioner.commands.check',
+    }.intersection(modules)
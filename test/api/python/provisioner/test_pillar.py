@@ -15,17 +15,20 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 
+import os
 import pytest
 from copy import deepcopy
 from pathlib import Path
 
 from provisioner.utils import dump_yaml, load_yaml
+from provisioner.errors import SaltCmdResultError
 from provisioner.param import Param
 from provisioner import (
     pillar, ALL_MINIONS, UNCHANGED, DEFAULT, MISSED, UNDEFINED
 )
+from provisioner.paths import PillarPath
 from provisioner.pillar import (
-    KeyPath, PillarKeyAPI, PillarKey,
+    KeyPath, KeyPathIndex, PillarKeyAPI, PillarKey, PillarIterable,
     PillarEntry, PillarResolver, PillarUpdater
 )
 
@@ -122,6 +125,66 @@ def test_pillar_PillarKeysList_extract_positional_args():
     raise NotImplementedError
 
 
+# ### KeyPathIndex ###
+
+
+def test_pillar_KeyPathIndex_get():
+    data = {'1': {'2': {'3': '4'}, '5': '6', '7': {}}}
+    p_index = KeyPathIndex(data)
+
+    assert p_index.get('1/2/3') == '4'
+    assert p_index.get(KeyPath('1/5')) == '6'
+    assert p_index.get(('1', '2')) == {'3': '4'}
+    assert p_index.get('1/7') == {}
+    assert p_index.get('1/8') is MISSED
+    assert p_index.get('1/5/6') is MISSED
+    assert p_index.get('1/8/9', default=None) is None
+
+
+def test_pillar_KeyPathIndex_set_rollback():
+    data = {'1': {'2': {'3': '4'}, '5': '6'}}
+    orig = deepcopy(data)
+    p_index = KeyPathIndex(data)
+
+    p_index.set('1/2/3', '7')
+    p_index.set('1/8/9', '10')
+    assert data == {'1': {'2': {'3': '7'}, '5': '6', '8': {'9': '10'}}}
+    assert p_index.get('1/8/9') == '10'
+
+    # a subtree is replaced
+    p_index.set('1/2', {'11': '12'})
+    assert p_index.get('1/2/3') is MISSED
+    assert p_index.get('1/2/11') == '12'
+    p_index.set('1/2/11', '13')
+    assert data['1']['2'] == {'11': '13'}
+
+    with pytest.raises(TypeError):
+        p_index.set('1/5/6', '7')
+
+    assert p_index.changed
+    p_index.rollback()
+    assert not p_index.changed
+    # Note. created parents are kept (as PillarEntry does)
+    assert data == dict(orig, **{'1': dict(orig['1'], **{'8': {}})})
+    assert p_index.get('1/2/3') == '4'
+
+
+def test_pillar_KeyPathIndex_items():
+    data = {'1': {'2': {'3': '4'}, '5': '6', '7': {}}, '8': '9'}
+    p_index = KeyPathIndex(data)
+
+    assert list(p_index.items()) == [
+        (('1', '2', '3'), '4'),
+        (('1', '5'), '6'),
+        (('1', '7'), {}),
+        (('8',), '9'),
+    ]
+    assert list(p_index.items('1/2')) == [(('1', '2', '3'), '4')]
+    assert list(p_index.items('8')) == [(('8',), '9')]
+    assert list(p_index.items('10')) == []
+    assert p_index.parent(('1', '2', '3')) is data['1']['2']
+
+
 # ### PillarEntry ###
 
 def test_pillar_PillarEntry_get():
@@ -252,6 +315,231 @@ def test_pillar_resolver(test_pillar):
     }
 
 
+def test_pillar_resolver_keypaths_only(monkeypatch, test_pillar):
+    param1 = Param('some-param', ('1/2/3', 'aaa.sls'))
+    param2 = Param('some-param2', ('1/di_parent/8', 'aaa.sls'))
+
+    calls = []
+
+    def pillar_get_keypaths(keypaths, targets=ALL_MINIONS, **kwargs):
+        calls.append(keypaths)
+        res = {}
+        for minion_id, _pillar in test_pillar.items():
+            res[minion_id] = {}
+            for keypath in keypaths:
+                value = PillarEntry(keypath, _pillar).get()
+                if value is not MISSED:
+                    res[minion_id][keypath] = value
+        return res
+
+    monkeypatch.setattr(pillar, 'pillar_get_keypaths', pillar_get_keypaths)
+    monkeypatch.setattr(
+        pillar, 'pillar_get', lambda *args, **kwargs: pytest.fail()
+    )
+
+    pr = PillarResolver(keypaths_only=True)
+    res = pr.get([param1, param2])
+    assert calls == [['1/2/3', '1/di_parent/8']]
+    assert res == {
+        'some-node-id-1': {
+            param1: '4',
+            param2: MISSED
+        }, 'some-node-id-2': {
+            param1: '5',
+            param2: '9'
+        }
+    }
+
+    # already fetched keypaths are reused
+    assert pr.get([param1]) == {
+        'some-node-id-1': {param1: '4'}, 'some-node-id-2': {param1: '5'}
+    }
+    assert calls == [['1/2/3', '1/di_parent/8']]
+
+
+def test_pillar_resolver_keypaths_only_fallback(monkeypatch, test_pillar):
+    param1 = Param('some-param', ('1/2/3', 'aaa.sls'))
+
+    def pillar_get_keypaths(*args, **kwargs):
+        raise SaltCmdResultError(
+            {}, "'pillar_ops.get_keypaths' is not available"
+        )
+
+    monkeypatch.setattr(pillar, 'pillar_get_keypaths', pillar_get_keypaths)
+
+    res = PillarResolver(keypaths_only=True).get([param1])
+    assert res == {
+        'some-node-id-1': {param1: '4'}, 'some-node-id-2': {param1: '5'}
+    }
+
+
+def test_pillar_cache(monkeypatch, tmpdir_function):
+    roots = [tmpdir_function / 'pillar1', tmpdir_function / 'pillar2']
+    for path in roots:
+        path.mkdir()
+    sls = roots[1] / 'some' / 'file.sls'
+    sls.parent.mkdir()
+    sls.write_text('1: 2')
+
+    pc = pillar.PillarCache()
+    monkeypatch.setattr(pc, 'roots', lambda: roots)
+
+    assert pc.get(ALL_MINIONS) is None
+    assert (pc.hits, pc.misses) == (0, 1)
+
+    data = {'some-node-id': {'1': '2'}}
+    pc.set(ALL_MINIONS, False, data)
+    res = pc.get(ALL_MINIONS)
+    assert res == data
+    # a copy is returned
+    assert res is not data
+    res['some-node-id']['1'] = '3'
+    assert pc.get(ALL_MINIONS) == data
+    assert (pc.hits, pc.misses) == (2, 1)
+    assert pc.hit_rate == 2 / 3
+
+    # keyed by (targets, local)
+    assert pc.get(ALL_MINIONS, local=True) is None
+    assert pc.get('some-node-id') is None
+    pc.set(['m2', 'm1'], False, data)
+    assert pc.get(['m1', 'm2']) == data
+
+    # pillar files changes are tracked if there is no ttl
+    pc.ttl = None
+    assert pc.get(ALL_MINIONS) is None
+    pc.set(ALL_MINIONS, False, data)
+    assert pc.get(ALL_MINIONS) == data
+    mtime = pc.roots_mtime()
+    os.utime(str(sls), (mtime + 10, mtime + 10))
+    assert pc.get(ALL_MINIONS) is None
+    pc.ttl = 60
+
+    # explicit invalidation
+    pc.set(ALL_MINIONS, False, data)
+    pc.invalidate()
+    assert pc.get(ALL_MINIONS) is None
+
+    # ttl
+    pc.ttl = 0
+    pc.set(ALL_MINIONS, False, data)
+    assert pc.get(ALL_MINIONS) is None
+
+
+def test_pillar_cache_no_roots_scan_within_ttl(monkeypatch):
+    scans = []
+    pc = pillar.PillarCache(ttl=60)
+    monkeypatch.setattr(
+        pc, 'roots_mtime', lambda: scans.append(1) or len(scans)
+    )
+
+    data = {'some-node-id': {'1': '2'}}
+    pc.set(ALL_MINIONS, False, data)
+    for _ in range(10):
+        assert pc.get(ALL_MINIONS) == data
+    assert pc.get('some-node-id') is None
+    assert scans == []
+
+    # without ttl the roots are checked on each lookup
+    pc.ttl = None
+    pc.get(ALL_MINIONS)
+    pc.get(ALL_MINIONS)
+    assert len(scans) == 2
+
+
+def test_pillar_resolver_cached(monkeypatch, test_pillar):
+    calls = []
+
+    def pillar_get(*args, **kwargs):
+        calls.append(kwargs)
+        return test_pillar
+
+    monkeypatch.setattr(pillar, 'pillar_get', pillar_get)
+    monkeypatch.setattr(
+        pillar.PillarCache, 'roots', staticmethod(lambda: [])
+    )
+    param1 = Param('some-param', ('1/2/3', 'aaa.sls'))
+
+    res = PillarResolver().get([param1])
+    assert PillarResolver().get([param1]) == res
+    assert len(calls) == 1
+
+    # updates invalidate the cache
+    monkeypatch.setattr(PillarUpdater, 'dump', lambda self: [])
+    PillarUpdater(local=True).apply()
+    assert PillarResolver().get([param1]) == res
+    assert len(calls) == 1
+
+    monkeypatch.setattr(
+        PillarUpdater, 'dump', lambda self: [Path('some.sls')]
+    )
+    PillarUpdater(local=True).apply()
+    assert PillarResolver().get([param1]) == res
+    assert len(calls) == 2
+
+
+def test_pillar_resolver_local_snapshot(monkeypatch, tmpdir_function):
+    root = tmpdir_function / 'pillar'
+    (root / 'some').mkdir(parents=True)
+    sls = root / 'some' / 'file.sls'
+    sls.write_text('1: 2')
+    monkeypatch.setattr(
+        pillar.PillarCache, 'roots', staticmethod(lambda: [root])
+    )
+    grains = tmpdir_function / 'grains'
+    grains.write_text('roles: [primary]')
+    monkeypatch.setattr(
+        pillar, 'SALT_MINION_GRAINS_SOURCES',
+        (grains, tmpdir_function / 'minion.d')
+    )
+
+    calls = []
+
+    def pillar_get(*args, **kwargs):
+        calls.append(kwargs)
+        return {'some-node-id': {'1': {'2': '3'}}}
+
+    monkeypatch.setattr(pillar, 'pillar_get', pillar_get)
+    pi_key = PillarKey('1/2')
+
+    def _get():
+        pillar.pillar_cache().invalidate()
+        return PillarResolver(local=True).get([pi_key])
+
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert calls == [dict(targets=ALL_MINIONS, local=True)]
+    snapshot_path = pillar.pillar_snapshot().path
+    assert snapshot_path.stat().st_mode & 0o777 == 0o600
+
+    # served by the snapshot
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 1
+
+    # not used for the remote pillar
+    PillarResolver().get([pi_key])
+    assert len(calls) == 2
+
+    # pillar sources are changed
+    mtime = sls.stat().st_mtime + 10
+    os.utime(str(sls), (mtime, mtime))
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 3
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 3
+
+    # broken snapshot
+    snapshot_path.write_text('{')
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 4
+
+    # grains are changed
+    mtime = grains.stat().st_mtime + 20
+    os.utime(str(grains), (mtime, mtime))
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 5
+    assert _get() == {'some-node-id': {pi_key: '3'}}
+    assert len(calls) == 5
+
+
 def test_pillar_updater_ensure_exists(tmpdir_function):
     pu = PillarUpdater()
 
@@ -380,6 +668,85 @@ def test_pillar_updater_update_rollback_dump(
     assert load_yaml(f3) == pillar_data
 
 
+@pytest.mark.parametrize(
+    'targets', [ALL_MINIONS, 'srvnode-1', 'not srvnode-1']
+)
+def test_pillar_updater_apply_changed_only(
+    monkeypatch, targets, tmpdir_function
+):
+    pillar_dir = tmpdir_function / 'pillar'
+    monkeypatch.setattr(
+        pillar, 'USER_SHARED_PILLAR', PillarPath(pillar_dir, 'uu_')
+    )
+    monkeypatch.setattr(
+        pillar, 'resolve_targets',
+        lambda *args, **kwargs: ['srvnode-2', 'srvnode-3']
+    )
+    refreshed = []
+    monkeypatch.setattr(
+        PillarUpdater, 'refresh',
+        staticmethod(lambda targets=ALL_MINIONS: refreshed.append(targets))
+    )
+
+    def _apply(value):
+        pu = PillarUpdater(targets=targets)
+        pu.update(PillarIterable({'1/2': value}, fpath='some.sls'))
+        pu.apply()
+        return pu
+
+    pu = _apply('3')
+    paths = list(pu._pillars)
+    assert all(load_yaml(path) == {'1': {'2': '3'}} for path in paths)
+    if targets == ALL_MINIONS:
+        assert refreshed == [ALL_MINIONS]
+    else:
+        assert refreshed == [pu.minions]
+
+    mtimes = [path.stat().st_mtime_ns for path in paths]
+
+    # the same value: no writes and no refresh
+    refreshed[:] = []
+    _apply('3')
+    assert [path.stat().st_mtime_ns for path in paths] == mtimes
+    assert refreshed == []
+
+    # UNCHANGED values
+    _apply(UNCHANGED)
+    assert refreshed == []
+
+    # no temporary files are left
+    assert sorted(pillar_dir.rglob('*.tmp')) == []
+
+
+def test_pillar_updater_targets_minions(monkeypatch):
+    resolved = []
+
+    def resolve_targets(targets, tgt_type):
+        resolved.append((targets, tgt_type))
+        return ['srvnode-2', 'srvnode-3']
+
+    monkeypatch.setattr(pillar, 'resolve_targets', resolve_targets)
+
+    # a plain minion id is not resolved
+    assert PillarUpdater(targets='srvnode-1').minions == ['srvnode-1']
+    assert resolved == []
+
+    pu = PillarUpdater(targets='not srvnode-1')
+    assert pu.minions == ['srvnode-2', 'srvnode-3']
+    assert pu.minions == ['srvnode-2', 'srvnode-3']
+    assert resolved == [('not srvnode-1', 'compound')]
+
+    pillars = pu.pillars(Path('some.sls'))
+    assert len(pillars) == 2
+    assert pillars[0] is pu.pillar(Path('some.sls'), 'srvnode-2')
+    assert pillars[1] is pu.pillar(Path('some.sls'), 'srvnode-3')
+    assert len(PillarUpdater().pillars(Path('some.sls'))) == 1
+
+    monkeypatch.setattr(pillar, 'resolve_targets', lambda *args, **kwargs: [])
+    with pytest.raises(ValueError):
+        PillarUpdater(targets='srvnode-[45]').minions
+
+
 def test_pillar_updater_refresh(monkeypatch):
 
     pillar_refresh_called = 0
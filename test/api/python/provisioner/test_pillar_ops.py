@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import importlib.util
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from provisioner import config, pillar
+
+
+class CipherInvalidToken(Exception):
+    pass
+
+
+class Cipher:
+    PREFIX = b'enc:'
+
+    @staticmethod
+    def generate_key(cluster_id, pillar_name):
+        return f'{cluster_id}:{pillar_name}'
+
+    @classmethod
+    def encrypt(cls, key, data):
+        return cls.PREFIX + data
+
+    @classmethod
+    def decrypt(cls, key, data):
+        if not data.startswith(cls.PREFIX):
+            raise CipherInvalidToken()
+        return data[len(cls.PREFIX):]
+
+
+@pytest.fixture
+def pillar_ops(monkeypatch):
+    if config.PROJECT_PATH is None:
+        pytest.skip('salt modules sources are not available')
+
+    spec = importlib.util.spec_from_file_location(
+        'pillar_ops',
+        config.PROJECT_PATH / 'srv' / '_modules' / 'pillar_ops.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    # salt loader dunders are looked up via sys.modules
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+
+    module.__grains__ = {'cluster_id': 'some-cluster', 'lr-serial-number': ''}
+    monkeypatch.setattr(
+        module, '_import_cipher',
+        lambda: SimpleNamespace(
+            Cipher=Cipher, CipherInvalidToken=CipherInvalidToken
+        )
+    )
+    monkeypatch.setattr(module, '_generate_secret', lambda: 'new-secret')
+    return module
+
+
+@pytest.fixture
+def pillar_updater_m(monkeypatch):
+    updater_m = MagicMock()
+    monkeypatch.setattr(pillar, 'PillarUpdater', lambda: updater_m)
+    return updater_m
+
+
+def _updates(pillar_updater_m):
+    pillar_updater_m.update.assert_called_once()
+    pillar_updater_m.apply.assert_called_once_with(rollback_on_error=True)
+    return pillar_updater_m.update.call_args[0][0].pi_items
+
+
+def test_pillar_ops_encrypt(pillar_ops, pillar_updater_m):
+    pillar_ops.__pillar__ = {
+        'cluster': {
+            'srvnode-1': {
+                'bmc': {'secret': 'bmc-passwd', 'user': 'admin'},
+            },
+            'srvnode-2': {
+                'bmc': {'secret': 'enc:bmc-passwd'},
+            }
+        },
+        'storage': {
+            'enclosure-1': {'controller': {'secret': "'ctrl-passwd'"}},
+            'blank': {'secret': ''}
+        }
+    }
+
+    assert pillar_ops.encrypt() is True
+
+    # already encrypted values are left untouched
+    assert _updates(pillar_updater_m) == {
+        'cluster/srvnode-1/bmc/secret': 'enc:bmc-passwd',
+        'storage/enclosure-1/controller/secret': 'enc:ctrl-passwd',
+        'storage/blank/secret': 'enc:new-secret',
+    }
+
+
+def test_pillar_ops_decrypt(pillar_ops, pillar_updater_m):
+    pillar_ops.__pillar__ = {
+        'cluster': {
+            'srvnode-1': {'bmc': {'secret': 'enc:bmc-passwd'}},
+            'srvnode-2': {'bmc': {'secret': 'plain-passwd'}}
+        }
+    }
+
+    assert pillar_ops.encrypt(decrypt=True) is True
+
+    assert _updates(pillar_updater_m) == {
+        'cluster/srvnode-1/bmc/secret': 'bmc-passwd',
+        'cluster/srvnode-2/bmc/secret': 'plain-passwd',
+    }
+
+
+def test_pillar_ops_encrypt_no_changes(pillar_ops, pillar_updater_m):
+    pillar_ops.__pillar__ = {
+        'cluster': {
+            'srvnode-1': {
+                'bmc': {'secret': 'enc:bmc-passwd', 'user': 'admin'}
+            }
+        },
+        'release': {'target_build': 'some-url'}
+    }
+
+    assert pillar_ops.encrypt() is True
+
+    pillar_updater_m.update.assert_not_called()
+    pillar_updater_m.apply.assert_not_called()
@@ -17,6 +17,8 @@
 
 import pytest
 import functools
+import logging
+import time
 from typing import Tuple, Dict
 
 from provisioner import salt
@@ -24,7 +26,8 @@ from provisioner import salt
 from provisioner.vendor import attr
 from provisioner.errors import (
     SaltCmdRunError, SaltNoReturnError, SaltCmdResultError,
-    ProvisionerError
+    ProvisionerError,
+    PrvsnrCmdNotFoundError, PrvsnrCmdNotFinishedError
 )
 from provisioner.config import LOCAL_MINION, SECRET_MASK
 from provisioner import UNCHANGED, MISSED
@@ -40,6 +43,9 @@ def generate_salt_client_mock(cmd_f, cmd_async_f=None):
 
         def cmd_async(self, *args, **kwargs):
             return cmd_async_f(*args, **kwargs)
+
+        def asynchronous(self, *args, **kwargs):
+            return cmd_async_f(*args, **kwargs)
     return SomeClient
 
 
@@ -194,9 +200,18 @@ def test_salt_runner_cmd(monkeypatch, eauth):
         ]
 
     nowait = True
-    salt_cmd_args = []
-    with pytest.raises(NotImplementedError):
+    salt_cmd_res = {'jid': '12345', 'tag': 'salt/run/12345'}
+    assert _call() == '12345'
+    _low = dict(fun=fun, arg=fun_args, kwarg=fun_kwargs, **kwargs)
+    if eauth:
+        assert salt_cmd_args == [((_low,), dict(_async=True))]
+    else:
+        assert salt_cmd_args == [((fun, _low), dict(_async=True))]
+
+    salt_cmd_res = {'tag': 'salt/run/12345'}
+    with pytest.raises(SaltCmdRunError):
         _call()
+    salt_cmd_res = salt_cmd_good_res
     nowait = False
 
     # TEST ERRORS RAISED
@@ -843,6 +858,99 @@ def test_salt_states_apply(monkeypatch):
     ]
 
 
+def test_salt_states_apply_batch(monkeypatch):
+    minions = ['m1', 'm2', 'm3', 'm4', 'm5']
+    calls = []
+    fail_on = {}
+
+    def function_run(fun, targets=None, tgt_type=None, **kwargs):
+        if fun == 'test.ping':
+            return {m: True for m in reversed(minions)}
+        assert tgt_type == 'list'
+        state = kwargs['fun_args'][0]
+        calls.append((state, targets))
+        fails = {m: 'fail' for m in targets if m in fail_on.get(state, ())}
+        if fails:
+            raise SaltCmdResultError({}, fails, {
+                m: state for m in targets if m not in fails
+            })
+        return {m: state for m in targets}
+
+    monkeypatch.setattr(salt, 'function_run', function_run)
+
+    assert salt.StatesBatch('40%').split(minions) == [
+        ['m1', 'm2'], ['m3', 'm4'], ['m5']
+    ]
+    with pytest.raises(ValueError):
+        salt.StatesBatch('0')
+    with pytest.raises(ValueError):
+        salt.StatesBatch('150%')
+
+    res = salt.states_apply(['s1', 's2'], targets='*', batch=2)
+    assert calls == [
+        ('s1', ['m1', 'm2']), ('s1', ['m3', 'm4']), ('s1', ['m5']),
+        ('s2', ['m1', 'm2']), ('s2', ['m3', 'm4']), ('s2', ['m5']),
+    ]
+    assert res == {
+        's1': {m: 's1' for m in minions}, 's2': {m: 's2' for m in minions}
+    }
+
+    # failures within the threshold: failed minions are skipped later on
+    calls[:] = []
+    fail_on['s1'] = ['m2']
+    with pytest.raises(SaltCmdResultError) as excinfo:
+        salt.states_apply(
+            ['s1', 's2'], targets='*',
+            batch=dict(size=2, max_failures=1)
+        )
+    assert excinfo.value.reason == {'m2': {'s1': 'fail'}}
+    assert calls[3:] == [('s2', ['m1', 'm3']), ('s2', ['m4', 'm5'])]
+
+    # results of the succeeded minions of a partly failed batch are kept
+    checked = []
+    fail_on['s1'] = ['m2']
+    with pytest.raises(SaltCmdResultError):
+        salt.states_apply(
+            ['s1'], targets='*', batch=salt.StatesBatch(
+                2, max_failures=1,
+                health_check=lambda batch, res: checked.append(res) or True
+            )
+        )
+    assert checked[0] == {'m1': 's1'}
+
+    # threshold is exceeded: rollout is stopped
+    calls[:] = []
+    fail_on['s1'] = ['m1']
+    with pytest.raises(SaltCmdResultError):
+        salt.states_apply(['s1', 's2'], targets='*', batch=2)
+    assert calls == [('s1', ['m1', 'm2'])]
+
+    # health gate
+    calls[:] = []
+    fail_on.clear()
+    with pytest.raises(ProvisionerError):
+        salt.states_apply(
+            ['s1'], targets='*',
+            batch=salt.StatesBatch(
+                2, health_check=lambda batch, res: 'm3' not in batch
+            )
+        )
+    assert calls == [('s1', ['m1', 'm2']), ('s1', ['m3', 'm4'])]
+
+
+def test_salt_client_args_list_targets():
+    args = salt.SaltClientArgs(['srvnode-1', 'srvnode-2'], 'some.fun')
+    assert args.targets == 'srvnode-1|srvnode-2'
+    assert args.kw == {'tgt_type': 'pcre'}
+
+    # exact matching is kept for explicit list targeting
+    args = salt.SaltClientArgs(
+        ['srvnode-1', 'srvnode-2'], 'some.fun', kw={'tgt_type': 'list'}
+    )
+    assert args.targets == 'srvnode-1,srvnode-2'
+    assert args.kw == {'tgt_type': 'list'}
+
+
 def test_salt_state_fun_execute(monkeypatch):
     function_run_args = []
 
@@ -923,3 +1031,430 @@ def test_SaltArgsMixin_secure():
     assert sc_view['fun_args'] == SECRET_MASK
     assert sc_view['fun_kwargs'] == SECRET_MASK
     assert 'passwd' not in str(sc)
+
+
+def test_salt_function_run_lazy_logging(monkeypatch, caplog):
+    reprs = []
+
+    class SomeRes:
+        def __repr__(self):
+            reprs.append(1)
+            return 'some-res'
+
+    monkeypatch.setattr(
+        salt, '_salt_client_cmd', lambda *args, **kwargs: SomeRes()
+    )
+
+    caplog.set_level(logging.INFO, logger=salt.logger.name)
+    salt.function_run('some-fun', targets='some-target')
+    assert reprs == []
+
+    caplog.set_level(logging.DEBUG, logger=salt.logger.name)
+    salt.function_run('some-fun', targets='some-target')
+    assert reprs
+    assert "'some-fun' on 'some-target' resulted in some-res" in caplog.text
+
+
+def test_SaltArgsMixin_view_is_shallow():
+    fun_args = [{'a': [1, 2]}]
+    fun_kwargs = {'b': {'c': 3}, 'password': 'passwd'}
+    cmd_args = salt.SaltClientArgs(
+        'some-target', 'some-fun', fun_args, fun_kwargs
+    )
+    view = cmd_args._as_dict()
+    assert view['fun_args'][0] is fun_args[0]
+    assert view['fun_kwargs']['b'] is fun_kwargs['b']
+    # the args themselves are not masked
+    assert fun_kwargs['password'] == 'passwd'
+    assert view['fun_kwargs']['password'] == SECRET_MASK
+
+
+def test_salt_client_pool_reuse():
+    class SomeClient:
+        pass
+
+    pool = salt.SaltClientPool(SomeClient, max_idle=1)
+
+    client1 = pool.acquire()
+    client2 = pool.acquire()
+    assert client1 is not client2
+    assert pool.metrics == dict(
+        hits=0, misses=2, discards=0, idle=0, leased=2
+    )
+
+    assert pool.release(client1)
+    # exceeds max_idle
+    assert pool.release(client2)
+    assert pool.metrics == dict(
+        hits=0, misses=2, discards=1, idle=1, leased=0
+    )
+
+    assert pool.acquire() is client1
+    assert pool.metrics['hits'] == 1
+
+    # clients not created by the pool are ignored
+    assert not pool.release(SomeClient())
+
+
+def test_salt_client_pool_borrow():
+    class SomeClient:
+        pass
+
+    pool = salt.SaltClientPool(SomeClient)
+
+    with pool.borrow() as client:
+        pass
+    with pool.borrow() as _client:
+        assert _client is client
+
+    with pytest.raises(ValueError):
+        with pool.borrow() as _client:
+            raise ValueError('some error')
+
+    # failed client is not reused
+    with pool.borrow() as _client:
+        assert _client is not client
+    assert pool.metrics == dict(
+        hits=2, misses=2, discards=1, idle=1, leased=0
+    )
+
+
+def test_salt_client_pool_idle_ttl(monkeypatch):
+    class SomeClient:
+        pass
+
+    now = 100
+    monkeypatch.setattr(salt.time, 'monotonic', lambda: now)
+
+    pool = salt.SaltClientPool(SomeClient, idle_ttl=10)
+    client = pool.acquire()
+    pool.release(client)
+
+    now += 11
+    assert pool.acquire() is not client
+    assert pool.metrics['discards'] == 1
+
+
+def test_salt_function_run_batch(monkeypatch, local_minion_id):
+    published = []
+
+    class SomeEvent:
+        cpub = False
+
+        def close_pub(self):
+            pass
+
+    class SomeClient:
+        event = SomeEvent()
+        opts = {'timeout': 5}
+
+        def run_job(self, targets, fun, **kwargs):
+            jid = str(len(published))
+            published.append((targets, fun, kwargs))
+            if fun == 'no.minions':
+                return {}
+            if fun == 'some.error':
+                raise ValueError('some error')
+            return {'jid': jid, 'minions': [targets]}
+
+        def get_cli_event_returns(self, jid, minions, *args, **kwargs):
+            targets, fun, kwargs = published[int(jid)]
+            yield {
+                targets: {
+                    'ret': kwargs['arg'],
+                    'retcode': int(fun == 'some.fail')
+                }
+            }
+
+    monkeypatch.setattr(
+        salt, '_salt_local_client_pool', salt.SaltClientPool(SomeClient)
+    )
+
+    res = salt.function_run_batch({
+        'call1': ('some.fun', 'node1', ['arg1']),
+        'call2': salt.SaltBatchCall('some.fail', 'node2', fun_args=['arg2']),
+        'call3': ('no.minions', 'node3'),
+        'call4': ('some.error', salt.LOCAL_MINION),
+    })
+
+    # all calls are published before any result is collected
+    assert [fun for _, fun, _ in published] == [
+        'some.fun', 'some.fail', 'no.minions', 'some.error'
+    ]
+    assert published[3][0] == local_minion_id
+
+    assert res['call1'].get() == {'node1': ['arg1']}
+    assert isinstance(res['call2'].error, SaltCmdResultError)
+    assert res['call2'].error.reason == {'node2': ['arg2']}
+    assert isinstance(res['call3'].error, SaltNoReturnError)
+    assert isinstance(res['call4'].error, SaltCmdRunError)
+    with pytest.raises(SaltCmdRunError):
+        res['call4'].get()
+
+    # list input
+    res = salt.function_run_batch([('some.fun', 'node1', ['arg1'])])
+    assert res[0].results == {'node1': ['arg1']}
+
+
+def test_salt_function_run_batch_deadline(monkeypatch):
+    now = [100.0]
+    timeouts = []
+
+    class SomeEvent:
+        cpub = False
+
+        def close_pub(self):
+            pass
+
+    class SomeClient:
+        event = SomeEvent()
+        opts = {'timeout': 5}
+
+        def run_job(self, targets, fun, **kwargs):
+            return {'jid': fun, 'minions': [targets]}
+
+        def get_cli_event_returns(self, jid, minions, timeout, *args):
+            timeouts.append(timeout)
+            # each job takes 4 seconds to return
+            now[0] += 4
+            yield {minions[0]: {'ret': jid, 'retcode': 0}}
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(
+        salt, '_salt_local_client_pool', salt.SaltClientPool(SomeClient)
+    )
+
+    calls = [(f'some.fun{idx}', f'node{idx}') for idx in range(4)]
+
+    # the batch shares one deadline, not a timeout per job
+    salt.function_run_batch(calls, timeout=10)
+    assert timeouts == [10, 6, 2, 0]
+
+    # master's default
+    timeouts[:] = []
+    salt.function_run_batch(calls)
+    assert timeouts == [5, 1, 0, 0]
+
+
+def test_salt_job_tracker(monkeypatch):
+    loads = {}
+    returns = {}
+    events = []
+
+    class SomeEvent:
+        def get_event(self, wait=None, tag=None, full=False, **kwargs):
+            events.append(tag)
+            # the job finishes while we are waiting for it
+            returns['123'] = {'some-node': {'return': 'some-ret'}}
+
+        def destroy(self):
+            pass
+
+    monkeypatch.setattr(
+        salt.salt.utils.event, 'get_master_event',
+        lambda *args, **kwargs: SomeEvent()
+    )
+
+    tracker = salt.SaltJobTracker()
+    tracker._opts = dict(master_job_cache='some_cache', sock_dir='some_dir')
+    tracker._returners = {
+        'some_cache.get_load': lambda jid: loads.get(jid, {}),
+        'some_cache.get_jid': lambda jid: returns.get(jid, {}),
+    }
+
+    with pytest.raises(PrvsnrCmdNotFoundError):
+        tracker.get_result('123')
+
+    loads['123'] = dict(fun='provisioner.some_cmd', minions=['some-node'])
+    with pytest.raises(PrvsnrCmdNotFinishedError):
+        tracker.get_result('123')
+
+    job = tracker.wait('123', timeout=5)
+    assert events == ['salt/(job|run)/123/ret']
+    assert job.function == 'provisioner.some_cmd'
+    assert job.result == {'some-node': {'return': 'some-ret'}}
+    assert tracker.get_result('123') == job
+
+    loads['456'] = dict(fun='some.fun', minions=['some-node'])
+    with pytest.raises(PrvsnrCmdNotFinishedError):
+        tracker.wait('456', timeout=0)
+
+    # the job load is stored after the waiting is started
+    with pytest.raises(PrvsnrCmdNotFoundError):
+        tracker.wait('789', timeout=0)
+
+    def get_event(wait=None, tag=None, **kwargs):
+        loads['789'] = dict(fun='provisioner.other', minions=['some-node'])
+        returns['789'] = {'some-node': {'return': 'other-ret'}}
+
+    monkeypatch.setattr(SomeEvent, 'get_event', staticmethod(get_event))
+    assert tracker.wait('789', timeout=5).function == 'provisioner.other'
+
+
+def test_salt_jobs_runner_prvsnr_job_wait_no_job_cache(monkeypatch):
+    jobs = []
+
+    def print_job(jid):
+        if not jobs:
+            # not yet stored
+            res = salt.SaltJob(jid, error='not found')
+        elif len(jobs) == 1:
+            res = salt.SaltJob(jid, function='provisioner.some_cmd')
+        else:
+            res = salt.SaltJob(
+                jid, function='provisioner.some_cmd',
+                result={'some-node': {'return': 'some-ret'}}
+            )
+        jobs.append(res)
+        return res
+
+    tracker = salt.SaltJobTracker(poll_interval=0)
+    monkeypatch.setattr(salt, '_salt_job_tracker', tracker)
+    monkeypatch.setattr(
+        salt.SaltJobTracker, 'available', property(lambda self: False)
+    )
+    monkeypatch.setattr(
+        salt.SaltJobsRunner, 'print_job', staticmethod(print_job)
+    )
+
+    with pytest.raises(PrvsnrCmdNotFoundError):
+        salt.SaltJobsRunner.prvsnr_job('123')
+
+    job = salt.SaltJobsRunner.prvsnr_job('123', wait=True, timeout=5)
+    assert job.result == {'some-node': {'return': 'some-ret'}}
+    assert len(jobs) == 3
+
+    jobs[:] = [None]
+    with pytest.raises(PrvsnrCmdNotFinishedError):
+        salt.SaltJobsRunner.prvsnr_job('123', wait=True, timeout=0)
+
+
+def test_salt_grains_cache(monkeypatch):
+    calls = []
+    grains = {
+        'm1': {'id': 'm1', 'machine_id': 'mid1', 'a': {'b': 1}},
+        'm2': {'id': 'm2', 'machine_id': 'mid2', 'a': {'b': 2}},
+    }
+
+    def _salt_client_cmd(targets, fun, fun_args=None, **kwargs):
+        calls.append((fun, targets))
+        minions = (
+            list(grains) if targets == '*' else targets.split('|')
+        )
+        if fun == 'grains.items':
+            return {m: grains[m] for m in minions}
+        elif fun == 'grains.get':
+            return {m: grains[m].get(fun_args[0], '') for m in minions}
+        return {m: True for m in minions}
+
+    cache = salt.SaltGrainsCache()
+    monkeypatch.setattr(salt, '_salt_client_cmd', _salt_client_cmd)
+    monkeypatch.setattr(salt, '_salt_grains_cache', cache)
+
+    # plain minion ids
+    assert salt.grains_get('machine_id', targets='m1') == {'m1': 'mid1'}
+    assert salt.grains_get('machine_id', targets='m1') == {'m1': 'mid1'}
+    assert calls == [('grains.get', 'm1')]
+
+    # glob targets are resolved by the previous calls
+    calls[:] = []
+    assert salt.grains_get('machine_id') == {'m1': 'mid1', 'm2': 'mid2'}
+    assert salt.grains_get('machine_id') == {'m1': 'mid1', 'm2': 'mid2'}
+    assert salt.grains_get('machine_id', targets='m2') == {'m2': 'mid2'}
+    assert calls == [('grains.get', '*')]
+
+    # prefetch
+    calls[:] = []
+    salt.grains_prefetch()
+    salt.grains_prefetch(targets='m1')
+    assert calls == [('grains.items', '*')]
+    assert salt.grains_get('a:b', targets=['m1', 'm2']) == {'m1': 1, 'm2': 2}
+    assert salt.grains_get('unknown', targets='m1') == {'m1': ''}
+    assert calls == [('grains.items', '*')]
+
+    # invalidation
+    calls[:] = []
+    salt.function_run('saltutil.sync_grains')
+    assert salt.grains_get('machine_id', targets='m1') == {'m1': 'mid1'}
+    assert calls == [('saltutil.sync_grains', '*'), ('grains.get', 'm1')]
+
+    # ttl
+    calls[:] = []
+    cache.ttl = 0
+    salt.grains_get('machine_id', targets='m1')
+    assert calls == [('grains.get', 'm1')]
+
+
+def test_salt_target_resolver(monkeypatch, tmpdir_function, local_minion_id):
+    keys_dir = tmpdir_function / 'pki' / 'minions'
+    keys_dir.mkdir(parents=True)
+    for minion in ('srvnode-1', 'srvnode-2', 'srvnode-3'):
+        (keys_dir / minion).touch()
+
+    grains = {
+        'srvnode-1': {'os': 'CentOS', 'roles': ['primary']},
+        'srvnode-2': {'os': 'CentOS', 'roles': ['secondary']},
+        'srvnode-3': {'os': 'RedHat', 'roles': ['secondary']},
+    }
+    fetches = []
+
+    class SomeCache:
+        def fetch(self, bank, key):
+            fetches.append(bank)
+            return {'grains': grains[bank.split('/')[1]]}
+
+    resolver = salt.SaltTargetResolver()
+    resolver._opts = dict(pki_dir=str(tmpdir_function / 'pki'))
+    resolver._cache = SomeCache()
+
+    assert resolver.resolve('*') == ['srvnode-1', 'srvnode-2', 'srvnode-3']
+    assert resolver.resolve('srvnode-[12]') == ['srvnode-1', 'srvnode-2']
+    assert resolver.resolve('srvnode-1,srvnode-4', 'list') == ['srvnode-1']
+    assert resolver.resolve(['srvnode-2', 'srvnode-4']) == ['srvnode-2']
+    assert resolver.resolve(r'srvnode-(1|3)', 'pcre') == [
+        'srvnode-1', 'srvnode-3'
+    ]
+    assert resolver.resolve('os:Cent*', 'grain') == ['srvnode-1', 'srvnode-2']
+    assert resolver.resolve('roles:second.*', 'grain_pcre') == [
+        'srvnode-2', 'srvnode-3'
+    ]
+    assert resolver.resolve(LOCAL_MINION) == [local_minion_id]
+
+    # compound
+    assert resolver.resolve('not srvnode-1', 'compound') == [
+        'srvnode-2', 'srvnode-3'
+    ]
+    assert resolver.resolve(
+        'G@os:CentOS and not L@srvnode-1,srvnode-3', 'compound'
+    ) == ['srvnode-2']
+    assert resolver.resolve(
+        'srvnode-1 or G@roles:secondary and G@os:RedHat', 'compound'
+    ) == ['srvnode-1', 'srvnode-3']
+    assert resolver.resolve(
+        '( srvnode-1 or G@roles:secondary ) and G@os:CentOS', 'compound'
+    ) == ['srvnode-1', 'srvnode-2']
+    for targets in (
+        'I@some:pillar', '( srvnode-1', 'srvnode-1 srvnode-2', 'and'
+    ):
+        with pytest.raises(salt.SaltTargetsResolveError):
+            resolver.resolve(targets, 'compound')
+    with pytest.raises(salt.SaltTargetsResolveError):
+        resolver.resolve('10.0.0.0/8', 'ipcidr')
+
+    # grains are cached
+    assert len(fetches) == 3
+    resolver.resolve('G@os:CentOS', 'compound')
+    assert len(fetches) == 3
+
+    # accepted keys changes are noticed
+    (keys_dir / 'srvnode-3').unlink()
+    assert resolver.resolve('*') == ['srvnode-1', 'srvnode-2']
+
+    # fallback to the master matching
+    monkeypatch.setattr(salt, '_salt_target_resolver', resolver)
+    monkeypatch.setattr(
+        salt, 'function_run',
+        lambda fun, targets, tgt_type: {'srvnode-1': True}
+    )
+    assert salt.resolve_targets('I@some:pillar', 'compound') == ['srvnode-1']
+    assert salt.resolve_targets('srvnode-*') == ['srvnode-1', 'srvnode-2']
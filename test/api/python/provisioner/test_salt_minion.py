@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import pytest
+
+from provisioner import salt_minion
+from provisioner.errors import ProvisionerError
+from provisioner.salt_minion import MinionPresenceTracker
+
+
+class _Event:
+    def __init__(self, events):
+        self.events = list(events)
+        self.destroyed = False
+
+    def get_event(self, wait=5, tag='', full=False):
+        return self.events.pop(0) if self.events else None
+
+    def destroy(self):
+        self.destroyed = True
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(
+        MinionPresenceTracker, 'opts', {'sock_dir': '/some/dir'}
+    )
+    monkeypatch.setattr(MinionPresenceTracker, 'available', True)
+    return MinionPresenceTracker(poll_interval=100)
+
+
+@pytest.mark.parametrize(
+    'event, expected',
+    [
+        ({'tag': 'salt/minion/srvnode-1/start', 'data': {'id': 'srvnode-1'}},
+         ({'srvnode-1'}, set())),
+        ({'tag': 'minion_start', 'data': {'id': 'srvnode-1'}},
+         ({'srvnode-1'}, set())),
+        ({'tag': 'salt/auth',
+          'data': {'id': 'srvnode-1', 'act': 'accept', 'result': True}},
+         ({'srvnode-1'}, set())),
+        ({'tag': 'salt/auth',
+          'data': {'id': 'srvnode-1', 'act': 'pend', 'result': True}},
+         (set(), set())),
+        ({'tag': 'salt/presence/present',
+          'data': {'present': ['srvnode-1', 'srvnode-2']}},
+         ({'srvnode-1', 'srvnode-2'}, set())),
+        ({'tag': 'salt/presence/change',
+          'data': {'new': ['srvnode-1'], 'lost': ['srvnode-2']}},
+         ({'srvnode-1'}, {'srvnode-2'})),
+        ({'tag': 'salt/job/123/ret/srvnode-1', 'data': {'id': 'srvnode-1'}},
+         (set(), set())),
+    ],
+    ids=[
+        'start', 'legacy_start', 'auth', 'auth_pending',
+        'present', 'change', 'other'
+    ]
+)
+def test_minion_presence_tracker_parse_event(event, expected):
+    assert MinionPresenceTracker.parse_event(event) == expected
+
+
+def test_minion_presence_tracker_wait_for_minions(tracker, monkeypatch):
+    list_calls = []
+
+    def list_minions():
+        list_calls.append(1)
+        return ['srvnode-1']
+
+    event = _Event([
+        None,
+        {'tag': 'salt/job/123/new', 'data': {}},
+        {'tag': 'salt/minion/srvnode-2/start', 'data': {'id': 'srvnode-2'}},
+    ])
+    monkeypatch.setattr(salt_minion, 'list_minions', list_minions)
+    monkeypatch.setattr(
+        salt_minion.salt.utils.event, 'get_master_event',
+        lambda *args, **kwargs: event
+    )
+
+    assert tracker.wait_for_minions(['srvnode-1', 'srvnode-2'], timeout=10)
+    # minions are listed once, the rest comes from the events
+    assert len(list_calls) == 1
+    assert event.destroyed
+
+    # lost minions are not considered as connected
+    event = _Event([
+        {'tag': 'salt/presence/change',
+         'data': {'new': ['srvnode-2'], 'lost': ['srvnode-1']}},
+    ])
+    assert not tracker.wait_for_minions(
+        ['srvnode-1', 'srvnode-2'], timeout=0.1
+    )
+    assert event.destroyed
+
+
+def test_minion_presence_tracker_fallback_to_polling(tracker, monkeypatch):
+    res = [['srvnode-1'], ['srvnode-1', 'srvnode-2']]
+
+    monkeypatch.setattr(MinionPresenceTracker, 'available', False)
+    monkeypatch.setattr(salt_minion, 'list_minions', lambda: res.pop(0))
+    monkeypatch.setattr(salt_minion.time, 'sleep', lambda _: None)
+
+    assert tracker.wait_for_minions(['srvnode-1', 'srvnode-2'], timeout=10)
+    assert not res
+
+
+def test_ensure_salt_minions_are_ready(monkeypatch):
+    monkeypatch.setattr(
+        salt_minion, 'wait_for_minions', lambda targets, timeout: False
+    )
+    with pytest.raises(ProvisionerError):
+        salt_minion.ensure_salt_minions_are_ready(['srvnode-1'], timeout=1)
+
+    monkeypatch.setattr(
+        salt_minion, 'wait_for_minions', lambda targets, timeout: True
+    )
+    salt_minion.ensure_salt_minions_are_ready(['srvnode-1'], timeout=1)
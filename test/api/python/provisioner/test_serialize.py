@@ -17,12 +17,13 @@
 
 import pytest
 import json
+from importlib import import_module
 
 from provisioner.vendor import attr
 from provisioner.serialize import (
-    PrvsnrType, dumps, loads, PRVSNR_TYPE_KEY
+    PrvsnrType, PrvsnrJSONEncoder, dumps, loads, PRVSNR_TYPE_KEY
 )
-from provisioner import values
+from provisioner import serialize, values
 
 from provisioner.errors import (
     ProvisionerError, PrvsnrTypeDecodeError
@@ -185,3 +186,62 @@ def test_serialize_prvsnr_exception():
     exc2 = loads(dumps({'exc': exc1}))['exc']
     assert type(exc1) is type(exc2)
     assert exc1.args == exc2.args
+
+
+def test_decode_non_strict_errors():
+    dct = {"_prvsnr_type_": ["builtins", "SomeClass"], "args": [123]}
+    errors = []
+    assert loads(
+        json.dumps({'ret': [dct, ValueError(1)]}, cls=PrvsnrJSONEncoder),
+        strict=False, errors=errors
+    )['ret'][0] == dct
+
+    assert len(errors) == 1
+    assert type(errors[0]) is PrvsnrTypeDecodeError
+    assert errors[0].spec == dct
+
+
+def test_decode_types_resolved_once(monkeypatch):
+    calls = []
+
+    def _import_module(m_name):
+        calls.append(m_name)
+        return import_module(m_name)
+
+    monkeypatch.setattr(serialize, 'import_module', _import_module)
+    monkeypatch.setattr(serialize, '_types', {})
+
+    obj = {'exc': [ValueError(1), ValueError(2)], 'obj': SomePrvsnrClass1(3)}
+    for _ in range(2):
+        res = loads(dumps(obj))
+        assert [type(exc) for exc in res['exc']] == [ValueError, ValueError]
+        assert res['obj'] == obj['obj']
+    assert calls == ['builtins', __name__]
+
+
+def test_prvsnr_type_registered():
+    assert serialize.resolve_type(
+        __name__, 'SomePrvsnrClass2'
+    ) is SomePrvsnrClass2
+    assert serialize._types[(__name__, 'SomePrvsnrClass2')] is (
+        SomePrvsnrClass2
+    )
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson'])
+def test_loads_no_prvsnr_types(monkeypatch, mocker, backend):
+    if backend == 'json':
+        monkeypatch.setattr(serialize, 'orjson', None)
+    elif serialize.orjson is None:
+        pytest.skip('orjson is not available')
+
+    hook_m = mocker.patch.object(
+        serialize, 'json_prvsnr_type_hook', autospec=True
+    )
+    data = {'ret': {'a': [1, 2.5, None, True, 'str']}}
+
+    assert loads(json.dumps(data)) == data
+    assert loads(json.dumps(data).encode()) == data
+    # not supported by orjson
+    assert loads('{"a": NaN}')['a'] != 0
+    hook_m.assert_not_called()
@@ -62,3 +62,54 @@ def test_copy_id_input_checks(mocker):
         ssh_options_lst.extend(['-o', opt])
     ssh.copy_id(host, ssh_options=ssh_options)
     run_m.assert_called_with([copy_id_cmd] + ssh_options_lst + [host])
+
+
+def test_ssh_control_master(mocker, tmpdir_function):
+    base_options = ['StrictHostKeyChecking=no']
+
+    control_master = ssh.SSHControlMaster(persist=30)
+    options = control_master.ssh_options(base_options)
+    control_dir = control_master.control_dir
+    assert control_dir.is_dir()
+    assert options == base_options + [
+        'ControlMaster=auto',
+        f'ControlPath={control_dir}/%C',
+        'ControlPersist=30'
+    ]
+    # the same socket dir is used for all the sessions
+    assert control_master.ssh_options(base_options) == options
+
+    # explicit options take precedence
+    assert control_master.ssh_options(['ControlPersist=yes']) == [
+        'ControlPersist=yes',
+        'ControlMaster=auto',
+        f'ControlPath={control_dir}/%C'
+    ]
+    assert control_master.ssh_options(['ControlMaster=no']) == [
+        'ControlMaster=no'
+    ]
+
+    run_m = mocker.patch.object(ssh, 'run_subprocess_cmd', autospec=True)
+    control_master.close(
+        [('host1', 'user1', 2222), ('host2', None, None)], base_options
+    )
+    opts_args = []
+    for opt in options:
+        opts_args.extend(['-o', opt])
+    assert run_m.call_args_list == [
+        mocker.call(
+            ['ssh', '-O', 'exit'] + opts_args + ['-p', '2222', 'user1@host1'],
+            check=False
+        ),
+        mocker.call(
+            ['ssh', '-O', 'exit'] + opts_args + ['host2'], check=False
+        )
+    ]
+    assert not control_dir.exists()
+    assert control_master.control_dir is None
+
+    # a custom dir is not removed
+    control_master = ssh.SSHControlMaster(control_dir=tmpdir_function)
+    control_master.ssh_options()
+    control_master.close([('host1', None, None)])
+    assert tmpdir_function.exists()
@@ -16,6 +16,8 @@
 #
 import pytest
 import subprocess
+import threading
+import time
 import yaml
 
 from provisioner import config
@@ -90,6 +92,34 @@ def test_ensure(monkeypatch, patch_logging):
     assert wait == 3
 
 
+def test_run_parallel(patch_logging):
+    threads = set()
+    calls = []
+
+    def fun(arg):
+        calls.append(arg)
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        if arg in (3, 5):
+            raise ValueError(arg)
+        return arg * 2
+
+    assert utils.run_parallel(fun, [1, 2, 4]) == [2, 4, 8]
+    assert len(threads) == 3
+
+    # sequential mode
+    threads.clear()
+    assert utils.run_parallel(fun, [1, 2], max_workers=1) == [2, 4]
+    assert threads == {threading.get_ident()}
+
+    # all calls are done, the first error is raised
+    calls[:] = []
+    with pytest.raises(ValueError) as excinfo:
+        utils.run_parallel(fun, [1, 5, 3, 4], max_workers=2)
+    assert excinfo.value.args == (5,)
+    assert sorted(calls) == [1, 3, 4, 5]
+
+
 def test_run_subprocess_cmd_prepares_str(mocker):
     cmd_name = "ls -la aaa bbb"
     kwargs = dict(
@@ -216,7 +246,7 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
     data = 'some-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load',
+        utils.yaml_codec, 'loads',
         autospec=True, side_effect=yaml.YAMLError
     )
 
@@ -227,7 +257,7 @@ def test_load_yaml_str_raises_exception(mocker, patch_logging):
 def test_load_yaml_str_input_check(mocker):
     data = 'some-data'
 
-    run_m = mocker.patch.object(utils.yaml, 'safe_load', autospec=True)
+    run_m = mocker.patch.object(utils.yaml_codec, 'loads', autospec=True)
     utils.load_yaml_str(data)
 
     run_m.assert_called_once_with(data)
@@ -238,7 +268,7 @@ def test_load_yaml_str_output_check(mocker):
     out_data = 'some-out-data'
 
     mocker.patch.object(
-        utils.yaml, 'safe_load', autospec=True, return_value=out_data
+        utils.yaml_codec, 'loads', autospec=True, return_value=out_data
     )
 
     assert utils.load_yaml_str(in_data) == out_data
@@ -247,7 +277,7 @@ def test_load_yaml_str_output_check(mocker):
 def test_dump_yaml_str_input_check(mocker, dump_yaml_defaults):
     data = 'some-data'
 
-    run_m = mocker.patch.object(utils.yaml, 'dump', autospec=True)
+    run_m = mocker.patch.object(utils.yaml_codec, 'dumps', autospec=True)
 
     utils.dump_yaml_str(data)
 
@@ -259,7 +289,7 @@ def test_dump_yaml_str_output_check(mocker):
     out_data = 'some-out-data'
 
     mocker.patch.object(
-        utils.yaml, 'dump', autospec=True, return_value=out_data
+        utils.yaml_codec, 'dumps', autospec=True, return_value=out_data
     )
 
     assert utils.dump_yaml_str(in_data) == out_data
@@ -318,3 +348,42 @@ def test_dump_yaml_input_check(mocker):
 
     utils.dump_yaml(data_file, data_file_content)
     run_m.assert_called_once_with(data_file_content)
+
+
+def test_load_yaml_cached(mocker, tmpdir_function):
+    spec = tmpdir_function / 'spec.yaml'
+    cache_dir = tmpdir_function / 'cache'
+    spec.write_text('a:\n  b: [1, 2]\n')
+
+    load_m = mocker.spy(utils, 'load_yaml')
+
+    # miss
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': {'b': [1, 2]}}
+    assert load_m.call_count == 1
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # hit
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': {'b': [1, 2]}}
+    assert load_m.call_count == 1
+
+    # source is changed
+    spec.write_text('a:\n  b: [1, 2, 3]\n')
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': {'b': [1, 2, 3]}}
+    assert load_m.call_count == 2
+
+    # broken cache
+    for path in cache_dir.iterdir():
+        path.write_bytes(b'garbage')
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': {'b': [1, 2, 3]}}
+    assert load_m.call_count == 3
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': {'b': [1, 2, 3]}}
+    assert load_m.call_count == 3
+
+
+def test_load_yaml_cached_no_cache_dir(tmpdir_function):
+    spec = tmpdir_function / 'spec.yaml'
+    spec.write_text('a: 1\n')
+    # cache dir can't be created
+    cache_dir = spec / 'cache'
+
+    assert utils.load_yaml_cached(spec, cache_dir) == {'a': 1}
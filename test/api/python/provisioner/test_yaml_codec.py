@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+from pathlib import Path, PosixPath
+
+import pytest
+import yaml
+
+from provisioner import yaml_codec
+
+from .helper import pillar_samples
+
+
+def test_yaml_codec_loads():
+    data = 'a:\n  b: [1, 2.5, true, null]\n  c: some-str\n'
+    assert yaml_codec.loads(data) == yaml.safe_load(data)
+
+
+def test_yaml_codec_loads_is_safe():
+    with pytest.raises(yaml.YAMLError):
+        yaml_codec.loads('!!python/object/apply:os.getcwd []')
+
+
+def test_yaml_codec_dumps_posix_path():
+    assert yaml_codec.dumps({'a': Path('/some/path')}) == 'a: /some/path\n'
+    # global dumper is not affected
+    assert PosixPath not in yaml.Dumper.yaml_representers
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [{}, {'width': 1, 'indent': 4}],
+    ids=['default', 'pillar']
+)
+def test_yaml_codec_dumps_compat(kwargs):
+    samples = pillar_samples()
+    assert samples
+
+    samples[Path('extra')] = {
+        'long': 'very long words ' * 20,
+        'multiline': 'line1\nline2\n',
+        'unicode': 'ünï',
+        'empty': '',
+        'none': None,
+        'list': [1, 2.5, True, {'a': 'a b c'}],
+    }
+
+    for path, data in samples.items():
+        expected = yaml.dump(
+            data, Dumper=yaml.Dumper,
+            default_flow_style=False, canonical=False, **kwargs
+        )
+        assert yaml_codec.dumps(data, **kwargs) == expected, str(path)
+        assert yaml_codec.loads(expected) == yaml.safe_load(expected)
@@ -0,0 +1,39 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import sys
+
+import pytest
+
+from provisioner.config import PROJECT_PATH
+
+LR_CLI_PATH = PROJECT_PATH / 'lr-cli' if PROJECT_PATH else None
+
+if LR_CLI_PATH and str(LR_CLI_PATH) not in sys.path:
+    sys.path.insert(0, str(LR_CLI_PATH))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def unit():
+    pass
+
+
+@pytest.fixture(scope='session')
+def lr_cli_path():
+    if LR_CLI_PATH is None:
+        pytest.skip('lr-cli sources are not available')
+    return LR_CLI_PATH
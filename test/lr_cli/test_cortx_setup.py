@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+import argparse
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+import yaml
+
+from cortx_setup import commands, main
+
+
+def _apis(lr_cli_path):
+    return yaml.safe_load(
+        (lr_cli_path / 'cortx_setup' / 'api_spec.yaml').read_text()
+    )
+
+
+def _parser(apis, argv):
+    parser = argparse.ArgumentParser(prog='cortx_setup')
+    main.handle_apis(parser, apis, argv)
+    return parser
+
+
+def test_handle_apis_help_lists_all_commands(lr_cli_path, capsys):
+    apis = _apis(lr_cli_path)
+
+    with pytest.raises(SystemExit):
+        _parser(apis, ['--help']).parse_args(['--help'])
+
+    out = capsys.readouterr().out
+    for cmd_name in apis:
+        assert cmd_name in out
+
+
+def test_handle_apis_imports_invoked_command_only(lr_cli_path):
+    pytest.importorskip('cortx.utils.conf_store')
+
+    argv = ['hostname', 'seagate.com']
+    code = (
+        'import argparse, sys, yaml\n'
+        'from cortx_setup import main\n'
+        f'apis = yaml.safe_load(open({str(lr_cli_path)!r} + '
+        "'/cortx_setup/api_spec.yaml').read())\n"
+        'parser = argparse.ArgumentParser()\n'
+        f'main.handle_apis(parser, apis, {argv!r})\n'
+        f'args = parser.parse_args({argv!r})\n'
+        'print(args.command)\n'
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    res = subprocess.run(
+        [sys.executable, '-c', code], env=env, check=True,
+        universal_newlines=True, stdout=subprocess.PIPE
+    )
+
+    cmd_path, modules = res.stdout.splitlines()[-2:]
+    assert cmd_path == 'hostname.Hostname'
+    assert {
+        module for module in modules.split()
+        if module.startswith('cortx_setup.commands.')
+    } == {'cortx_setup.commands.hostname', 'cortx_setup.commands.command'}
+
+
+@pytest.mark.parametrize(
+    'cmd_path',
+    ['hostname', 'some_missed_module.SomeCmd', 'fake_cmd.SomeMissedCmd'],
+    ids=['no_class', 'no_module', 'missed_class']
+)
+def test_get_command_bad_spec(monkeypatch, cmd_path):
+    monkeypatch.setitem(
+        sys.modules, 'cortx_setup.commands.fake_cmd',
+        types.ModuleType('cortx_setup.commands.fake_cmd')
+    )
+
+    with pytest.raises(ValueError) as excinfo:
+        commands.get_command(cmd_path)
+
+    assert f"Invalid command '{cmd_path}'" in str(excinfo.value)